@@ -0,0 +1,128 @@
+"""
+OpenAI Batch API 도우미
+분석 요청을 JSONL 파일로 제출하고, 완료될 때까지 기다린 뒤 결과를 custom_id별로 돌려줍니다.
+제출 상태는 파일에 저장하므로 프로세스가 중간에 끝나도 다음 실행에서 이어서 기다릴 수 있습니다.
+"""
+
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+# 더 이상 바뀌지 않는 배치 상태
+FINAL_STATUSES = ('completed', 'failed', 'expired', 'cancelled')
+
+
+def load_state(path: str) -> Optional[Dict]:
+    """저장된 배치 상태 (없으면 None)"""
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_state(path: str, state: Dict):
+    """배치 상태 저장 (임시 파일에 쓴 뒤 교체하여 중간에 끝나도 깨지지 않음)"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def clear_state(path: str):
+    """배치 상태 삭제 (결과 반영 완료 후)"""
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def write_batch_file(path: str, requests: List[Dict[str, Any]]) -> int:
+    """
+    Batch API 입력 파일 작성
+
+    Args:
+        path: JSONL 파일 경로
+        requests: [{'custom_id': ..., 'body': chat.completions.create 인자}, ...]
+
+    Returns:
+        요청 수
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        for request in requests:
+            line = {
+                'custom_id': request['custom_id'],
+                'method': 'POST',
+                'url': '/v1/chat/completions',
+                'body': request['body'],
+            }
+            f.write(json.dumps(line, ensure_ascii=False) + '\n')
+    return len(requests)
+
+
+def submit_batch(client, path: str, metadata: Optional[Dict[str, str]] = None) -> str:
+    """입력 파일 업로드 후 배치 생성, 배치 ID 반환"""
+    with open(path, 'rb') as f:
+        input_file = client.files.create(file=f, purpose='batch')
+    batch = client.batches.create(
+        input_file_id=input_file.id,
+        endpoint='/v1/chat/completions',
+        completion_window='24h',
+        metadata=metadata
+    )
+    return batch.id
+
+
+def wait_for_batch(client, batch_id: str, poll_seconds: float = 60, timeout: Optional[float] = None):
+    """
+    배치가 끝날 때까지 주기적으로 상태 확인
+
+    Returns:
+        마지막으로 조회한 배치 객체 (timeout이 지나면 아직 진행 중일 수 있음)
+    """
+    started = time.monotonic()
+    while True:
+        batch = client.batches.retrieve(batch_id)
+        counts = batch.request_counts
+        progress = f" ({counts.completed + counts.failed}/{counts.total})" if counts else ""
+        print(f"⏳ 배치 {batch_id}: {batch.status}{progress}")
+
+        if batch.status in FINAL_STATUSES:
+            return batch
+        if timeout is not None and time.monotonic() - started >= timeout:
+            return batch
+        time.sleep(poll_seconds)
+
+
+def read_batch_results(client, batch) -> Dict[str, Optional[str]]:
+    """
+    끝난 배치의 응답 메시지를 custom_id별로 읽음
+
+    만료 / 취소된 배치도 그 전에 끝난 요청은 output_file_id에 들어 있으므로 함께 읽습니다.
+
+    Returns:
+        {custom_id: 응답 메시지 내용} (실패한 요청은 None)
+    """
+    results: Dict[str, Optional[str]] = {}
+
+    for file_id in (batch.output_file_id, batch.error_file_id):
+        if not file_id:
+            continue
+        for line in client.files.content(file_id).text.splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            response = record.get('response') or {}
+            content = None
+            if response.get('status_code') == 200:
+                try:
+                    content = response['body']['choices'][0]['message']['content']
+                except (KeyError, IndexError, TypeError):
+                    content = None
+            results.setdefault(record['custom_id'], content)
+
+    return results
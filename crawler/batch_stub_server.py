@@ -0,0 +1,166 @@
+"""
+OpenAI Batch API 로컬 대역 서버
+--batch 모드를 실제 API 비용 없이 시험하기 위한 최소 구현입니다.
+
+지원하는 엔드포인트:
+    POST /v1/files                  (purpose=batch 입력 파일 업로드)
+    POST /v1/batches                (배치 생성)
+    GET  /v1/batches/{batch_id}     (상태 조회: 처음 N번은 in_progress, 그 다음 completed)
+    GET  /v1/files/{file_id}/content
+
+응답 내용은 규칙 기반 추출기(rule_extractor)로 만든 값이며, 이미지 요청은 기본값을 돌려줍니다.
+
+실행 방법:
+    python batch_stub_server.py --port 8765
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 OPENAI_API_KEY=stub BATCH_POLL_SECONDS=1 python main.py --batch
+"""
+
+import argparse
+import json
+import re
+import time
+import uuid
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from rule_extractor import extract_fields
+
+files = {}
+batches = {}
+
+
+def stub_answer(body: dict) -> dict:
+    """요청 본문에 대한 가짜 분석 결과"""
+    user = body['messages'][-1]['content']
+    if not isinstance(user, str):
+        # Vision 요청
+        return {'min_gpa': 0.0, 'max_income': 99, 'residence': '전국', 'due_date': None}
+
+    answer = {field: value for field, (value, _) in extract_fields(user).items()}
+    answer['confidence'] = 0.9
+    return answer
+
+
+def run_batch(batch: dict):
+    """입력 파일의 요청마다 응답을 만들어 출력 파일로 저장"""
+    lines = []
+    for line in files[batch['input_file_id']]['content'].decode('utf-8').splitlines():
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        lines.append(json.dumps({
+            'id': f"batch_req_{uuid.uuid4().hex[:12]}",
+            'custom_id': request['custom_id'],
+            'response': {
+                'status_code': 200,
+                'request_id': uuid.uuid4().hex,
+                'body': {
+                    'id': f"chatcmpl-{uuid.uuid4().hex[:12]}",
+                    'object': 'chat.completion',
+                    'model': request['body']['model'],
+                    'choices': [{
+                        'index': 0,
+                        'message': {
+                            'role': 'assistant',
+                            'content': json.dumps(stub_answer(request['body']), ensure_ascii=False)
+                        },
+                        'finish_reason': 'stop'
+                    }]
+                }
+            },
+            'error': None
+        }, ensure_ascii=False))
+
+    output_id = f"file-{uuid.uuid4().hex[:12]}"
+    files[output_id] = {'content': ('\n'.join(lines) + '\n').encode('utf-8'), 'filename': 'output.jsonl'}
+    batch.update(
+        status='completed',
+        output_file_id=output_id,
+        completed_at=int(time.time()),
+        request_counts={'total': len(lines), 'completed': len(lines), 'failed': 0}
+    )
+
+
+class Handler(BaseHTTPRequestHandler):
+    polls_before_complete = 2
+
+    def _send(self, status: int, payload, content_type: str = 'application/json'):
+        data = payload if isinstance(payload, bytes) else json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get('Content-Length', 0)))
+
+    def do_POST(self):
+        if self.path.endswith('/files'):
+            raw = self._body()
+            message = BytesParser(policy=HTTP).parsebytes(
+                f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode('utf-8') + raw
+            )
+            content, filename = b'', 'input.jsonl'
+            for part in message.iter_parts():
+                if part.get_param('name', header='content-disposition') == 'file':
+                    content = part.get_payload(decode=True)
+                    filename = part.get_filename() or filename
+            file_id = f"file-{uuid.uuid4().hex[:12]}"
+            files[file_id] = {'content': content, 'filename': filename}
+            self._send(200, {
+                'id': file_id, 'object': 'file', 'bytes': len(content), 'created_at': int(time.time()),
+                'filename': filename, 'purpose': 'batch', 'status': 'processed'
+            })
+        elif self.path.endswith('/batches'):
+            request = json.loads(self._body())
+            if request['input_file_id'] not in files:
+                self._send(404, {'error': {'message': 'input file not found'}})
+                return
+            batch_id = f"batch_{uuid.uuid4().hex[:12]}"
+            batches[batch_id] = {
+                'id': batch_id, 'object': 'batch', 'endpoint': request['endpoint'],
+                'input_file_id': request['input_file_id'], 'completion_window': request['completion_window'],
+                'status': 'in_progress', 'created_at': int(time.time()),
+                'output_file_id': None, 'error_file_id': None,
+                'request_counts': {'total': 0, 'completed': 0, 'failed': 0},
+                'metadata': request.get('metadata'), 'polls': 0,
+            }
+            self._send(200, batches[batch_id])
+        else:
+            self._send(404, {'error': {'message': f'unknown path {self.path}'}})
+
+    def do_GET(self):
+        batch_match = re.search(r'/batches/([^/]+)$', self.path)
+        file_match = re.search(r'/files/([^/]+)/content$', self.path)
+
+        if batch_match and batch_match.group(1) in batches:
+            batch = batches[batch_match.group(1)]
+            batch['polls'] += 1
+            if batch['status'] == 'in_progress' and batch['polls'] > self.polls_before_complete:
+                run_batch(batch)
+            self._send(200, batch)
+        elif file_match and file_match.group(1) in files:
+            self._send(200, files[file_match.group(1)]['content'], 'application/jsonl')
+        else:
+            self._send(404, {'error': {'message': f'not found {self.path}'}})
+
+    def log_message(self, format, *args):
+        print(f"🧪 {self.command} {self.path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAI Batch API 로컬 대역 서버")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--polls', type=int, default=2, help='completed가 되기 전 in_progress로 응답할 조회 횟수')
+    args = parser.parse_args()
+
+    Handler.polls_before_complete = args.polls
+    server = ThreadingHTTPServer(('127.0.0.1', args.port), Handler)
+    print(f"🧪 Batch API 대역 서버: http://127.0.0.1:{args.port}/v1")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+비동기 마이크로 배처
+여러 코루틴이 보낸 요청을 모아 한 번에 처리합니다 (예: 짧은 공고 여러 개를 GPT 한 번으로 분석).
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional, Set, Tuple
+
+
+class MicroBatcher:
+    """
+    요청을 max_size개까지 모으거나 max_wait초가 지나면 handler로 한꺼번에 넘깁니다.
+
+    handler는 요청 리스트를 받아 같은 순서의 결과 리스트를 돌려주는 코루틴 함수입니다.
+    handler가 예외를 던지면 그 배치의 모든 요청에 같은 예외가 전달됩니다.
+    같은 이벤트 루프 안에서만 사용합니다.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[List[Any]], Awaitable[List[Any]]],
+        max_size: int = 8,
+        max_wait: float = 5.0
+    ):
+        self.handler = handler
+        self.max_size = max(1, max_size)
+        self.max_wait = max_wait
+        self.batches = 0
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def submit(self, request: Any) -> Any:
+        """요청을 배치에 추가하고 결과를 기다림"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((request, future))
+
+        if len(self._pending) >= self.max_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+
+        return await future
+
+    def _flush(self):
+        """대기 중인 요청을 배치 하나로 묶어 처리 시작"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, []
+        self.batches += 1
+        task = asyncio.get_running_loop().create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[Any, asyncio.Future]]):
+        try:
+            results = await self.handler([request for request, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+        # 결과 수가 모자라면 나머지는 실패(None)로 처리
+        for _, future in batch:
+            if not future.done():
+                future.set_result(None)
+
+    async def close(self):
+        """남은 요청을 바로 처리하고 진행 중인 배치가 끝날 때까지 대기"""
+        self._flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
@@ -0,0 +1,149 @@
+"""
+포스터 다운로드 메모리 벤치마크
+로컬 HTTP 서버에서 포스터를 받아 Vision 요청 직전까지 만드는 동안의 최대 메모리를 tracemalloc으로 비교합니다.
+
+- 기존: response.content → b64encode → f-string data URL → 토큰 추정용 전체 디코딩 → 캐시 키 해시
+- 스트리밍: 청크를 bytearray 하나에 모음 → 문자열 하나에 data URL 인코딩 → 헤더만 디코딩 → 나눠서 해시
+- 이미지 URL: 스트리밍으로 받아 해시만 계산 (VISION_IMAGE_URL=true, data URL을 만들지 않음)
+
+전처리(IMAGE_PREPROCESS)는 끈 상태, 즉 원본을 그대로 보내는 경우를 측정합니다.
+
+사용법:
+  python bench_download.py poster1.jpg poster2.png
+  python bench_download.py              # 합성 포스터로 측정
+"""
+
+import base64
+import hashlib
+import io
+import sys
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Tuple
+
+import requests
+from PIL import Image
+
+from bench_image import synthetic_poster
+from image_preprocess import encode_data_url, estimate_image_tokens, read_image_stream
+from llm_cache import LLMCache
+from llm_scheduler import _image_tokens
+
+MAX_BYTES = 20 * 1024 * 1024
+
+
+def serve(images: Dict[str, bytes]) -> ThreadingHTTPServer:
+    """images를 /<이름> 으로 제공하는 로컬 서버 (백그라운드 스레드)"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            data = images.get(self.path.lstrip('/'))
+            if data is None:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', 'image/jpeg')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def legacy_path(session: requests.Session, url: str) -> int:
+    """기존 방식 (스트리밍 도입 전 main.py와 같은 순서)"""
+    response = session.get(url, timeout=15)
+    response.raise_for_status()
+    content_type = response.headers.get('Content-Type', 'image/jpeg')
+    encoded = base64.b64encode(response.content).decode('utf-8')
+    data_url = f"data:{content_type};base64,{encoded}"
+
+    decoded = base64.b64decode(data_url.split(',', 1)[1])
+    with Image.open(io.BytesIO(decoded)) as image:
+        tokens = estimate_image_tokens(*image.size, 'high')
+
+    digest = hashlib.sha256()
+    for part in ('제목', data_url):
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return tokens
+
+
+def streaming_path(session: requests.Session, url: str) -> int:
+    """스트리밍 다운로드 + 단일 버퍼 인코딩"""
+    with session.get(url, timeout=15, stream=True) as response:
+        response.raise_for_status()
+        image_data, content_type = read_image_stream(response.iter_content(65536), MAX_BYTES)
+    data_url = encode_data_url(image_data, content_type)
+    tokens = _image_tokens(data_url, 'high')
+    LLMCache.hash_content('제목', data_url)
+    return tokens
+
+
+def image_url_path(session: requests.Session, url: str) -> int:
+    """스트리밍 다운로드 후 내용 해시만 (Vision에는 주소를 전달)"""
+    with session.get(url, timeout=15, stream=True) as response:
+        response.raise_for_status()
+        image_data, _ = read_image_stream(response.iter_content(65536), MAX_BYTES)
+    LLMCache.hash_content('제목', hashlib.sha256(image_data).hexdigest())
+    return 0
+
+
+def measure(path: Callable[[requests.Session, str], int], session: requests.Session, url: str) -> Tuple[int, float]:
+    """(최대 메모리 바이트, 걸린 시간 초)"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    path(session, url)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, elapsed
+
+
+def main():
+    """벤치마크 실행"""
+    print("=" * 60)
+    print("🧪 포스터 다운로드 메모리 벤치마크")
+    print("=" * 60)
+
+    if len(sys.argv) > 1:
+        inputs: List[Tuple[str, bytes]] = []
+        for path in sys.argv[1:]:
+            with open(path, 'rb') as f:
+                inputs.append((path.rsplit('/', 1)[-1], f.read()))
+    else:
+        inputs = [
+            ('synthetic-tall.jpg', synthetic_poster(1240, 5200, 160, 160)),
+            ('synthetic-large.jpg', synthetic_poster(2480, 7000, 120, 120)),
+        ]
+
+    server = serve({name: data for name, data in inputs})
+    session = requests.Session()
+    paths = [('기존', legacy_path), ('스트리밍', streaming_path), ('이미지 URL', image_url_path)]
+
+    try:
+        for name, data in inputs:
+            url = f"http://127.0.0.1:{server.server_port}/{name}"
+            # 연결 수립 비용은 측정에서 제외
+            session.get(url, timeout=15).close()
+
+            print(f"\n📷 {name} ({len(data) // 1024}KB)")
+            baseline = None
+            for label, path in paths:
+                peak, elapsed = measure(path, session, url)
+                baseline = baseline or peak
+                print(f"  {label:<8} 최대 메모리 {peak / 1024 / 1024:6.1f}MB "
+                      f"(원본의 x{peak / len(data):.1f}, 기존 대비 {peak / baseline:.0%}) | {elapsed * 1000:6.1f}ms")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+본문 추출 벤치마크
+상세 페이지마다 본문 블록만 남겼을 때 유지 / 제외된 글자 수와 토큰 수를 페이지 전체 텍스트와 비교합니다.
+
+사용법:
+  python bench_extract.py pages/     # bench_parsing.py --save로 저장한 페이지 (list-*.html 제외)
+  python bench_extract.py            # 여러 게시판 구조의 합성 페이지
+"""
+
+import sys
+import time
+from typing import List, Tuple
+
+from bench_parsing import load_corpus
+from content_extractor import extract_main_content, format_report
+
+
+def synthetic_pages() -> List[Tuple[str, str]]:
+    """강남대(tbl_view)와 다른 게시판 구조의 상세 페이지"""
+    menu = ''.join(f'<li><a href="/menu/{i}">메뉴 항목 {i}</a></li>' for i in range(120))
+    notices = ''.join(f'<li><a href="/notice/{i}">최근 공지사항 제목입니다 {i}</a></li>' for i in range(30))
+    body = ''.join(
+        f'<p>{i}. 신청기간: 2026. 3. 2.(월) ~ 3. 20.(금) 18:00까지, 직전학기 평점 3.0 이상, 소득분위 8구간 이하.</p>'
+        for i in range(12)
+    )
+    footer = '<p>주소: 서울특별시 OO구 OO로 1 | 대표전화 02-000-0000 | 개인정보처리방침 | Copyright 2026 OO대학교</p>'
+
+    return [
+        ('tbl_view', f'<html><body><ul class="gnb">{menu}</ul><div class="tbl_view">{body}</div>{footer}</body></html>'),
+        ('article', f'<html><body><header><ul>{menu}</ul></header><div id="wrap"><article class="post"><h1>장학생 모집</h1>'
+                    f'<div class="entry-content">{body}</div></article><div class="widget-area"><ul>{notices}</ul></div></div>'
+                    f'<footer>{footer}</footer></body></html>'),
+        ('table', f'<html><body><table width="100%"><tr><td><ul>{menu}</ul></td><td><table class="bbs">'
+                  f'<tr><td>제목</td><td>장학생 모집</td></tr><tr><td colspan="2">{body}</td></tr></table></td></tr></table>'
+                  f'<div class="copy">{footer}</div></body></html>'),
+        ('div', f'<html><body><div class="container"><div class="gnb"><ul>{menu}</ul></div><div class="sub_content">'
+                f'<div class="bbs_view"><div class="view_title">장학생 모집</div><div class="view_cont">{body}</div></div>'
+                f'<div class="btn_area"><a href="/list">목록</a><a href="/prev">이전글: 2025 장학생 모집</a></div></div>'
+                f'<div class="quick"><ul>{notices}</ul></div></div>{footer}</body></html>'),
+        ('short', f'<html><body><div class="lnb"><ul>{menu}</ul></div>'
+                  f'<div class="contents">장학금 신청: 3월 20일까지 학생지원팀 방문 제출</div>{footer}</body></html>'),
+    ]
+
+
+def main():
+    """벤치마크 실행"""
+    print("=" * 60)
+    print("🧪 본문 추출 벤치마크")
+    print("=" * 60)
+
+    if len(sys.argv) > 1:
+        pages = [
+            (f"detail-{index:03d}", html.decode('utf-8', errors='replace'))
+            for index, (kind, html) in enumerate(load_corpus(sys.argv[1])) if kind == 'detail'
+        ]
+    else:
+        pages = synthetic_pages()
+
+    totals = [0, 0, 0, 0]
+    started = time.perf_counter()
+    for name, html in pages:
+        extracted = extract_main_content(html)
+        if not extracted:
+            print(f"  {name:<12} 본문 없음")
+            continue
+        print(f"  {name:<12} {format_report(extracted)}")
+        for i, key in enumerate(('page_chars', 'kept_chars', 'page_tokens', 'kept_tokens')):
+            totals[i] += extracted[key]
+    elapsed = time.perf_counter() - started
+
+    print("\n" + "=" * 60)
+    print("📊 합계")
+    print("=" * 60)
+    print(f"  글자: {totals[0]:,}자 → {totals[1]:,}자 ({totals[0] - totals[1]:,}자 제외)")
+    print(f"  토큰: {totals[2]:,} → {totals[3]:,}")
+    print(f"  처리: {len(pages)}페이지, {elapsed * 1000 / max(1, len(pages)):.1f}ms/페이지")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+포스터 전처리 벤치마크
+원본 대비 전처리 후 이미지의 바이트 수와 Vision 토큰 추정치를 비교합니다.
+
+사용법:
+  python bench_image.py poster1.jpg poster2.png https://.../poster.jpg
+  python bench_image.py              # 합성 포스터로 측정
+"""
+
+import io
+import sys
+import time
+from typing import List, Tuple
+
+from PIL import Image, ImageDraw
+
+from image_preprocess import estimate_image_tokens, preprocess_poster
+
+
+def load_inputs(paths: List[str]) -> List[Tuple[str, bytes]]:
+    """파일 경로 또는 URL에서 이미지 바이트 읽기"""
+    inputs = []
+    for path in paths:
+        if path.startswith('http'):
+            import requests
+            response = requests.get(path, timeout=15)
+            response.raise_for_status()
+            inputs.append((path.rsplit('/', 1)[-1], response.content))
+        else:
+            with open(path, 'rb') as f:
+                inputs.append((path, f.read()))
+    return inputs
+
+
+def synthetic_poster(width: int, height: int, margin_x: int, margin_y: int) -> bytes:
+    """흰 여백 안에 사진 같은 배경과 글자 블록이 있는 포스터 (고품질 JPEG)"""
+    inner = (width - 2 * margin_x, height - 2 * margin_y)
+    noise = Image.effect_noise(inner, 40).convert('RGB')
+    tint = Image.new('RGB', inner, (200, 220, 250))
+    body = Image.blend(noise, tint, 0.6)
+
+    draw = ImageDraw.Draw(body)
+    draw.rectangle([0, 0, inner[0], 500], fill=(30, 80, 160))
+    for y in range(600, inner[1] - 60, 60):
+        line_width = inner[0] * (0.5 + 0.25 * ((y // 60) % 3))
+        draw.rectangle([40, y, 40 + line_width, y + 28], fill=(40, 40, 40))
+
+    image = Image.new('RGB', (width, height), (255, 255, 255))
+    image.paste(body, (margin_x, margin_y))
+    buffer = io.BytesIO()
+    image.save(buffer, format='JPEG', quality=95)
+    return buffer.getvalue()
+
+
+def measure(name: str, data: bytes) -> Tuple[int, int, int, int]:
+    """전처리 전후 바이트 수와 토큰 추정치 출력"""
+    with Image.open(io.BytesIO(data)) as image:
+        original_size = image.size
+
+    started = time.perf_counter()
+    processed, mime_type = preprocess_poster(data)
+    elapsed = (time.perf_counter() - started) * 1000
+
+    with Image.open(io.BytesIO(processed)) as image:
+        processed_size = image.size
+
+    # data URL로 보낼 때의 크기 (Base64 = 4/3배)
+    original_b64 = len(data) * 4 // 3
+    processed_b64 = len(processed) * 4 // 3
+    original_tokens = estimate_image_tokens(*original_size)
+    processed_tokens = estimate_image_tokens(*processed_size)
+
+    print(f"\n🖼️  {name}")
+    print(f"  크기: {original_size[0]}x{original_size[1]} → {processed_size[0]}x{processed_size[1]} ({mime_type})")
+    print(f"  전송량(Base64): {original_b64 // 1024}KB → {processed_b64 // 1024}KB "
+          f"({100 - processed_b64 * 100 // max(1, original_b64)}% 감소)")
+    print(f"  Vision 토큰(high): {original_tokens} → {processed_tokens}")
+    print(f"  전처리 시간: {elapsed:.1f}ms")
+
+    return original_b64, processed_b64, original_tokens, processed_tokens
+
+
+def main():
+    """벤치마크 실행"""
+    print("=" * 60)
+    print("🧪 포스터 전처리 벤치마크")
+    print("=" * 60)
+
+    if len(sys.argv) > 1:
+        inputs = load_inputs(sys.argv[1:])
+    else:
+        inputs = [
+            ('synthetic-tall.jpg', synthetic_poster(1240, 5200, 160, 160)),
+            ('synthetic-margins.jpg', synthetic_poster(1100, 2400, 40, 300)),
+        ]
+
+    totals = [0, 0, 0, 0]
+    for name, data in inputs:
+        for i, value in enumerate(measure(name, data)):
+            totals[i] += value
+
+    print("\n" + "=" * 60)
+    print("📊 합계")
+    print("=" * 60)
+    print(f"  전송량: {totals[0] // 1024}KB → {totals[1] // 1024}KB")
+    print(f"  Vision 토큰: {totals[2]} → {totals[3]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+HTML 파싱 벤치마크
+저장해 둔 게시판 페이지 묶음으로 두 가지를 측정합니다.
+
+1. 파싱 방식(parsers): html.parser / lxml 전체 트리 / lxml + SoupStrainer의 초당 페이지 수와
+   페이지당 최대 메모리(tracemalloc), 그리고 결과가 html.parser와 같은지
+2. 병렬화(pools): 스레드 풀과 프로세스 풀의 코어 수에 따른 처리량
+   BeautifulSoup 파싱은 GIL을 잡고 있으므로 스레드를 늘려도 빨라지지 않고, 프로세스는 코어 수만큼 빨라집니다.
+
+사용법:
+  python bench_parsing.py --save pages/ --pages 3   # TARGET_URL의 목록/상세 페이지를 pages/에 저장
+  python bench_parsing.py pages/                    # 저장한 페이지로 측정
+  python bench_parsing.py                           # 합성 페이지로 측정
+  python bench_parsing.py pages/ --mode parsers     # 파싱 방식만 비교
+  (list-*.html은 목록, 나머지는 상세 페이지로 파싱)
+"""
+
+import argparse
+import os
+import time
+import tracemalloc
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, List, Tuple
+
+from parsing import DEFAULT_PARSER, parse_detail_page, parse_list_page
+
+BASE_DOMAIN = os.getenv("BASE_DOMAIN", "https://web.kangnam.ac.kr")
+
+
+def save_corpus(directory: str, pages: int):
+    """TARGET_URL의 목록 페이지와 그 상세 페이지를 그대로 저장"""
+    import requests
+    from dotenv import load_dotenv
+
+    from pagination import build_page_url
+
+    load_dotenv()
+    target_url = os.getenv("TARGET_URL", "https://web.kangnam.ac.kr/board/scholarship")
+    page_param = os.getenv("PAGE_PARAM", "pageIndex")
+    session = requests.Session()
+    session.headers['User-Agent'] = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+    os.makedirs(directory, exist_ok=True)
+
+    saved = 0
+    for page in range(1, pages + 1):
+        response = session.get(build_page_url(target_url, page, page_param), timeout=10)
+        response.raise_for_status()
+        with open(os.path.join(directory, f"list-{page:03d}.html"), 'wb') as f:
+            f.write(response.content)
+        saved += 1
+
+        for index, item in enumerate(parse_list_page(response.content, BASE_DOMAIN)['items']):
+            detail = session.get(item['link'], timeout=10)
+            if detail.ok:
+                with open(os.path.join(directory, f"detail-{page:03d}-{index:02d}.html"), 'wb') as f:
+                    f.write(detail.content)
+                saved += 1
+            time.sleep(0.5)
+
+    print(f"💾 {saved}개 페이지 저장: {directory}")
+
+
+def load_corpus(directory: str) -> List[Tuple[str, bytes]]:
+    """(종류, HTML 바이트) 목록"""
+    corpus = []
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith('.html'):
+            continue
+        with open(os.path.join(directory, name), 'rb') as f:
+            corpus.append(('list' if name.startswith('list-') else 'detail', f.read()))
+    return corpus
+
+
+def synthetic_corpus(pages: int = 40) -> List[Tuple[str, bytes]]:
+    """실제 게시판과 비슷한 크기의 목록 / 상세 페이지"""
+    navigation = ''.join(f'<li><a href="/menu/{i}">메뉴 {i}</a></li>' for i in range(300))
+    layout = f'<html><head><title>게시판</title></head><body><ul class="gnb">{navigation}</ul>{{}}</body></html>'
+
+    rows = ''.join(
+        f'<tr><td>{i}</td><td><a class="detailLink" href="#" '
+        f'data-params="{{&quot;encMenuBoardSeq&quot;:&quot;{i:08d}&quot;}}">2026학년도 장학생 모집 안내 {i}</a></td>'
+        f'<td>학생지원팀</td><td>2026-03-{i % 28 + 1:02d}</td></tr>'
+        for i in range(20)
+    )
+    list_page = layout.format(f'<table class="board-list">{rows}</table>').encode('utf-8')
+
+    paragraphs = ''.join(
+        f'<p><span style="font-size:12pt">{i}. 신청기간: 2026. 3. 2.(월) ~ 3. 20.(금) 18:00까지, '
+        f'직전학기 평점 3.0 이상, 소득분위 8구간 이하, 서울 거주자</span></p>'
+        for i in range(150)
+    )
+    detail_page = layout.format(f'<div class="tbl_view">{paragraphs}</div>').encode('utf-8')
+
+    return [('list', list_page) if i % 5 == 0 else ('detail', detail_page) for i in range(pages)]
+
+
+def parse(kind: str, html: bytes, parser: str = DEFAULT_PARSER) -> int:
+    """페이지 하나를 파싱하고 결과 크기만 돌려줌 (프로세스 사이 전송량 최소화)"""
+    if kind == 'list':
+        return len(parse_list_page(html, BASE_DOMAIN, parser)['items'])
+    detail = parse_detail_page(html, BASE_DOMAIN, parser)
+    return len((detail or {}).get('text_content') or '')
+
+
+def parse_result(kind: str, html: bytes, parser: str) -> Any:
+    """파싱 결과 전체 (방식별 결과 비교용)"""
+    if kind == 'list':
+        return parse_list_page(html, BASE_DOMAIN, parser)
+    return parse_detail_page(html, BASE_DOMAIN, parser)
+
+
+def compare_parsers(corpus: List[Tuple[str, bytes]], rounds: int):
+    """파싱 방식별 초당 페이지 수, 페이지당 최대 메모리, html.parser와 결과 일치 여부 출력"""
+    expected = [parse_result(kind, html, 'html.parser') for kind, html in corpus]
+    baseline = None
+
+    for parser in ('html.parser', 'lxml', 'strainer'):
+        started = time.perf_counter()
+        for _ in range(rounds):
+            for kind, html in corpus:
+                parse(kind, html, parser)
+        rate = len(corpus) * rounds / (time.perf_counter() - started)
+        baseline = baseline or rate
+
+        # 추적 중에는 느려지므로 처리량과 따로 측정
+        peaks = []
+        for kind, html in corpus:
+            tracemalloc.start()
+            parse(kind, html, parser)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+
+        same = sum(
+            parse_result(kind, html, parser) == result
+            for (kind, html), result in zip(corpus, expected)
+        )
+        print(f"  {parser:<12} {rate:7.1f}페이지/초 (x{rate / baseline:.2f}) | "
+              f"페이지당 최대 메모리 평균 {sum(peaks) / len(peaks) / 1024:7.0f}KB, 최대 {max(peaks) / 1024:7.0f}KB | "
+              f"결과 일치 {same}/{len(corpus)}")
+
+
+def compare_pools(corpus: List[Tuple[str, bytes]], rounds: int):
+    """작업자 수별 스레드 풀 / 프로세스 풀 처리량 출력"""
+    pages = len(corpus) * rounds
+    cores = os.cpu_count() or 1
+    worker_counts = sorted({1, 2, 4, 8, cores} & set(range(1, cores * 2 + 1)))
+    baseline = None
+
+    for workers in worker_counts:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            thread_time = measure(executor, corpus, rounds)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # 프로세스 시작 비용은 실제 실행에서 한 번뿐이므로 측정에서 제외
+            list(executor.map(parse, ['list'] * workers, [corpus[0][1]] * workers))
+            process_time = measure(executor, corpus, rounds)
+
+        if baseline is None:
+            baseline = thread_time
+        print(f"  작업자 {workers:>2}개 | 스레드 {pages / thread_time:7.1f}페이지/초 (x{baseline / thread_time:.2f}) | "
+              f"프로세스 {pages / process_time:7.1f}페이지/초 (x{baseline / process_time:.2f})")
+
+    print("\n  (x배수는 작업자 1개 스레드 대비, 실제 실행에서는 CPU_WORKERS로 프로세스 수 지정)")
+
+
+def measure(executor: Executor, corpus: List[Tuple[str, bytes]], rounds: int) -> float:
+    """corpus를 rounds번 파싱하는 데 걸린 시간 (초)"""
+    kinds = [kind for kind, _ in corpus] * rounds
+    pages = [html for _, html in corpus] * rounds
+    started = time.perf_counter()
+    list(executor.map(parse, kinds, pages, chunksize=1))
+    return time.perf_counter() - started
+
+
+def main():
+    """벤치마크 실행"""
+    parser = argparse.ArgumentParser(description="HTML 파싱 벤치마크")
+    parser.add_argument('corpus', nargs='?', help='저장한 페이지 디렉터리 (없으면 합성 페이지)')
+    parser.add_argument('--save', metavar='DIR', help='TARGET_URL에서 페이지를 받아 DIR에 저장하고 종료')
+    parser.add_argument('--pages', type=int, default=3, help='--save로 받을 목록 페이지 수')
+    parser.add_argument('--rounds', type=int, default=3, help='페이지 묶음을 반복 파싱할 횟수')
+    parser.add_argument('--mode', choices=('all', 'parsers', 'pools'), default='all', help='측정할 항목')
+    args = parser.parse_args()
+
+    if args.save:
+        save_corpus(args.save, args.pages)
+        return
+
+    corpus = load_corpus(args.corpus) if args.corpus else synthetic_corpus()
+    total_kb = sum(len(html) for _, html in corpus) // 1024
+
+    print("=" * 60)
+    print("🧪 HTML 파싱 벤치마크")
+    print("=" * 60)
+    print(f"  페이지: {len(corpus)}개 ({total_kb}KB) x {args.rounds}회 | CPU 코어: {os.cpu_count()}개")
+
+    if args.mode in ('all', 'parsers'):
+        print(f"\n📊 파싱 방식 (단일 스레드, 실행 기본값: {DEFAULT_PARSER})")
+        compare_parsers(corpus, args.rounds)
+
+    if args.mode in ('all', 'pools'):
+        print(f"\n📊 병렬화 ({DEFAULT_PARSER})")
+        compare_pools(corpus, args.rounds)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+상세 페이지 본문 추출 (텍스트 밀도 기반)
+게시판마다 본문 영역의 클래스가 다르므로, 알려진 본문 div(tbl_view)가 없으면
+블록마다 텍스트 밀도와 링크 밀도로 점수를 매겨 본문 블록 하나만 고릅니다 (readability 방식).
+메뉴, 사이드바, 푸터 글자가 GPT 프롬프트에 들어가 토큰을 쓰지 않게 합니다.
+"""
+
+import math
+import re
+from typing import Dict, List, Optional, Tuple
+
+import lxml.html
+from lxml import etree
+from bs4 import BeautifulSoup, Comment, NavigableString, SoupStrainer, Tag
+
+from context_builder import count_tokens
+from parsing import class_names, has_class
+
+# 빠른 경로: 강남대 게시판 본문 div만 트리로 만듦
+FAST_PATH = SoupStrainer(lambda name, attrs: name == 'div' and has_class(attrs, ('tbl_view',)))
+# 점수를 매기기 전에 지우는 태그 (본문이 아닌 것이 확실한 영역)
+REMOVE_TAGS = ('script', 'style', 'noscript', 'template', 'nav', 'header', 'footer', 'aside', 'iframe', 'svg', 'select', 'button')
+# 본문 후보 블록
+BLOCK_TAGS = {'div', 'article', 'section', 'main', 'td'}
+# 링크가 아닌 글자가 이보다 적은 블록은 후보에서 제외 (짧은 공고도 잡도록 작게)
+MIN_BLOCK_CHARS = 10
+
+# class / id 이름 힌트 (본문에 흔한 이름은 가산, 메뉴 / 푸터에 흔한 이름은 감산)
+POSITIVE_HINT = re.compile(r'article|body|content|entry|post|view|detail|read', re.I)
+NEGATIVE_HINT = re.compile(
+    r'nav|menu|gnb|lnb|snb|footer|header|side|banner|quick|util|comment|share|sns|related|'
+    r'breadcrumb|location|popup|copyright|login|search',
+    re.I
+)
+POSITIVE_WEIGHT = 1.25
+NEGATIVE_WEIGHT = 0.2
+
+
+def char_count(text: str) -> int:
+    """공백을 뺀 글자 수 (유지 / 제외 글자 수 보고용)"""
+    return sum(len(part) for part in text.split())
+
+
+def _hint(tag: Tag) -> float:
+    names = ' '.join(class_names(tag.attrs) + [tag.get('id') or ''])
+    if not names.strip():
+        return 1.0
+    if NEGATIVE_HINT.search(names):
+        return NEGATIVE_WEIGHT
+    if POSITIVE_HINT.search(names):
+        return POSITIVE_WEIGHT
+    return 1.0
+
+
+def _measure(node: Tag, candidates: List[Tuple[float, Tag]]) -> Tuple[int, int, int]:
+    """
+    하위 트리의 (글자 수, 링크 글자 수, 태그 수)를 아래에서부터 한 번에 계산하고 후보 블록 점수를 기록
+
+    점수 = 링크가 아닌 글자 수 x (1 - 링크 밀도) x log2(2 + 텍스트 밀도) x 이름 힌트
+    - 링크 밀도: 링크 글자 / 전체 글자 (메뉴, 목록은 1에 가까움)
+    - 텍스트 밀도: 글자 / 태그 수 (본문은 태그 하나에 글자가 많음)
+    본문을 감싼 바깥 블록은 메뉴까지 포함하므로 링크 밀도가 높고 텍스트 밀도가 낮아져 점수가 내려갑니다.
+    """
+    chars = links = tags = 0
+    for child in node.children:
+        if isinstance(child, Tag):
+            child_chars, child_links, child_tags = _measure(child, candidates)
+            chars += child_chars
+            links += child_chars if child.name == 'a' else child_links
+            tags += child_tags + 1
+        elif isinstance(child, NavigableString) and not isinstance(child, Comment):
+            chars += char_count(child)
+
+    if node.name in BLOCK_TAGS and chars - links >= MIN_BLOCK_CHARS:
+        link_density = links / chars
+        text_density = chars / (tags + 1)
+        score = (chars - links) * (1 - link_density) * math.log2(2 + text_density) * _hint(node)
+        candidates.append((score, node))
+    return chars, links, tags
+
+
+def _describe(tag: Tag) -> str:
+    """보고용 블록 이름 (예: div#bbs-view, article.post)"""
+    if tag.get('id'):
+        return f"{tag.name}#{tag['id']}"
+    classes = class_names(tag.attrs)
+    return f"{tag.name}.{classes[0]}" if classes else tag.name
+
+
+def page_text(html: str) -> str:
+    """스크립트 / 스타일을 뺀 페이지 전체 글자 (보고용, lxml로 빠르게)"""
+    try:
+        document = lxml.html.document_fromstring(html)
+    except Exception:
+        return ''
+    etree.strip_elements(document, 'script', 'style', 'noscript', 'template', with_tail=False)
+    return document.text_content()
+
+
+def extract_main_content(html: str, model: str = "gpt-4o") -> Optional[Dict]:
+    """
+    상세 페이지에서 본문 블록 하나의 텍스트 추출
+
+    1. div.tbl_view가 있으면 그 div만 파싱해서 바로 사용 (빠른 경로)
+    2. 없으면 전체를 파싱하여 메뉴 / 푸터 태그를 지우고 점수가 가장 높은 블록 사용
+    3. 후보 블록이 없으면 body 전체
+
+    Returns:
+        {'text', 'method' ('tbl_view' / 'density' / 'body'), 'block',
+         'page_chars', 'kept_chars', 'page_tokens', 'kept_tokens'} 또는 None (본문 없음)
+    """
+    block = BeautifulSoup(html, 'lxml', parse_only=FAST_PATH).find('div', class_='tbl_view')
+    method = 'tbl_view'
+
+    if block is None or not block.get_text(strip=True):
+        soup = BeautifulSoup(html, 'lxml')
+        body = soup.find('body') or soup
+        for tag in body(REMOVE_TAGS):
+            tag.decompose()
+
+        candidates: List[Tuple[float, Tag]] = []
+        try:
+            _measure(body, candidates)
+        except RecursionError:
+            candidates = []
+
+        if candidates:
+            block = max(candidates, key=lambda candidate: candidate[0])[1]
+            method = 'density'
+        else:
+            block = body
+            method = 'body'
+
+    text = block.get_text(strip=True, separator='\n')
+    if not text:
+        return None
+
+    full_text = page_text(html)
+    page_chars = char_count(full_text)
+    kept_chars = char_count(text)
+    return {
+        'text': text,
+        'method': method,
+        'block': _describe(block) if isinstance(block, Tag) and block.name != '[document]' else 'document',
+        'page_chars': max(page_chars, kept_chars),
+        'kept_chars': kept_chars,
+        'page_tokens': count_tokens(' '.join(full_text.split()), model),
+        'kept_tokens': count_tokens(text, model),
+    }
+
+
+def format_report(extracted: Dict) -> str:
+    """페이지별 본문 추출 보고 한 줄"""
+    dropped = extracted['page_chars'] - extracted['kept_chars']
+    return (
+        f"본문 추출 ({extracted['method']}: {extracted['block']}) "
+        f"{extracted['kept_chars']:,}자 유지 / {dropped:,}자 제외, "
+        f"토큰 {extracted['page_tokens']:,} → {extracted['kept_tokens']:,}"
+    )
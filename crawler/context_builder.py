@@ -0,0 +1,121 @@
+"""
+GPT 프롬프트용 공고 본문 압축
+본문을 줄/문장 단위로 나누고 마감일·자격 조건 관련 문장을 우선하여 토큰 예산 안에 담습니다.
+"""
+
+import re
+from functools import lru_cache
+from typing import List, Tuple
+
+try:
+    import tiktoken
+except ImportError:  # 토크나이저가 없으면 바이트 수 기반 추정
+    tiktoken = None
+
+# 키워드별 가중치 (마감일 > 자격 조건 > 일반 안내)
+KEYWORD_WEIGHTS = (
+    (('마감', '신청기간', '신청 기간', '접수기간', '접수 기간', '모집기간', '제출기한', '기한', '까지'), 5),
+    (('평점', '학점', '성적', 'GPA'), 3),
+    (('소득', '분위', '구간'), 3),
+    (('거주', '주소', '주민등록', '출신'), 3),
+    (('자격', '대상', '선발', '신청방법', '제출서류', '지원금액', '장학금액'), 1),
+)
+# 게시판 메뉴/푸터에 흔한 문구
+BOILERPLATE = ('로그인', '사이트맵', '이전글', '다음글', '목록', '첨부파일', '조회수', '개인정보처리방침', 'Copyright', '바로가기')
+
+DATE_HINT = re.compile(r"\d{1,4}\s*[./년월-]\s*\d{1,2}")
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?다])\s+")
+
+
+@lru_cache(maxsize=4)
+def _encoding(model: str):
+    """모델에 맞는 tiktoken 인코딩 (불러오지 못하면 None)"""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except Exception:
+        try:
+            return tiktoken.get_encoding('o200k_base')
+        except Exception:
+            return None
+
+
+def count_tokens(text: str, model: str = "gpt-4o") -> int:
+    """
+    텍스트의 토큰 수
+
+    tiktoken을 쓸 수 없으면 UTF-8 바이트 수 / 3 으로 넉넉하게 추정합니다 (한글 1자 ≈ 1토큰).
+    """
+    encoding = _encoding(model)
+    if encoding is None:
+        return len(text.encode('utf-8')) // 3 + 1
+    return len(encoding.encode(text))
+
+
+def segment(text: str, max_chars: int = 300) -> List[str]:
+    """본문을 줄 단위로 나누고, 너무 긴 줄은 문장 단위로 다시 나눔"""
+    segments = []
+    for line in text.split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+        if len(line) <= max_chars:
+            segments.append(line)
+        else:
+            segments.extend(part for part in SENTENCE_SPLIT.split(line) if part.strip())
+    return segments
+
+
+def score_segment(segment_text: str) -> float:
+    """마감일/자격 조건 관련도 점수"""
+    score = 0.0
+    for keywords, weight in KEYWORD_WEIGHTS:
+        if any(keyword in segment_text for keyword in keywords):
+            score += weight
+    if DATE_HINT.search(segment_text):
+        score += 2
+    if any(word in segment_text for word in BOILERPLATE):
+        score -= 3
+    if len(segment_text) < 4:
+        score -= 1
+    return score
+
+
+def build_context(text: str, token_budget: int = 1200, model: str = "gpt-4o") -> str:
+    """
+    토큰 예산 안에서 관련도 높은 문장만 골라 원래 순서대로 이어 붙입니다.
+
+    본문 전체가 예산 안에 들어가면 그대로 돌려줍니다.
+    키워드 문장 바로 다음 문장에는 가산점을 주어 "신청기간" / "2026. 1. 5 ~ 1. 31"처럼
+    표 셀이 나뉜 경우에도 함께 담기도록 합니다.
+
+    Args:
+        text: 공고 본문
+        token_budget: 최대 토큰 수
+        model: 토큰 계산 기준 모델
+    """
+    if count_tokens(text, model) <= token_budget:
+        return text
+
+    segments = segment(text)
+    base_scores = [score_segment(part) for part in segments]
+    scored: List[Tuple[float, int]] = []
+    for i, base in enumerate(base_scores):
+        neighbor = max(base_scores[i - 1] if i > 0 else 0, 0)
+        scored.append((base + neighbor * 0.5, i))
+
+    selected = []
+    used = 0
+    # 점수 높은 순, 같으면 앞에 나온 문장 우선
+    for score, i in sorted(scored, key=lambda pair: (-pair[0], pair[1])):
+        if score < 0:
+            # 메뉴/푸터 문구는 예산이 남아도 제외
+            break
+        cost = count_tokens(segments[i], model) + 1
+        if used + cost > token_budget:
+            continue
+        selected.append(i)
+        used += cost
+
+    return '\n'.join(segments[i] for i in sorted(selected))
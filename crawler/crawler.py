@@ -6,29 +6,47 @@ Supabase DB에 자동으로 장학금 데이터를 수집하고 저장합니다.
 import os
 import json
 import time
-import re
+from collections import Counter
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Set
 from dotenv import load_dotenv
 
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from openai import OpenAI
 from supabase import create_client, Client
 
+from content_extractor import extract_main_content, format_report
+from context_builder import build_context
+from llm_scheduler import LLMScheduler
+from pagination import build_page_url, crawl_pages
+from parsing import has_class
+
 # 환경 변수 로드
 load_dotenv()
 
 # API 클라이언트 초기화
-openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"), max_retries=0)
 supabase: Client = create_client(
     os.getenv("SUPABASE_URL"),
     os.getenv("SUPABASE_KEY")
 )
 
+# 목록 페이지에서 트리로 만들 노드 (나머지 메뉴, 푸터 등은 파싱만 하고 버림)
+LIST_LINKS = SoupStrainer(lambda name, attrs: name == 'a' and has_class(attrs, ('detailLink',)))
+
 # 설정값
 TARGET_URL = os.getenv("TARGET_URL")
 MAX_PAGES = int(os.getenv("MAX_PAGES", "10"))
+PAGE_PARAM = os.getenv("PAGE_PARAM", "pageIndex")
+# GPT에 보낼 공고 본문 토큰 예산 (관련 문장 위주로 압축)
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "1200"))
+# OpenAI 속도 제한 (모델별 분당 요청 수 / 토큰 수), 429는 Retry-After에 맞춰 재시도
+llm_scheduler = LLMScheduler(
+    float(os.getenv("LLM_RPM", "500")),
+    float(os.getenv("LLM_TPM", "30000")),
+    max_retries=int(os.getenv("LLM_MAX_RETRIES", "5"))
+)
 DELAY_SECONDS = int(os.getenv("DELAY_SECONDS", "2"))
 
 
@@ -41,13 +59,39 @@ class ScholarshipCrawler:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
         self.processed_links = set()
+        # 본문 추출 누적 (페이지 전체 / 유지한 글자 수와 토큰 수)
+        self.extraction = Counter()
+    
+    def crawl_scholarship_pages(
+        self,
+        url: str,
+        known_filter: Optional[Callable[[List[str]], Set[str]]] = None
+    ) -> List[Dict]:
+        """
+        게시판 목록을 MAX_PAGES 페이지까지 크롤링합니다.
+        
+        Args:
+            url: 크롤링할 게시판 URL
+            known_filter: 링크 목록 중 이미 저장된 링크 집합을 돌려주는 함수
+                (주어지면 모든 공고가 저장된 첫 페이지에서 멈춤)
+            
+        Returns:
+            장학금 공고 리스트 (이미 저장된 공고는 'known': True)
+        """
+        return crawl_pages(
+            lambda page: self.crawl_scholarship_list(build_page_url(url, page, PAGE_PARAM), url),
+            max_pages=MAX_PAGES,
+            known_filter=known_filter,
+            delay=DELAY_SECONDS
+        )
     
-    def crawl_scholarship_list(self, url: str) -> List[Dict]:
+    def crawl_scholarship_list(self, url: str, base_url: Optional[str] = None) -> List[Dict]:
         """
         장학금 게시판 페이지를 크롤링하여 공고 목록을 가져옵니다.
         
         Args:
             url: 크롤링할 게시판 URL
+            base_url: 상세 URL을 만들 때 기준이 되는 게시판 URL (기본: url)
             
         Returns:
             장학금 공고 리스트 [{'title': str, 'link': str, 'raw_html': str}, ...]
@@ -58,8 +102,9 @@ class ScholarshipCrawler:
             response.raise_for_status()
             response.encoding = 'utf-8'
             
-            soup = BeautifulSoup(response.text, 'lxml')
+            soup = BeautifulSoup(response.text, 'lxml', parse_only=LIST_LINKS)
             scholarships = []
+            base_url = base_url or url
             
             # class="detailLink"를 가진 모든 링크 찾기
             detail_links = soup.find_all('a', class_='detailLink')
@@ -76,10 +121,10 @@ class ScholarshipCrawler:
                 
                 # 실제 상세 페이지 URL 구성
                 if href and href != '#':
-                    detail_url = self._build_full_url(url, href)
+                    detail_url = self._build_full_url(base_url, href)
                 else:
                     # data-params에서 URL 구성 (사이트별로 다름)
-                    detail_url = self._extract_detail_url(url, data_params)
+                    detail_url = self._extract_detail_url(base_url, data_params)
                 
                 if detail_url and detail_url not in self.processed_links:
                     scholarships.append({
@@ -111,33 +156,18 @@ class ScholarshipCrawler:
             response.raise_for_status()
             response.encoding = 'utf-8'
             
-            soup = BeautifulSoup(response.text, 'lxml')
-            
-            # 본문 내용 추출 (사이트 구조에 맞게 수정 필요)
-            # 일반적인 게시판 구조 시도
-            content = None
-            
-            # 방법 1: class나 id로 본문 찾기
-            content_div = soup.find('div', class_=re.compile(r'content|article|post|body', re.I))
-            if content_div:
-                content = content_div.get_text(strip=True, separator='\n')
+            # 본문 블록만 추출 (tbl_view가 있으면 바로, 없으면 텍스트 밀도 / 링크 밀도로 선택)
+            extracted = extract_main_content(response.text)
+            if not extracted:
+                return None
             
-            # 방법 2: 특정 태그 찾기
-            if not content:
-                article = soup.find('article')
-                if article:
-                    content = article.get_text(strip=True, separator='\n')
+            print(f"  🧹 {format_report(extracted)}")
+            self.extraction.update({
+                key: extracted[key] for key in ('page_chars', 'kept_chars', 'page_tokens', 'kept_tokens')
+            })
+            self.extraction[extracted['method']] += 1
             
-            # 방법 3: 전체 body에서 추출
-            if not content:
-                body = soup.find('body')
-                if body:
-                    # 불필요한 요소 제거
-                    for tag in body(['script', 'style', 'nav', 'header', 'footer']):
-                        tag.decompose()
-                    content = body.get_text(strip=True, separator='\n')
-            
-            return content if content else None
+            return extracted['text']
             
         except Exception as e:
             print(f"  ❌ 상세 페이지 크롤링 실패: {e}")
@@ -211,12 +241,13 @@ class GPTAnalyzer:
             user_prompt = f"""제목: {title}
 
 내용:
-{content[:3000]}  # 토큰 제한을 위해 3000자로 제한
+{build_context(content, CONTEXT_TOKEN_BUDGET, "gpt-4o-mini")}
 
 위 장학금 공고를 분석하여 min_gpa, max_income, residence, due_date를 추출해주세요."""
 
             # GPT-4o-mini API 호출
-            response = openai_client.chat.completions.create(
+            response = llm_scheduler.create(
+                openai_client,
                 model="gpt-4o-mini",
                 messages=[
                     {"role": "system", "content": system_prompt},
@@ -257,54 +288,86 @@ class SupabaseManager:
     """Supabase 데이터베이스 관리"""
     
     @staticmethod
-    def insert_scholarship(scholarship_data: Dict) -> bool:
+    def get_existing_links(links: List[str]) -> Set[str]:
         """
-        장학금 데이터를 Supabase에 삽입합니다.
+        주어진 링크 중 이미 저장된 링크를 한 번의 쿼리로 조회합니다.
+        
+        Args:
+            links: 확인할 링크 목록 (목록 한 페이지 분량)
+            
+        Returns:
+            이미 저장된 링크 집합 (조회 실패 시 빈 집합)
+        """
+        if not links:
+            return set()
+        
+        try:
+            result = supabase.table('scholarships') \
+                .select('link') \
+                .in_('link', links) \
+                .execute()
+            return {row['link'] for row in result.data or []}
+        except Exception as e:
+            print(f"  ⚠️  저장된 링크 조회 실패: {e}")
+            return set()
+    
+    @staticmethod
+    def insert_scholarship(scholarship_data: Dict) -> str:
+        """
+        장학금 데이터를 Supabase에 삽입합니다 (이미 있는 링크면 건너뜀).
+        
+        중복 확인과 삽입을 upsert(ignore_duplicates) 한 번으로 처리하므로
+        조회 후 삽입 사이에 다른 실행이 같은 공고를 넣어도 충돌하지 않습니다.
         
         Args:
             scholarship_data: 삽입할 장학금 데이터
             
         Returns:
-            성공 여부
+            'inserted' (새로 저장), 'skipped' (이미 존재), 'failed' (오류)
         """
         try:
             print(f"  💾 DB 저장 중: {scholarship_data['title'][:30]}...")
             
-            # 중복 체크 (link 기준)
-            existing = supabase.table('scholarships') \
-                .select('id') \
-                .eq('link', scholarship_data['link']) \
+            # link 고유 인덱스 충돌 시 아무것도 하지 않음 (ON CONFLICT DO NOTHING)
+            result = supabase.table('scholarships') \
+                .upsert(scholarship_data, on_conflict='link', ignore_duplicates=True) \
                 .execute()
             
-            if existing.data:
-                print(f"  ⚠️  이미 존재하는 공고입니다. 건너뜁니다.")
-                return False
-            
-            # 데이터 삽입
-            result = supabase.table('scholarships').insert(scholarship_data).execute()
-            
+            # 삽입된 행만 돌려받으므로 비어 있으면 이미 존재하는 공고
             if result.data:
                 print(f"  ✅ 저장 완료! ID: {result.data[0]['id']}")
-                return True
-            else:
-                print(f"  ❌ 저장 실패")
-                return False
+                return 'inserted'
+            
+            print(f"  ⚠️  이미 존재하는 공고입니다. 건너뜁니다.")
+            return 'skipped'
                 
         except Exception as e:
             print(f"  ❌ DB 오류: {e}")
-            return False
+            return 'failed'
     
     @staticmethod
     def get_statistics() -> Dict:
-        """데이터베이스 통계 조회"""
+        """데이터베이스 통계 조회 (행을 내려받지 않고 개수만)"""
+        # SQL 함수와 count 요청이 같은 기준일을 쓰도록 (마감일이 없는 행은 둘 다 만료로 집계)
+        today = datetime.now().strftime('%Y-%m-%d')
         try:
-            result = supabase.table('scholarships').select('*', count='exact').execute()
+            # scholarship_stats() SQL 함수로 한 번에 계산 (supabase_schema.sql)
+            rows = supabase.rpc('scholarship_stats', {'today': today}).execute().data
+            if rows:
+                return {key: int(rows[0][key]) for key in ('total', 'active', 'expired')}
+        except Exception:
+            pass
+        
+        try:
+            # 함수가 없으면 count만 받는 요청 두 번 (limit(0): 행 없이 개수만)
+            result = supabase.table('scholarships').select('id', count='exact').limit(0).execute()
             total = result.count
             
             # 활성 장학금 (마감일 지나지 않은 것)
             active_result = supabase.table('scholarships') \
-                .select('*', count='exact') \
-                .gte('due_date', datetime.now().strftime('%Y-%m-%d')) \
+                .select('id', count='exact') \
+                .gte('due_date', today) \
+                .limit(0) \
                 .execute()
             active = active_result.count
             
@@ -334,8 +397,14 @@ def main():
     # 크롤러 초기화
     crawler = ScholarshipCrawler()
     
-    # 장학금 목록 크롤링
-    scholarships = crawler.crawl_scholarship_list(TARGET_URL)
+    # 장학금 목록 크롤링 (이미 저장된 공고만 있는 페이지에서 중단)
+    scholarships = crawler.crawl_scholarship_pages(TARGET_URL, SupabaseManager.get_existing_links)
+    
+    # 이미 저장된 공고는 분석하지 않음
+    known_count = sum(1 for scholarship in scholarships if scholarship.get('known'))
+    scholarships = [scholarship for scholarship in scholarships if not scholarship.get('known')]
+    if known_count:
+        print(f"⏭️  이미 저장된 공고 {known_count}개는 건너뜁니다.")
     
     if not scholarships:
         print("❌ 크롤링할 장학금이 없습니다.")
@@ -345,6 +414,7 @@ def main():
     
     # 각 장학금 처리
     success_count = 0
+    skip_count = 0
     fail_count = 0
     
     for idx, scholarship in enumerate(scholarships, 1):
@@ -390,8 +460,11 @@ def main():
         }
         
         # Supabase에 저장
-        if SupabaseManager.insert_scholarship(scholarship_data):
+        status = SupabaseManager.insert_scholarship(scholarship_data)
+        if status == 'inserted':
             success_count += 1
+        elif status == 'skipped':
+            skip_count += 1
         else:
             fail_count += 1
         
@@ -403,9 +476,18 @@ def main():
     print("✅ 크롤링 완료!")
     print("=" * 60)
     print(f"  - 성공: {success_count}개")
+    print(f"  - 중복 (이미 저장됨): {skip_count + known_count}개")
     print(f"  - 실패: {fail_count}개")
     print(f"  - 전체: {len(scholarships)}개\n")
     
+    extraction = crawler.extraction
+    if extraction['page_chars']:
+        print("🧹 본문 추출:")
+        print(f"  - 방식: tbl_view {extraction['tbl_view']}개 / 텍스트 밀도 {extraction['density']}개 / body {extraction['body']}개")
+        print(f"  - 글자: {extraction['page_chars']:,}자 중 {extraction['kept_chars']:,}자 유지 "
+              f"({extraction['page_chars'] - extraction['kept_chars']:,}자 제외)")
+        print(f"  - 토큰: {extraction['page_tokens']:,} → {extraction['kept_tokens']:,}\n")
+    
     # 최신 DB 상태
     print("📊 최종 DB 상태:")
     stats = SupabaseManager.get_statistics()
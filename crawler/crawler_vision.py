@@ -6,10 +6,9 @@
 import os
 import json
 import time
-import base64
 import re
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Set, Tuple
 from urllib.parse import urljoin, urlparse
 from dotenv import load_dotenv
 
@@ -18,11 +17,16 @@ from bs4 import BeautifulSoup
 from openai import OpenAI
 from supabase import create_client, Client
 
+from context_builder import build_context
+from image_preprocess import encode_data_url, read_image_stream
+from llm_scheduler import LLMScheduler
+from pagination import build_page_url, crawl_pages
+
 # 환경 변수 로드
 load_dotenv()
 
 # API 클라이언트 초기화
-openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"), max_retries=0)
 supabase: Client = create_client(
     os.getenv("SUPABASE_URL"),
     os.getenv("SUPABASE_KEY")
@@ -32,7 +36,18 @@ supabase: Client = create_client(
 TARGET_URL = os.getenv("TARGET_URL", "https://web.kangnam.ac.kr/board/scholarship")
 BASE_DOMAIN = "https://web.kangnam.ac.kr"
 MAX_PAGES = int(os.getenv("MAX_PAGES", "10"))
+PAGE_PARAM = os.getenv("PAGE_PARAM", "pageIndex")
+# GPT에 보낼 공고 본문 토큰 예산 (관련 문장 위주로 압축)
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "1200"))
+# OpenAI 속도 제한 (모델별 분당 요청 수 / 토큰 수), 429는 Retry-After에 맞춰 재시도
+llm_scheduler = LLMScheduler(
+    float(os.getenv("LLM_RPM", "500")),
+    float(os.getenv("LLM_TPM", "30000")),
+    max_retries=int(os.getenv("LLM_MAX_RETRIES", "5"))
+)
 DELAY_SECONDS = int(os.getenv("DELAY_SECONDS", "3"))
+# 포스터 다운로드 상한 (OpenAI 이미지 입력 한도 20MB)
+IMAGE_MAX_BYTES = int(os.getenv("IMAGE_MAX_BYTES", str(20 * 1024 * 1024)))
 
 
 class ScholarshipCrawler:
@@ -47,12 +62,36 @@ class ScholarshipCrawler:
         })
         self.processed_links = set()
     
-    def crawl_scholarship_list(self, url: str) -> List[Dict]:
+    def crawl_scholarship_pages(
+        self,
+        url: str,
+        known_filter: Optional[Callable[[List[str]], Set[str]]] = None
+    ) -> List[Dict]:
+        """
+        게시판 목록을 MAX_PAGES 페이지까지 크롤링합니다.
+        
+        Args:
+            url: 크롤링할 게시판 URL
+            known_filter: 링크 목록 중 이미 저장된 링크 집합을 돌려주는 함수
+                (주어지면 모든 공고가 저장된 첫 페이지에서 멈춤)
+            
+        Returns:
+            장학금 공고 리스트 (이미 저장된 공고는 'known': True)
+        """
+        return crawl_pages(
+            lambda page: self.crawl_scholarship_list(build_page_url(url, page, PAGE_PARAM), url),
+            max_pages=MAX_PAGES,
+            known_filter=known_filter,
+            delay=DELAY_SECONDS
+        )
+    
+    def crawl_scholarship_list(self, url: str, base_url: Optional[str] = None) -> List[Dict]:
         """
         장학금 게시판 페이지를 크롤링하여 공고 목록을 가져옵니다.
         
         Args:
             url: 크롤링할 게시판 URL
+            base_url: 상세 URL을 만들 때 기준이 되는 게시판 URL (기본: url)
             
         Returns:
             장학금 공고 리스트 [{'title': str, 'link': str, 'date': str}, ...]
@@ -164,19 +203,15 @@ class ScholarshipCrawler:
         try:
             print(f"  📥 이미지 다운로드 중: {image_url}")
             
-            # 이미지 다운로드
-            response = self.session.get(image_url, timeout=15)
-            response.raise_for_status()
-            
-            # Base64 인코딩
-            image_data = base64.b64encode(response.content).decode('utf-8')
-            
-            # 이미지 타입 추출
-            content_type = response.headers.get('Content-Type', 'image/jpeg')
+            # 이미지 다운로드 (스트리밍, 크기 상한 / 시그니처 확인)
+            with self.session.get(image_url, timeout=15, stream=True) as response:
+                response.raise_for_status()
+                image_data, content_type = read_image_stream(response.iter_content(65536), IMAGE_MAX_BYTES)
             
             print(f"  ✅ 이미지 다운로드 완료 ({len(image_data)} bytes)")
             
-            return f"data:{content_type};base64,{image_data}"
+            # Base64 인코딩 (문자열 하나에 청크 단위로)
+            return encode_data_url(image_data, content_type)
             
         except Exception as e:
             print(f"  ❌ 이미지 다운로드 실패: {e}")
@@ -225,7 +260,8 @@ class GPTVisionAnalyzer:
             print(f"  🤖 GPT-4o Vision 분석 중...")
             
             # GPT-4o Vision API 호출
-            response = openai_client.chat.completions.create(
+            response = llm_scheduler.create(
+                openai_client,
                 model="gpt-4o",  # Vision 지원 모델
                 messages=[
                     {
@@ -347,12 +383,13 @@ class GPTVisionAnalyzer:
             user_prompt = f"""제목: {title}
 
 내용:
-{content[:4000]}  # 토큰 제한
+{build_context(content, CONTEXT_TOKEN_BUDGET, "gpt-4o")}
 
 위 장학금 공고를 분석하여 min_gpa, max_income, residence, due_date를 추출해주세요."""
 
             # GPT-4o API 호출
-            response = openai_client.chat.completions.create(
+            response = llm_scheduler.create(
+                openai_client,
                 model="gpt-4o",
                 messages=[
                     {"role": "system", "content": system_prompt},
@@ -393,54 +430,86 @@ class SupabaseManager:
     """Supabase 데이터베이스 관리"""
     
     @staticmethod
-    def insert_scholarship(scholarship_data: Dict) -> bool:
+    def get_existing_links(links: List[str]) -> Set[str]:
+        """
+        주어진 링크 중 이미 저장된 링크를 한 번의 쿼리로 조회합니다.
+        
+        Args:
+            links: 확인할 링크 목록 (목록 한 페이지 분량)
+            
+        Returns:
+            이미 저장된 링크 집합 (조회 실패 시 빈 집합)
+        """
+        if not links:
+            return set()
+        
+        try:
+            result = supabase.table('scholarships') \
+                .select('link') \
+                .in_('link', links) \
+                .execute()
+            return {row['link'] for row in result.data or []}
+        except Exception as e:
+            print(f"  ⚠️  저장된 링크 조회 실패: {e}")
+            return set()
+    
+    @staticmethod
+    def insert_scholarship(scholarship_data: Dict) -> str:
         """
-        장학금 데이터를 Supabase에 삽입합니다.
+        장학금 데이터를 Supabase에 삽입합니다 (이미 있는 링크면 건너뜀).
+        
+        중복 확인과 삽입을 upsert(ignore_duplicates) 한 번으로 처리하므로
+        조회 후 삽입 사이에 다른 실행이 같은 공고를 넣어도 충돌하지 않습니다.
         
         Args:
             scholarship_data: 삽입할 장학금 데이터
             
         Returns:
-            성공 여부
+            'inserted' (새로 저장), 'skipped' (이미 존재), 'failed' (오류)
         """
         try:
             print(f"  💾 DB 저장 중: {scholarship_data['title'][:30]}...")
             
-            # 중복 체크 (link 기준)
-            existing = supabase.table('scholarships') \
-                .select('id') \
-                .eq('link', scholarship_data['link']) \
+            # link 고유 인덱스 충돌 시 아무것도 하지 않음 (ON CONFLICT DO NOTHING)
+            result = supabase.table('scholarships') \
+                .upsert(scholarship_data, on_conflict='link', ignore_duplicates=True) \
                 .execute()
             
-            if existing.data:
-                print(f"  ⚠️  이미 존재하는 공고입니다. 건너뜁니다.")
-                return False
-            
-            # 데이터 삽입
-            result = supabase.table('scholarships').insert(scholarship_data).execute()
-            
+            # 삽입된 행만 돌려받으므로 비어 있으면 이미 존재하는 공고
             if result.data:
                 print(f"  ✅ 저장 완료! ID: {result.data[0]['id']}")
-                return True
-            else:
-                print(f"  ❌ 저장 실패")
-                return False
+                return 'inserted'
+            
+            print(f"  ⚠️  이미 존재하는 공고입니다. 건너뜁니다.")
+            return 'skipped'
                 
         except Exception as e:
             print(f"  ❌ DB 오류: {e}")
-            return False
+            return 'failed'
     
     @staticmethod
     def get_statistics() -> Dict:
-        """데이터베이스 통계 조회"""
+        """데이터베이스 통계 조회 (행을 내려받지 않고 개수만)"""
+        # SQL 함수와 count 요청이 같은 기준일을 쓰도록 (마감일이 없는 행은 둘 다 만료로 집계)
+        today = datetime.now().strftime('%Y-%m-%d')
+        try:
+            # scholarship_stats() SQL 함수로 한 번에 계산 (supabase_schema.sql)
+            rows = supabase.rpc('scholarship_stats', {'today': today}).execute().data
+            if rows:
+                return {key: int(rows[0][key]) for key in ('total', 'active', 'expired')}
+        except Exception:
+            pass
+        
         try:
-            result = supabase.table('scholarships').select('*', count='exact').execute()
+            # 함수가 없으면 count만 받는 요청 두 번 (limit(0): 행 없이 개수만)
+            result = supabase.table('scholarships').select('id', count='exact').limit(0).execute()
             total = result.count
             
             # 활성 장학금 (마감일 지나지 않은 것)
             active_result = supabase.table('scholarships') \
-                .select('*', count='exact') \
-                .gte('due_date', datetime.now().strftime('%Y-%m-%d')) \
+                .select('id', count='exact') \
+                .gte('due_date', today) \
+                .limit(0) \
                 .execute()
             active = active_result.count
             
@@ -470,8 +539,14 @@ def main():
     # 크롤러 초기화
     crawler = ScholarshipCrawler()
     
-    # 장학금 목록 크롤링
-    scholarships = crawler.crawl_scholarship_list(TARGET_URL)
+    # 장학금 목록 크롤링 (이미 저장된 공고만 있는 페이지에서 중단)
+    scholarships = crawler.crawl_scholarship_pages(TARGET_URL, SupabaseManager.get_existing_links)
+    
+    # 이미 저장된 공고는 분석하지 않음
+    known_count = sum(1 for scholarship in scholarships if scholarship.get('known'))
+    scholarships = [scholarship for scholarship in scholarships if not scholarship.get('known')]
+    if known_count:
+        print(f"⏭️  이미 저장된 공고 {known_count}개는 건너뜁니다.")
     
     if not scholarships:
         print("❌ 크롤링할 장학금이 없습니다.")
@@ -481,6 +556,7 @@ def main():
     
     # 각 장학금 처리
     success_count = 0
+    skip_count = 0
     fail_count = 0
     image_count = 0
     text_count = 0
@@ -553,8 +629,11 @@ def main():
         }
         
         # Supabase에 저장
-        if SupabaseManager.insert_scholarship(scholarship_data):
+        status = SupabaseManager.insert_scholarship(scholarship_data)
+        if status == 'inserted':
             success_count += 1
+        elif status == 'skipped':
+            skip_count += 1
         else:
             fail_count += 1
         
@@ -566,6 +645,7 @@ def main():
     print("✅ 크롤링 완료!")
     print("=" * 70)
     print(f"  - 성공: {success_count}개")
+    print(f"  - 중복 (이미 저장됨): {skip_count + known_count}개")
     print(f"  - 실패: {fail_count}개")
     print(f"  - 전체: {len(scholarships)}개")
     print(f"\n  📊 분석 방법:")
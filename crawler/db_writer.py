@@ -0,0 +1,142 @@
+"""
+Supabase 일괄 저장 버퍼 (write-behind)
+분석된 행을 모아 두었다가 N개가 차거나 T초가 지나면 백그라운드 스레드에서 한 번에 저장합니다.
+"""
+
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+def write_with_split(
+    write: Callable[[List[Dict]], None],
+    rows: List[Dict]
+) -> Tuple[List[Dict], List[Dict]]:
+    """
+    rows를 한 번에 저장하고, 실패하면 반으로 나눠 다시 시도합니다.
+
+    한 행 때문에 배치 전체가 실패해도 나머지 행은 저장되고, 문제 행만 실패로 남습니다.
+
+    Args:
+        write: 행 리스트를 저장하는 함수 (실패 시 예외)
+        rows: 저장할 행
+
+    Returns:
+        (저장된 행, 실패한 행)
+    """
+    if not rows:
+        return [], []
+    try:
+        write(rows)
+        return rows, []
+    except Exception as e:
+        if len(rows) == 1:
+            print(f"  ❌ DB 저장 실패 ({rows[0].get('link', '?')}): {e}")
+            return [], rows
+        print(f"  ⚠️  DB 일괄 저장 실패 ({len(rows)}개), 나눠서 재시도: {e}")
+
+    middle = len(rows) // 2
+    saved_left, failed_left = write_with_split(write, rows[:middle])
+    saved_right, failed_right = write_with_split(write, rows[middle:])
+    return saved_left + saved_right, failed_left + failed_right
+
+
+class BufferedWriter:
+    """
+    행을 모아 백그라운드 스레드에서 일괄 저장
+
+    - add()는 버퍼에 넣고 바로 돌아오므로 크롤링/분석이 DB를 기다리지 않습니다.
+    - batch_size개가 모이거나 flush_interval초가 지나면 저장합니다.
+    - 같은 키(key_field)의 행이 버퍼에 다시 들어오면 마지막 행만 남깁니다
+      (PostgREST upsert는 한 요청 안에 같은 충돌 키가 두 번 나오면 실패).
+    - close()에서 남은 행을 모두 저장하고 스레드를 종료합니다.
+
+    Args:
+        write: 행 리스트를 저장하는 함수 (실패 시 예외)
+        batch_size: 한 번에 저장할 최대 행 수
+        flush_interval: 행이 버퍼에 머무는 최대 시간 (초)
+        key_field: 중복 제거 기준 필드
+        on_saved: 저장이 끝난 행 리스트를 받는 함수 (백그라운드 스레드에서 호출)
+    """
+
+    def __init__(
+        self,
+        write: Callable[[List[Dict]], None],
+        batch_size: int = 50,
+        flush_interval: float = 5.0,
+        key_field: str = 'link',
+        on_saved: Optional[Callable[[List[Dict]], None]] = None
+    ):
+        self.write = write
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.key_field = key_field
+        self.on_saved = on_saved
+        self.saved: List[Dict] = []
+        self.failed: List[Dict] = []
+        self.flushes = 0
+        self._buffer: Dict[str, Dict] = {}
+        self._oldest: Optional[float] = None
+        self._closing = False
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, row: Dict):
+        """행을 버퍼에 추가 (처음 호출 시 백그라운드 스레드 시작)"""
+        with self._cond:
+            if self._thread is None:
+                self._closing = False
+                self._thread = threading.Thread(target=self._run, name='db-writer', daemon=True)
+                self._thread.start()
+            self._buffer[row[self.key_field]] = row
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+            if len(self._buffer) >= self.batch_size:
+                self._cond.notify()
+
+    def _take(self) -> Optional[List[Dict]]:
+        """저장할 때가 되면 버퍼를 비워 돌려줌 (종료 중이고 버퍼가 비었으면 None)"""
+        with self._cond:
+            while True:
+                if self._buffer:
+                    waited = time.monotonic() - self._oldest
+                    if self._closing or len(self._buffer) >= self.batch_size or waited >= self.flush_interval:
+                        rows = list(self._buffer.values())[:self.batch_size]
+                        for row in rows:
+                            del self._buffer[row[self.key_field]]
+                        self._oldest = time.monotonic() if self._buffer else None
+                        return rows
+                    self._cond.wait(self.flush_interval - waited)
+                elif self._closing:
+                    return None
+                else:
+                    self._cond.wait()
+
+    def _run(self):
+        while True:
+            rows = self._take()
+            if rows is None:
+                return
+            saved, failed = write_with_split(self.write, rows)
+            with self._cond:
+                self.flushes += 1
+                self.saved.extend(saved)
+                self.failed.extend(failed)
+            print(f"  💾 DB 일괄 저장: {len(saved)}/{len(rows)}개")
+            if saved and self.on_saved is not None:
+                try:
+                    self.on_saved(saved)
+                except Exception as e:
+                    print(f"  ⚠️  저장 후 처리 실패: {e}")
+
+    def close(self):
+        """남은 행을 모두 저장하고 백그라운드 스레드 종료"""
+        with self._cond:
+            thread = self._thread
+            if thread is None:
+                return
+            self._closing = True
+            self._cond.notify()
+        thread.join()
+        with self._cond:
+            self._thread = None
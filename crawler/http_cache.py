@@ -0,0 +1,157 @@
+"""
+조건부 GET HTTP 캐시 (SQLite)
+URL별로 ETag, Last-Modified, 본문 해시와 파싱 결과를 저장해 두고,
+다음 요청에 If-None-Match / If-Modified-Since를 붙여 바뀐 페이지만 다시 받아 파싱합니다.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+class HTTPCache:
+    """
+    페이지 URL별 검증자(ETag / Last-Modified)와 파싱 결과 캐시
+
+    - conditional_headers(url): 저장된 검증자로 조건부 요청 헤더 생성
+    - unchanged(url, response): 304이거나 (서버가 조건부 헤더를 무시해도) 본문 해시가 같으면
+      저장된 파싱 결과를, 바뀌었으면 None을 돌려줌
+    - store(url, response, parsed): 새 검증자와 파싱 결과 저장
+
+    version이 다른 항목(파싱 코드가 바뀌기 전 결과)은 없는 것으로 취급합니다.
+    여러 스레드에서 같은 인스턴스를 공유해도 안전합니다.
+
+    Args:
+        path: SQLite 파일 경로
+        version: 파싱 결과 형식 버전
+        ttl_seconds: 이 시간이 지난 항목은 조건부 요청 없이 새로 받음
+    """
+
+    def __init__(self, path: str, version: str = '1', ttl_seconds: float = 30 * 86400):
+        self.path = path
+        self.version = version
+        self.ttl_seconds = ttl_seconds
+        self.not_modified = 0
+        self.same_body = 0
+        self.changed = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS http_cache (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                body_hash TEXT NOT NULL,
+                parsed TEXT NOT NULL,
+                version TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    @staticmethod
+    def hash_body(body: bytes) -> str:
+        return hashlib.sha256(body).hexdigest()
+
+    def _entry(self, url: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, body_hash, parsed, version, fetched_at FROM http_cache WHERE url = ?",
+                (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, body_hash, parsed, version, fetched_at = row
+        if version != self.version or time.time() - fetched_at > self.ttl_seconds:
+            return None
+        return {'etag': etag, 'last_modified': last_modified, 'body_hash': body_hash, 'parsed': parsed}
+
+    @staticmethod
+    def validators(response) -> Dict[str, Optional[str]]:
+        """응답의 검증자 (파싱 결과 안에 따로 저장하는 포스터 이미지 등에 사용)"""
+        return {'etag': response.headers.get('ETag'), 'last_modified': response.headers.get('Last-Modified')}
+
+    @staticmethod
+    def validator_headers(validators: Dict[str, Optional[str]]) -> Dict[str, str]:
+        """검증자로 만든 If-None-Match / If-Modified-Since 헤더"""
+        headers = {}
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+        return headers
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since 헤더 (저장된 항목이 없으면 빈 dict)"""
+        entry = self._entry(url)
+        if entry is None:
+            return {}
+        return self.validator_headers(entry)
+
+    def unchanged(self, url: str, response) -> Optional[Any]:
+        """
+        응답이 저장된 페이지와 같으면 저장된 파싱 결과 (다르거나 항목이 없으면 None)
+
+        304 응답이면 본문 없이 바로 판단하고, 200 응답이면 본문 해시를 비교합니다.
+        """
+        entry = self._entry(url)
+        if entry is None:
+            if response.status_code != 304:
+                self.changed += 1
+            return None
+
+        if response.status_code == 304:
+            self.not_modified += 1
+        elif response.status_code == 200 and self.hash_body(response.content) == entry['body_hash']:
+            self.same_body += 1
+            # 서버가 새 검증자를 주었으면 다음 요청부터 304를 받을 수 있도록 갱신
+            self._touch(url, response)
+        else:
+            self.changed += 1
+            return None
+        return json.loads(entry['parsed'])
+
+    def _touch(self, url: str, response):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE http_cache SET etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified), "
+                "fetched_at = ? WHERE url = ?",
+                (response.headers.get('ETag'), response.headers.get('Last-Modified'), time.time(), url)
+            )
+            self._conn.commit()
+
+    def store(self, url: str, response, parsed: Any):
+        """200 응답의 검증자, 본문 해시와 파싱 결과 저장"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO http_cache "
+                "(url, etag, last_modified, body_hash, parsed, version, fetched_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    url,
+                    response.headers.get('ETag'),
+                    response.headers.get('Last-Modified'),
+                    self.hash_body(response.content),
+                    json.dumps(parsed, ensure_ascii=False),
+                    self.version,
+                    time.time(),
+                )
+            )
+            self._conn.commit()
+
+    def update_parsed(self, url: str, parsed: Any):
+        """저장된 항목의 파싱 결과만 교체 (예: 이미지를 받은 뒤 계산한 내용 해시 추가)"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE http_cache SET parsed = ? WHERE url = ?",
+                (json.dumps(parsed, ensure_ascii=False), url)
+            )
+            self._conn.commit()
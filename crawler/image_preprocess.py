@@ -0,0 +1,215 @@
+"""
+포스터 이미지 전처리 (Pillow)
+GPT Vision에 보내기 전에 모델이 실제로 보는 해상도로 줄여 토큰과 전송량을 절약합니다.
+"""
+
+import binascii
+import io
+import math
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from PIL import Image, ImageChops, ImageOps
+
+# GPT-4o Vision 해상도 규칙
+# high: 2048x2048 안에 맞춘 뒤 짧은 변을 768로 축소, 512px 타일당 170토큰 + 기본 85토큰
+# low: 512x512 한 장, 85토큰 고정
+TILE_SIZE = 512
+MAX_SIDE = 2048
+SHORT_SIDE = 768
+BASE_TOKENS = 85
+TILE_TOKENS = 170
+
+MIME_TYPES = {'JPEG': 'image/jpeg', 'WEBP': 'image/webp', 'PNG': 'image/png'}
+
+# 파일 앞부분 시그니처로 판별하는 이미지 형식 (WEBP는 RIFF....WEBP)
+IMAGE_SIGNATURES = (
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (b'GIF87a', 'image/gif'),
+    (b'GIF89a', 'image/gif'),
+)
+# 형식 판별에 필요한 앞부분 길이
+SNIFF_BYTES = 12
+# data URL 인코딩 단위 (3의 배수여야 중간에 패딩이 생기지 않음)
+ENCODE_CHUNK = 3 * 64 * 1024
+
+
+def vision_target_size(width: int, height: int, detail: str = "high") -> Tuple[int, int]:
+    """
+    Vision 모델이 내부적으로 사용하는 이미지 크기 계산 (확대는 하지 않음)
+
+    Args:
+        width, height: 원본 크기
+        detail: "high" 또는 "low"
+
+    Returns:
+        (width, height)
+    """
+    if detail == "low":
+        scale = min(1.0, TILE_SIZE / max(width, height))
+    else:
+        scale = min(1.0, MAX_SIDE / max(width, height))
+        scale *= min(1.0, SHORT_SIDE / (min(width, height) * scale))
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def estimate_image_tokens(width: int, height: int, detail: str = "high") -> int:
+    """이미지 한 장의 Vision 입력 토큰 수 추정"""
+    if detail == "low":
+        return BASE_TOKENS
+    target_w, target_h = vision_target_size(width, height, detail)
+    tiles = math.ceil(target_w / TILE_SIZE) * math.ceil(target_h / TILE_SIZE)
+    return BASE_TOKENS + TILE_TOKENS * tiles
+
+
+def image_tiles(data: bytes) -> int:
+    """고해상도(detail=high)로 보낼 때 차지하는 512px 타일 수 (크기를 읽지 못하면 최대치)"""
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            width, height = vision_target_size(*image.size, detail="high")
+    except Exception:
+        width, height = SHORT_SIDE, MAX_SIDE
+    return math.ceil(width / TILE_SIZE) * math.ceil(height / TILE_SIZE)
+
+
+def fit_budget(costs: Sequence[int], budget: int) -> List[int]:
+    """
+    예산 안에서 보낼 이미지 조각 번호 (순서 유지)
+
+    앞 조각부터 고르되 마지막 조각은 항상 포함합니다.
+    긴 포스터를 나눠 올리면 마감일과 문의처가 마지막 조각에 있는 경우가 많습니다.
+    """
+    if not costs:
+        return []
+    last = len(costs) - 1
+    chosen, used = [], costs[last]
+    for index in range(last):
+        if used + costs[index] > budget:
+            break
+        chosen.append(index)
+        used += costs[index]
+    return chosen + [last]
+
+
+def trim_margins(image: Image.Image, tolerance: int = 12) -> Image.Image:
+    """
+    가장자리의 단색 여백 제거
+
+    왼쪽 위 픽셀 색을 배경으로 보고, 배경과 tolerance 이상 차이나는 영역만 남깁니다.
+    """
+    background = Image.new(image.mode, image.size, image.getpixel((0, 0)))
+    diff = ImageChops.difference(image, background)
+    if diff.mode != 'L':
+        diff = diff.convert('L')
+    bbox = diff.point(lambda value: 255 if value > tolerance else 0).getbbox()
+    if bbox and bbox != (0, 0) + image.size:
+        return image.crop(bbox)
+    return image
+
+
+def preprocess_poster(
+    data: bytes,
+    detail: str = "high",
+    image_format: str = "JPEG",
+    quality: int = 80,
+    grayscale: bool = True
+) -> Tuple[bytes, str]:
+    """
+    포스터 이미지를 Vision 분석용으로 압축
+
+    1. EXIF 회전 보정, 투명 배경은 흰색으로 합성
+    2. 흑백 변환 (공고문은 글자 인식이 목적이므로 색 정보가 거의 필요 없음)
+    3. 단색 여백 제거
+    4. 모델이 실제로 사용하는 해상도로 축소
+    5. JPEG/WebP로 다시 인코딩
+
+    Args:
+        data: 원본 이미지 바이트
+        detail: 보낼 Vision detail ("high" 또는 "low")
+        image_format: "JPEG", "WEBP" 또는 "PNG"
+        quality: JPEG/WebP 품질 (1~100)
+        grayscale: 흑백 변환 여부
+
+    Returns:
+        (압축된 이미지 바이트, MIME 타입)
+    """
+    image_format = image_format.upper()
+
+    with Image.open(io.BytesIO(data)) as source:
+        image = ImageOps.exif_transpose(source)
+
+        if image.mode in ('RGBA', 'LA', 'P'):
+            image = image.convert('RGBA')
+            canvas = Image.new('RGBA', image.size, (255, 255, 255, 255))
+            image = Image.alpha_composite(canvas, image)
+
+        image = image.convert('L' if grayscale else 'RGB')
+        image = trim_margins(image)
+
+        target = vision_target_size(image.width, image.height, detail)
+        if target != image.size:
+            image = image.resize(target, Image.LANCZOS)
+
+        buffer = io.BytesIO()
+        if image_format == 'PNG':
+            image.save(buffer, format='PNG', optimize=True)
+        else:
+            image.save(buffer, format=image_format, quality=quality, optimize=True)
+
+    return buffer.getvalue(), MIME_TYPES.get(image_format, 'image/jpeg')
+
+
+def sniff_image_type(head: bytes) -> Optional[str]:
+    """파일 앞부분 시그니처로 이미지 MIME 타입 판별 (이미지가 아니면 None)"""
+    for signature, mime in IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return mime
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return 'image/webp'
+    return None
+
+
+def read_image_stream(chunks: Iterable[bytes], max_bytes: int) -> Tuple[bytearray, str]:
+    """
+    스트리밍 응답 청크를 하나의 bytearray에 모음
+
+    response.content처럼 청크 목록과 합친 사본을 따로 만들지 않고,
+    max_bytes를 넘거나 앞부분이 이미지 시그니처가 아니면 나머지를 받기 전에 중단합니다.
+
+    Returns:
+        (이미지 바이트, 시그니처로 판별한 MIME 타입)
+
+    Raises:
+        ValueError: 크기 초과 또는 이미지가 아닌 응답
+    """
+    buffer = bytearray()
+    mime = None
+    for chunk in chunks:
+        if len(buffer) + len(chunk) > max_bytes:
+            raise ValueError(f"이미지가 너무 큽니다 ({max_bytes // 1024}KB 초과)")
+        buffer += chunk
+        if mime is None and len(buffer) >= SNIFF_BYTES:
+            mime = sniff_image_type(bytes(buffer[:SNIFF_BYTES]))
+            if mime is None:
+                raise ValueError("이미지 형식이 아닙니다")
+
+    if mime is None:
+        mime = sniff_image_type(bytes(buffer))
+        if mime is None:
+            raise ValueError("이미지 형식이 아닙니다")
+    return buffer, mime
+
+
+def encode_data_url(data: bytes, mime: str) -> str:
+    """
+    이미지 바이트를 data URL로 인코딩
+
+    청크 단위로 base64를 만들어 문자열 하나 뒤에 이어 붙입니다.
+    다른 참조가 없는 지역 문자열에 +=를 하면 CPython이 제자리에서 크기를 늘리므로,
+    b64encode 결과 / decode 결과 / f-string 결과 같은 전체 크기 사본이 따로 생기지 않습니다.
+    """
+    data_url = f"data:{mime};base64,"
+    with memoryview(data) as view:
+        for start in range(0, len(data), ENCODE_CHUNK):
+            data_url += binascii.b2a_base64(view[start:start + ENCODE_CHUNK], newline=False).decode('ascii')
+    return data_url
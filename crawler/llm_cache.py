@@ -0,0 +1,200 @@
+"""
+GPT 분석 결과 디스크 캐시 (SQLite)
+같은 모델 + 프롬프트 버전 + 내용으로 다시 분석하면 저장된 결과를 돌려줍니다.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+
+# 긴 내용을 해시할 때 한 번에 인코딩할 문자 수
+HASH_CHUNK_CHARS = 1024 * 1024
+
+
+class LLMCache:
+    """
+    내용 주소 기반 LLM 결과 캐시
+
+    - 키: sha256(모델 | 프롬프트 버전 | 내용 해시)
+    - 만료: ttl_seconds가 지난 항목은 무시하고 삭제
+    - 용량: max_entries를 넘으면 가장 오래 사용하지 않은 항목부터 삭제 (LRU)
+    - 중복 호출 병합: 같은 키를 동시에 요청하면 한 번만 계산하고 결과를 공유
+
+    여러 스레드에서 같은 인스턴스를 공유해도 안전합니다.
+    """
+
+    def __init__(self, path: str, max_entries: int = 5000, ttl_seconds: float = 30 * 86400):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed ON llm_cache(accessed_at)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(model: str, prompt_version: str, content_hash: str) -> str:
+        """모델, 프롬프트 버전, 내용 해시로 캐시 키 생성"""
+        return hashlib.sha256(f"{model}|{prompt_version}|{content_hash}".encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def hash_content(*parts: str) -> str:
+        """
+        프롬프트에 들어가는 내용(제목, 본문, 이미지 등)의 해시
+
+        data URL처럼 긴 문자열도 통째로 인코딩한 사본을 만들지 않도록 나눠서 해시합니다.
+        """
+        digest = hashlib.sha256()
+        for part in parts:
+            for start in range(0, len(part), HASH_CHUNK_CHARS):
+                digest.update(part[start:start + HASH_CHUNK_CHARS].encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """캐시 조회 (없거나 만료되었으면 None)"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            value, created_at = row
+            if now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+
+            self._conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+        return json.loads(value)
+
+    def set(self, key: str, value: Any):
+        """캐시 저장 후 만료 / 초과 항목 정리"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), now, now)
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """
+        여러 키를 한 번에 조회 (묶음 분석 전에 사용)
+
+        다른 스레드가 get_or_compute로 계산 중인 키는 그 결과를 기다려 함께 돌려줍니다.
+
+        Returns:
+            {키: 결과} (찾은 키만, 적중으로 집계)
+        """
+        found: Dict[str, Any] = {}
+        waiting: Dict[str, Future] = {}
+        for key in keys:
+            cached = self.get(key)
+            if cached is not None:
+                found[key] = cached
+                continue
+            with self._lock:
+                future = self._inflight.get(key)
+            if future is not None:
+                waiting[key] = future
+
+        for key, future in waiting.items():
+            try:
+                result = future.result()
+            except Exception:
+                continue
+            if result is not None:
+                found[key] = json.loads(result)
+
+        with self._lock:
+            self.hits += len(found)
+        return found
+
+    def put_many(self, values: Dict[str, Any]):
+        """묶음 분석 결과를 한 번에 저장 (새로 계산한 결과이므로 호출로 집계)"""
+        if not values:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO llm_cache (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                [(key, json.dumps(value, ensure_ascii=False), now, now) for key, value in values.items()]
+            )
+            self._evict(now)
+            self._conn.commit()
+            self.misses += len(values)
+
+    def _evict(self, now: float):
+        """TTL이 지난 항목과 max_entries를 넘는 오래된 항목 삭제 (lock 보유 상태에서 호출)"""
+        self._conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,))
+        self._conn.execute("""
+            DELETE FROM llm_cache WHERE key IN (
+                SELECT key FROM llm_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+            )
+        """, (self.max_entries,))
+
+    def get_or_compute(self, key: str, compute: Callable[[], Optional[Any]]) -> Optional[Any]:
+        """
+        캐시에 있으면 돌려주고, 없으면 compute()로 계산하여 저장합니다.
+
+        같은 키를 계산 중인 스레드가 있으면 새로 호출하지 않고 그 결과를 기다립니다.
+        compute()가 None을 돌려주면 (분석 실패) 저장하지 않습니다.
+        """
+        cached = self.get(key)
+        if cached is not None:
+            with self._lock:
+                self.hits += 1
+            return cached
+
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if not leader:
+            result = future.result()
+            return json.loads(result) if result is not None else None
+
+        try:
+            value = compute()
+            if value is not None:
+                self.set(key, value)
+            future.set_result(json.dumps(value, ensure_ascii=False) if value is not None else None)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
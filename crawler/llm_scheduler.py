@@ -0,0 +1,310 @@
+"""
+OpenAI 호출 속도 제한 스케줄러
+모델별 분당 요청 수(RPM)와 분당 토큰 수(TPM) 예산 안에서만 호출을 내보내고,
+429 / 일시적 오류는 Retry-After와 지수 백오프(+지터)로 다시 시도합니다.
+"""
+
+import base64
+import io
+import random
+import re
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import openai
+from PIL import Image
+
+from context_builder import count_tokens
+from image_preprocess import estimate_image_tokens
+from throttle import AIMDController
+
+# 메시지 하나당 역할/구분자 토큰
+MESSAGE_OVERHEAD_TOKENS = 4
+# 이미지 크기를 읽을 때 디코딩할 data URL 앞부분 길이 (base64 문자 수, 4의 배수)
+IMAGE_HEADER_CHARS = 64 * 1024
+# 다시 시도할 오류 (속도 제한, 서버 오류, 네트워크 오류)
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.InternalServerError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+)
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+
+
+def parse_reset_duration(value: Optional[str]) -> Optional[float]:
+    """x-ratelimit-reset-* 헤더 ("1s", "6m0s", "20ms") 를 초 단위로 변환"""
+    if not value:
+        return None
+    seconds = 0.0
+    for number, unit in _DURATION_PART.findall(value):
+        seconds += float(number) * {'h': 3600, 'm': 60, 's': 1, 'ms': 0.001}[unit]
+    return seconds
+
+
+def parse_retry_after(headers) -> Optional[float]:
+    """retry-after-ms / retry-after 헤더 (초)"""
+    if headers is None:
+        return None
+    for name, scale in (('retry-after-ms', 0.001), ('retry-after', 1.0)):
+        try:
+            return float(headers.get(name)) * scale
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def estimate_request_tokens(body: Dict[str, Any]) -> int:
+    """
+    요청 하나가 TPM 예산에서 차지하는 토큰 수 추정
+
+    OpenAI는 프롬프트 토큰에 max_tokens를 더한 값으로 요청을 받아들일지 판단하므로 둘을 합산합니다.
+    이미지는 data URL의 크기로 Vision 타일 토큰을 계산합니다.
+    """
+    model = body.get('model', 'gpt-4o')
+    tokens = body.get('max_tokens') or 0
+
+    for message in body.get('messages', []):
+        tokens += MESSAGE_OVERHEAD_TOKENS
+        content = message.get('content')
+        if isinstance(content, str):
+            tokens += count_tokens(content, model)
+            continue
+        for part in content or []:
+            if part.get('type') == 'text':
+                tokens += count_tokens(part['text'], model)
+            elif part.get('type') == 'image_url':
+                image_url = part['image_url']
+                tokens += _image_tokens(image_url['url'], image_url.get('detail', 'auto'))
+
+    return tokens
+
+
+def request_kind(body: Dict[str, Any]) -> str:
+    """
+    지연 기준을 따로 잡을 요청 종류 ('text' 또는 'vision-low' / 'vision-high' 등 이미지 detail)
+
+    같은 모델이라도 텍스트, 저해상도, 고해상도 Vision 호출은 응답 시간이 크게 다릅니다.
+    """
+    for message in body.get('messages', []):
+        content = message.get('content')
+        if isinstance(content, str):
+            continue
+        for part in content or []:
+            if part.get('type') == 'image_url':
+                return f"vision-{part['image_url'].get('detail', 'auto')}"
+    return 'text'
+
+
+def _image_tokens(url: str, detail: str) -> int:
+    """
+    data URL 이미지의 Vision 토큰 수 (크기를 알 수 없으면 고해상도 최대치로 가정)
+
+    이미지 크기는 파일 헤더에 있으므로 앞부분만 디코딩합니다 (전체 사본을 만들지 않음).
+    공개 이미지 주소는 크기를 알 수 없어 최대치로 가정합니다.
+    """
+    if detail == 'low':
+        return estimate_image_tokens(1, 1, 'low')
+    try:
+        start = url.index(',') + 1 if url.startswith('data:') else None
+        if start is None:
+            raise ValueError("data URL이 아님")
+        head = base64.b64decode(url[start:start + IMAGE_HEADER_CHARS])
+        with Image.open(io.BytesIO(head)) as image:
+            width, height = image.size
+    except Exception:
+        width, height = 2048, 2048
+    return estimate_image_tokens(width, height, 'high')
+
+
+class TokenBucket:
+    """분당 capacity만큼 연속적으로 채워지는 토큰 버킷 (lock은 호출하는 쪽에서 보유)"""
+
+    def __init__(self, per_minute: float):
+        self.capacity = max(1.0, float(per_minute))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.capacity / 60)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """amount를 꺼낼 수 있을 때까지 남은 시간 (초)"""
+        self._refill(now)
+        # 버킷보다 큰 요청은 버킷이 가득 찼을 때 보냄
+        amount = min(amount, self.capacity)
+        return max(0.0, (amount - self.tokens) * 60 / self.capacity)
+
+    def take(self, amount: float):
+        self.tokens -= min(amount, self.capacity)
+
+    def sync(self, remaining: float, now: float):
+        """서버가 알려준 남은 양보다 많이 남았다고 생각하고 있으면 맞춤"""
+        self._refill(now)
+        self.tokens = min(self.tokens, remaining)
+
+
+class _ModelLimits:
+    def __init__(self, rpm: float, tpm: float, concurrency: AIMDController):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.concurrency = concurrency
+        self.blocked_until = 0.0
+
+
+class LLMScheduler:
+    """
+    chat.completions 호출 앞에 두는 공용 스케줄러
+
+    - 모델별 RPM / TPM 토큰 버킷으로 호출 시작을 조절
+    - 응답의 x-ratelimit-* 헤더로 버킷을 서버 상태에 맞춤
+    - 429를 받으면 Retry-After만큼 같은 모델의 모든 호출을 멈추고, 지터를 섞은 지수 백오프로 재시도
+    - 모델별 동시 호출 수는 AIMDController가 응답 지연과 429 / 5xx / 타임아웃에 맞춰 1~max_concurrency 사이에서 조절
+
+    여러 스레드에서 같은 인스턴스를 공유해도 안전합니다.
+    SDK 자체 재시도와 겹치지 않도록 OpenAI 클라이언트는 max_retries=0으로 만드는 것을 권장합니다.
+
+    Args:
+        rpm: 모델별 분당 요청 수
+        tpm: 모델별 분당 토큰 수
+        max_retries: 재시도 횟수
+        base_delay: 첫 재시도 대기 시간 (초)
+        max_delay: 재시도 대기 시간 상한 (초)
+        max_concurrency: 모델별 동시 호출 수 상한
+        adaptive: False이면 동시 호출 수를 max_concurrency로 고정
+    """
+
+    def __init__(
+        self,
+        rpm: float = 500,
+        tpm: float = 30000,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        max_concurrency: int = 5,
+        adaptive: bool = True
+    ):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_concurrency = max(1, max_concurrency)
+        self.adaptive = adaptive
+        self.waits = 0
+        self.retries = 0
+        self._lock = threading.Lock()
+        self._models: Dict[str, _ModelLimits] = {}
+
+    def _limits(self, model: str) -> _ModelLimits:
+        limits = self._models.get(model)
+        if limits is None:
+            minimum = 1 if self.adaptive else self.max_concurrency
+            # 설정한 동시 호출 수로 시작하고 429 / 지연 증가가 보일 때만 줄임
+            concurrency = AIMDController(
+                model, initial=self.max_concurrency, minimum=minimum, maximum=self.max_concurrency
+            )
+            limits = _ModelLimits(self.rpm, self.tpm, concurrency)
+            self._models[model] = limits
+        return limits
+
+    def controllers(self) -> Dict[str, AIMDController]:
+        """모델별 동시 호출 제어기 (실행 결과 출력용)"""
+        with self._lock:
+            return {model: limits.concurrency for model, limits in self._models.items()}
+
+    def _acquire(self, model: str, tokens: int):
+        """예산이 생길 때까지 대기한 뒤 요청 1개와 tokens만큼 차감"""
+        waited = False
+        while True:
+            with self._lock:
+                limits = self._limits(model)
+                now = time.monotonic()
+                wait = max(
+                    limits.blocked_until - now,
+                    limits.requests.wait_time(1, now),
+                    limits.tokens.wait_time(tokens, now),
+                )
+                if wait <= 0:
+                    limits.requests.take(1)
+                    limits.tokens.take(tokens)
+                    if waited:
+                        self.waits += 1
+                    return
+            waited = True
+            time.sleep(wait)
+
+    def _observe(self, model: str, headers):
+        """응답 헤더의 남은 요청/토큰 수로 버킷을 맞추고, 소진되었으면 초기화 시각까지 막음"""
+        if headers is None:
+            return
+        with self._lock:
+            limits = self._limits(model)
+            now = time.monotonic()
+            for bucket, kind in ((limits.requests, 'requests'), (limits.tokens, 'tokens')):
+                try:
+                    remaining = float(headers.get(f'x-ratelimit-remaining-{kind}'))
+                except (TypeError, ValueError):
+                    continue
+                bucket.sync(remaining, now)
+                reset = parse_reset_duration(headers.get(f'x-ratelimit-reset-{kind}'))
+                if remaining <= 0 and reset:
+                    limits.blocked_until = max(limits.blocked_until, now + reset)
+
+    def _backoff(self, model: str, attempt: int, retry_after: Optional[float]) -> float:
+        """재시도 대기 시간 (Retry-After가 있으면 그 이상, 지터 포함)"""
+        delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+        delay = delay / 2 + random.uniform(0, delay / 2)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+            with self._lock:
+                limits = self._limits(model)
+                limits.blocked_until = max(limits.blocked_until, time.monotonic() + retry_after)
+        return delay
+
+    def create(self, client, **body):
+        """
+        client.chat.completions.create(**body)를 예산 안에서 호출
+
+        재시도할 수 없는 오류나 max_retries를 넘긴 오류는 그대로 던집니다.
+        """
+        model = body.get('model', '')
+        tokens = estimate_request_tokens(body)
+        attempt = 0
+
+        while True:
+            self._acquire(model, tokens)
+            with self._lock:
+                controller = self._limits(model).concurrency
+
+            error = None
+            with controller.slot(request_kind(body)) as slot:
+                try:
+                    raw = client.chat.completions.with_raw_response.create(**body)
+                except RETRYABLE_ERRORS as e:
+                    slot.overload()
+                    error = e
+                except openai.APIError:
+                    slot.error()
+                    raise
+
+            if error is not None:
+                response = getattr(error, 'response', None)
+                headers = response.headers if response is not None else None
+                self._observe(model, headers)
+                # 크레딧 소진은 기다려도 풀리지 않음
+                if attempt >= self.max_retries or getattr(error, 'code', None) == 'insufficient_quota':
+                    raise error
+                delay = self._backoff(model, attempt, parse_retry_after(headers))
+                attempt += 1
+                with self._lock:
+                    self.retries += 1
+                print(f"  ⏳ {model} {type(error).__name__}, {delay:.1f}초 후 재시도 ({attempt}/{self.max_retries})")
+                time.sleep(delay)
+                continue
+
+            self._observe(model, raw.headers)
+            return raw.parse()
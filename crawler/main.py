@@ -5,200 +5,801 @@
 
 import os
 import json
-import base64
 import time
-import re
+import argparse
+import atexit
+import hashlib
+import asyncio
+import threading
+from collections import Counter
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
-from urllib.parse import urljoin
+from typing import Any, Callable, Container, Dict, List, Optional, Set, Tuple
 from dotenv import load_dotenv
 
 import requests
-from bs4 import BeautifulSoup
 from openai import OpenAI
 from supabase import create_client, Client
 
+import batch_api
+from batcher import MicroBatcher
+from context_builder import build_context
+from db_writer import BufferedWriter, write_with_split
+from http_cache import HTTPCache
+from image_preprocess import encode_data_url, fit_budget, image_tiles, preprocess_poster, read_image_stream
+from llm_cache import LLMCache
+from llm_scheduler import LLMScheduler
+from pipeline import Pipeline, Stage
+from pagination import build_page_url, crawl_pages
+from parsing import PARSER_VERSION, compute_content_hash, parse_detail_page, parse_list_page
+from rule_extractor import FIELDS, extract_fields, uncertain_fields
+from run_journal import RunJournal, RunState, load_last_run, new_run_id
+from throttle import HostLimiter
+
 # 환경 변수 로드
 load_dotenv()
 
-# API 클라이언트 초기화
-openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-supabase: Client = create_client(
-    os.getenv("SUPABASE_URL"),
-    os.getenv("SUPABASE_KEY")
-)
+# API 클라이언트, 캐시, 저널, 작업 풀은 main()에서 init_runtime()으로 만듭니다.
+# (CPU_WORKERS 프로세스는 spawn으로 시작하면서 이 파일을 다시 import하므로 모듈 최상위에서는 설정만 읽음)
+openai_client: Optional[OpenAI] = None
+supabase: Optional[Client] = None
 
 # 설정
 TARGET_URL = os.getenv("TARGET_URL", "https://web.kangnam.ac.kr/board/scholarship")
 BASE_DOMAIN = os.getenv("BASE_DOMAIN", "https://web.kangnam.ac.kr")
 MAX_ITEMS = int(os.getenv("MAX_ITEMS", "50"))
+MAX_PAGES = int(os.getenv("MAX_PAGES", "10"))
+PAGE_PARAM = os.getenv("PAGE_PARAM", "pageIndex")
+LIST_CONCURRENCY = int(os.getenv("LIST_CONCURRENCY", "4"))
 DELAY_SECONDS = int(os.getenv("DELAY_SECONDS", "3"))
 
+# 동시 실행 모드 (--async) 설정
+# ADAPTIVE_CONCURRENCY: 사이트/GPT 동시 요청 수를 응답 지연과 오류(타임아웃, 5xx, 429)에 맞춰 자동 조절 (AIMD)
+# 이때 HOST_CONCURRENCY / LLM_CONCURRENCY는 상한, HOST_DELAY_SECONDS는 최소 간격
+ADAPTIVE_CONCURRENCY = os.getenv("ADAPTIVE_CONCURRENCY", "true").lower() == "true"
+HOST_CONCURRENCY = int(os.getenv("HOST_CONCURRENCY", "4" if ADAPTIVE_CONCURRENCY else "2"))
+HOST_DELAY_SECONDS = float(os.getenv("HOST_DELAY_SECONDS", "0.5" if ADAPTIVE_CONCURRENCY else str(DELAY_SECONDS)))
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "5"))
+# HTML 파싱 / 이미지 전처리용 프로세스 수 (0이면 사용 안 함, 여러 게시판을 동시에 크롤링할 때 GIL 경합 해소)
+CPU_WORKERS = int(os.getenv("CPU_WORKERS", "0"))
+# HTML 파싱 방식 (strainer: lxml로 필요한 노드만, lxml / html.parser: 전체 트리, 비교: python bench_parsing.py)
+HTML_PARSER = os.getenv("HTML_PARSER", "strainer")
+
+# 동시 실행 파이프라인 (--async): 단계별 작업자 수와 단계 사이 대기열 길이
+DETAIL_WORKERS = int(os.getenv("DETAIL_WORKERS", str(HOST_CONCURRENCY)))
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", "2"))
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "8"))
+PIPELINE_REPORT_SECONDS = float(os.getenv("PIPELINE_REPORT_SECONDS", "10"))
+
+# DB 저장: 분석된 공고를 모아 DB_BATCH_SIZE개마다 또는 DB_FLUSH_SECONDS초마다 한 번에 Upsert
+DB_BATCH_SIZE = int(os.getenv("DB_BATCH_SIZE", "50"))
+DB_FLUSH_SECONDS = float(os.getenv("DB_FLUSH_SECONDS", "5"))
+
+# 증분 크롤링: true면 이미 저장된 공고도 다시 분석
+FORCE_REFRESH = os.getenv("FORCE_REFRESH", "false").lower() == "true"
+
+# 포스터 전처리 (흑백 변환, 여백 제거, Vision 해상도로 축소)
+IMAGE_PREPROCESS = os.getenv("IMAGE_PREPROCESS", "true").lower() == "true"
+IMAGE_FORMAT = os.getenv("IMAGE_FORMAT", "JPEG")
+IMAGE_QUALITY = int(os.getenv("IMAGE_QUALITY", "80"))
+# 포스터 다운로드 상한 (OpenAI 이미지 입력 한도 20MB), 넘으면 받다가 중단
+IMAGE_MAX_BYTES = int(os.getenv("IMAGE_MAX_BYTES", str(20 * 1024 * 1024)))
+# true면 포스터를 base64로 넣지 않고 공개 이미지 URL을 그대로 Vision에 전달 (실패하면 data URL로 재시도)
+VISION_IMAGE_URL = os.getenv("VISION_IMAGE_URL", "false").lower() == "true"
+# 여러 장으로 나눠 올린 포스터: 공고 하나에서 받을 최대 장수 / 전체 바이트 / 고해상도 타일 수 상한
+VISION_MAX_IMAGES = int(os.getenv("VISION_MAX_IMAGES", "6"))
+IMAGE_TOTAL_BYTES = int(os.getenv("IMAGE_TOTAL_BYTES", str(30 * 1024 * 1024)))
+VISION_TILE_BUDGET = int(os.getenv("VISION_TILE_BUDGET", "24"))
+IMAGE_SLICE_WORKERS = int(os.getenv("IMAGE_SLICE_WORKERS", "4"))
+
+# GPT 모델 / 프롬프트 버전 (프롬프트를 바꾸면 버전을 올려 캐시를 무효화)
+VISION_MODEL = os.getenv("VISION_MODEL", "gpt-4o")
+# 텍스트는 저렴한 모델로 먼저 분석하고, 검증에 실패하면 상위 모델로 재분석
+TEXT_MODEL = os.getenv("TEXT_MODEL", "gpt-4o-mini")
+TEXT_FALLBACK_MODEL = os.getenv("TEXT_FALLBACK_MODEL", "gpt-4o")
+TEXT_MIN_CONFIDENCE = float(os.getenv("TEXT_MIN_CONFIDENCE", "0.7"))
+IMAGE_PROMPT_VERSION = "image-v3"
+TEXT_PROMPT_VERSION = "text-v4"
+# 텍스트 공고 본문은 마감일/자격 조건 관련 문장 위주로 이 토큰 수 안에 압축
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "1200"))
+
+# 2단계 Vision 분석: 저해상도(detail=low)로 먼저 분석하고 마감일 등이 비면 고해상도로 재분석
+TIERED_VISION = os.getenv("TIERED_VISION", "true").lower() == "true"
+
+# 규칙 기반 추출: 모든 필드를 확실히 읽으면 텍스트 공고는 GPT를 호출하지 않음
+RULE_EXTRACTOR = os.getenv("RULE_EXTRACTOR", "true").lower() == "true"
+
+# 텍스트 공고 배치 분석 (--async): 최대 TEXT_BATCH_SIZE개를 GPT 한 번으로 분석 (1이면 사용 안 함)
+TEXT_BATCH_SIZE = int(os.getenv("TEXT_BATCH_SIZE", "8"))
+TEXT_BATCH_WAIT_SECONDS = float(os.getenv("TEXT_BATCH_WAIT_SECONDS", "5"))
+# analyze 단계 작업자 수 (텍스트 배치가 찰 수 있도록 기본값은 배치 크기 이상)
+ANALYZE_WORKERS = int(os.getenv("ANALYZE_WORKERS", str(max(LLM_CONCURRENCY, TEXT_BATCH_SIZE))))
+
+# Batch API 모드 (--batch): 요청을 모아 제출하고 결과를 기다림 (토큰 단가 50%)
+BATCH_STATE_PATH = os.getenv("BATCH_STATE_PATH", ".cache/batch_state.json")
+BATCH_INPUT_PATH = os.getenv("BATCH_INPUT_PATH", ".cache/batch_input.jsonl")
+BATCH_POLL_SECONDS = float(os.getenv("BATCH_POLL_SECONDS", "60"))
+# 이 시간 안에 끝나지 않으면 상태 파일을 남기고 종료 (다음 --batch 실행에서 이어서 처리)
+BATCH_TIMEOUT_MINUTES = float(os.getenv("BATCH_TIMEOUT_MINUTES", "300"))
+
+# 실행 저널 (--resume): 공고별 단계 진행 기록 (빈 값이면 사용 안 함)
+JOURNAL_PATH = os.getenv("JOURNAL_PATH", ".cache/run_journal.jsonl")
+# 이 시간보다 오래된 미완료 실행은 이어서 처리하지 않고 버림 (같은 공고에서 계속 중단되는 경우 대비)
+RESUME_MAX_HOURS = float(os.getenv("RESUME_MAX_HOURS", "48"))
+
+# OpenAI 속도 제한 (모델별 분당 요청 수 / 토큰 수, 계정 등급에 맞게 설정)
+LLM_RPM = float(os.getenv("LLM_RPM", "500"))
+LLM_TPM = float(os.getenv("LLM_TPM", "30000"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "5"))
+
+llm_scheduler = LLMScheduler(
+    LLM_RPM, LLM_TPM,
+    max_retries=LLM_MAX_RETRIES,
+    max_concurrency=LLM_CONCURRENCY,
+    adaptive=ADAPTIVE_CONCURRENCY
+)
+
+# 텍스트 분석 프롬프트의 필드 설명과 응답 예시
+TEXT_FIELD_PROMPTS = {
+    'min_gpa': ('min_gpa: 최소 학점 (없으면 0.0)', 2.5),
+    'max_income': ('max_income: 소득분위 상한선 (0~10, 없으면 99)', 5),
+    'residence': ('residence: 거주지 (없으면 "전국")', "서울"),
+    'due_date': ('due_date: 마감일 (YYYY-MM-DD, 없으면 null)', "2026-02-15"),
+}
+
+# GPT 분석 결과 캐시 (빈 값이면 사용 안 함)
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", ".cache/llm_cache.sqlite3")
+LLM_CACHE_TTL_DAYS = float(os.getenv("LLM_CACHE_TTL_DAYS", "30"))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000"))
+
+llm_cache: Optional[LLMCache] = None
+
+# 목록 / 상세 페이지 조건부 GET 캐시 (빈 값이면 사용 안 함)
+HTTP_CACHE_PATH = os.getenv("HTTP_CACHE_PATH", ".cache/http_cache.sqlite3")
+
+http_cache: Optional[HTTPCache] = None
+
+# CPU 작업(HTML 파싱, 이미지 전처리)을 실행할 프로세스 풀 (CPU_WORKERS가 0이면 호출한 스레드에서 바로 실행)
+cpu_pool: Optional[ProcessPoolExecutor] = None
+
+
+def run_cpu(func, *args):
+    """
+    CPU 작업을 프로세스 풀에서 실행하고 결과를 기다림 (풀이 없으면 바로 실행)
+    
+    func는 모듈 최상위 함수여야 하며, 인자와 결과는 프로세스 사이에 복사되므로
+    원본 바이트를 넘기고 작은 결과만 돌려받는 함수를 사용합니다 (parsing, image_preprocess).
+    """
+    if cpu_pool is None:
+        return func(*args)
+    return cpu_pool.submit(func, *args).result()
+
+
+# 여러 장으로 나뉜 포스터를 동시에 받는 스레드 풀 (호스트별 동시 요청 수는 host_limiter가 제한)
+slice_pool: Optional[ThreadPoolExecutor] = None
+
 
 class ScholarshipCrawler:
     """장학금 크롤러"""
     
-    def __init__(self):
+    def __init__(self, host_limiter: Optional[HostLimiter] = None):
         self.session = requests.Session()
+        self.host_limiter = host_limiter
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml',
             'Accept-Language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
         })
+    
+    def _get(self, url: str, **kwargs) -> requests.Response:
+        """
+        호스트 제한기를 거쳐 GET 요청 (제한기가 없으면 바로 요청)
         
-    def crawl_list(self, url: str) -> List[Dict]:
+        5xx / 429 응답과 타임아웃은 과부하로, 그 밖의 4xx는 일반 오류로 제한기에 알립니다.
         """
-        게시판 목록에서 제목, 링크 추출
+        if self.host_limiter is None:
+            return self.session.get(url, **kwargs)
+        with self.host_limiter.slot(url) as slot:
+            response = self.session.get(url, **kwargs)
+            self._report_status(slot, response)
+            return response
+    
+    def _get_stream(self, url: str, read: Callable[[requests.Response], Any], kind: str = 'image', **kwargs) -> Any:
+        """
+        스트리밍 GET 요청 후 read(response)로 본문까지 읽기
+        
+        호스트 제한기 슬롯을 본문을 다 읽을 때까지 잡고 있으므로 동시 전송 수가 제한됩니다.
+        지연은 파일 크기에 좌우되지 않도록 응답 헤더까지의 시간(첫 바이트)으로 재고,
+        기준 지연은 페이지와 따로 kind('image')별로 잡습니다.
+        전송 중 타임아웃 / 연결 끊김은 과부하로,
+        read가 거부한 응답(ValueError: 크기 초과, 이미지 아님 등)은 일반 오류로 알립니다.
+        """
+        if self.host_limiter is None:
+            with self.session.get(url, stream=True, **kwargs) as response:
+                return read(response)
+        with self.host_limiter.slot(url, kind) as slot:
+            with self.session.get(url, stream=True, **kwargs) as response:
+                slot.first_byte()
+                self._report_status(slot, response)
+                try:
+                    return read(response)
+                except ValueError:
+                    if slot.outcome == 'ok':
+                        slot.error()
+                    raise
+    
+    @staticmethod
+    def _report_status(slot, response: requests.Response):
+        """5xx / 429 응답은 과부하로, 그 밖의 4xx는 일반 오류로 제한기 슬롯에 기록"""
+        if response.status_code >= 500 or response.status_code == 429:
+            slot.overload()
+        elif response.status_code >= 400:
+            slot.error()
+    
+    def _get_page(self, url: str, timeout: float = 10) -> Tuple[requests.Response, Optional[Any]]:
+        """
+        페이지 요청 (HTTP 캐시가 있으면 If-None-Match / If-Modified-Since를 붙인 조건부 요청)
+        
+        Returns:
+            (응답, 저장된 파싱 결과) - 304이거나 본문이 지난번과 같으면 파싱 결과가 채워지고,
+            바뀐 페이지면 None (파싱한 뒤 http_cache.store로 저장)
+        """
+        if http_cache is None:
+            response = self._get(url, timeout=timeout)
+            response.raise_for_status()
+            return response, None
+        
+        response = self._get(url, timeout=timeout, headers=http_cache.conditional_headers(url))
+        cached = http_cache.unchanged(url, response)
+        if cached is None:
+            response.raise_for_status()
+        return response, cached
+        
+    def crawl_list(self, url: str, known_links: Optional[Container[str]] = None) -> List[Dict]:
+        """
+        게시판 목록을 여러 페이지(MAX_PAGES)에 걸쳐 크롤링
+        
+        known_links가 주어지면 모든 공고가 이미 저장된 첫 페이지에서 멈춥니다.
+        호스트 제한기가 있을 때만 여러 페이지를 동시에 요청하고,
+        없으면 DELAY_SECONDS 간격으로 한 페이지씩 요청합니다.
+        """
+        known_filter = None
+        if known_links is not None:
+            known_filter = lambda links: {link for link in links if link in known_links}
+        
+        return crawl_pages(
+            lambda page: self.crawl_list_page(build_page_url(url, page, PAGE_PARAM)),
+            max_pages=MAX_PAGES,
+            concurrency=LIST_CONCURRENCY if self.host_limiter else 1,
+            known_filter=known_filter,
+            max_items=MAX_ITEMS,
+            delay=0 if self.host_limiter else DELAY_SECONDS
+        )
+    
+    def crawl_list_page(self, url: str) -> List[Dict]:
+        """
+        게시판 목록 한 페이지에서 제목, 링크 추출
         """
         try:
             print(f"📡 게시판 크롤링: {url}")
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            response.encoding = 'utf-8'
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            items = []
-            
-            # 링크 찾기 (사이트 구조에 맞게 수정)
-            links = soup.find_all('a', class_='detailLink')
-            
-            if not links:
-                # 대체 방법: href 속성이 있는 모든 a 태그
-                links = soup.select('div.board-list a, table.board-list a, ul.board-list a')
+            response, parsed = self._get_page(url)
             
-            print(f"✅ {len(links)}개 공고 발견")
-            
-            for link in links[:MAX_ITEMS]:
-                title = link.get_text(strip=True)
-                href = link.get('href', '')
-                
-                if not href or href == '#':
-                    # data-params에서 URL 추출 시도
-                    data_params = link.get('data-params', '')
-                    if data_params:
-                        detail_url = self._extract_url_from_params(data_params)
-                    else:
-                        continue
-                else:
-                    detail_url = self._build_full_url(href)
-                
-                if detail_url and title:
-                    items.append({
-                        'title': title,
-                        'link': detail_url
-                    })
+            if parsed is not None:
+                print(f"♻️  목록 변경 없음, 저장된 파싱 결과 사용")
+            else:
+                parsed = run_cpu(parse_list_page, response.content, BASE_DOMAIN, HTML_PARSER)
+                if http_cache is not None:
+                    http_cache.store(url, response, parsed)
+            print(f"✅ {parsed['found']}개 공고 발견")
             
-            return items
+            return parsed['items']
             
         except Exception as e:
             print(f"❌ 목록 크롤링 실패: {e}")
             return []
     
-    def crawl_detail(self, url: str) -> Tuple[Optional[str], Optional[str], bool]:
+    def crawl_detail(self, url: str, known_hash: Optional[str] = None) -> Optional[Dict]:
+        """
+        상세 페이지에서 이미지 또는 텍스트를 추출하고 내용 해시를 계산
+        
+        이미지 공고는 해시 계산을 위해 이미지까지 내려받으며,
+        받은 바이트는 분석 단계에서 그대로 재사용합니다.
+        페이지가 바뀌지 않아(HTTP 캐시) 지난번 해시가 known_hash와 같으면 포스터만 조건부 요청으로
+        확인하고, 같은 주소의 포스터가 교체되지 않았으면 이미지를 받지 않습니다.
+        
+        Returns:
+            {'image_url', 'image_urls', 'images', 'image_data', 'content_type',
+             'text_content', 'is_image', 'content_hash'} 또는 None
+            (images는 받은 이미지 [{'url', 'data', 'content_type', 'validators'}, ...], image_data는 그 첫 장)
+        """
+        detail = self.fetch_detail(url)
+        if detail and detail['is_image']:
+            self.refresh_images(detail, known_hash)
+        return detail
+    
+    def refresh_images(self, detail: Dict, known_hash: Optional[str]) -> Dict:
         """
-        상세 페이지에서 이미지 URL 또는 텍스트 추출
+        이미지 공고의 이미지를 필요할 때만 내려받음 (순차 / 동시 실행 모드 공용)
+        
+        페이지가 바뀌지 않아 지난번 해시가 known_hash와 같고 포스터도 그대로면 받지 않고,
+        그 밖에는 load_detail_image로 받아 content_hash를 다시 계산합니다.
+        """
+        if known_hash and detail['content_hash'] == known_hash and self.posters_unchanged(detail):
+            return detail
+        return self.load_detail_image(detail)
+    
+    def fetch_detail(self, url: str) -> Optional[Dict]:
+        """
+        상세 페이지만 받아 파싱 (이미지는 내려받지 않음)
+        
+        텍스트 공고는 content_hash까지 계산하고,
+        이미지 공고는 image_urls와 해시용 본문(page_text)만 채워 둡니다 (load_detail_image에서 완성).
+        
+        HTML 파싱은 run_cpu로 실행하므로 CPU_WORKERS를 설정하면 다른 프로세스에서 처리됩니다.
+        페이지가 바뀌지 않았으면(304 또는 같은 본문) 파싱 없이 지난번 결과를 돌려주며,
+        이미지 공고는 그때 계산한 content_hash(이미지 포함)도 함께 돌려줍니다.
         
         Returns:
-            (image_url, text_content, is_image)
+            crawl_detail과 같은 형식의 dict 또는 None
         """
         try:
             print(f"  📄 상세 페이지: {url}")
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            response.encoding = 'utf-8'
+            response, cached = self._get_page(url)
             
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # 본문 영역 찾기
-            content_div = soup.find('div', class_='tbl_view')
-            
-            if not content_div:
-                # 대체 클래스명들 시도
-                for class_name in ['view-content', 'board-content', 'content', 'article-body']:
-                    content_div = soup.find('div', class_=class_name)
-                    if content_div:
-                        break
+            if cached is not None:
+                print(f"  ♻️  상세 페이지 변경 없음, 저장된 파싱 결과 사용")
+                detail = cached
+            else:
+                detail = run_cpu(parse_detail_page, response.content, BASE_DOMAIN, HTML_PARSER)
+                if http_cache is not None:
+                    http_cache.store(url, response, detail)
             
-            if not content_div:
+            if not detail:
                 print(f"  ⚠️  본문 영역을 찾을 수 없습니다")
-                return None, None, False
-            
-            # 1. 이미지 찾기 (우선)
-            img_tag = content_div.find('img')
-            
-            if img_tag:
-                img_src = img_tag.get('src', '')
-                if img_src:
-                    image_url = self._build_full_url(img_src)
-                    print(f"  🖼️  이미지 발견")
-                    return image_url, None, True
-            
-            # 2. 텍스트 추출 (폴백)
-            text_content = content_div.get_text(strip=True, separator='\n')
-            if text_content:
-                print(f"  📝 텍스트 추출 ({len(text_content)}자)")
-                return None, text_content, False
-            
-            return None, None, False
+                return None
+            if detail['is_image']:
+                print(f"  🖼️  이미지 발견")
+                detail['page_url'] = url
+                return detail
+            if detail['text_content']:
+                print(f"  📝 텍스트 추출 ({len(detail['text_content'])}자)")
+                return detail
+            return None
             
         except Exception as e:
             print(f"  ❌ 상세 페이지 크롤링 실패: {e}")
-            return None, None, False
+            return None
+    
+    def load_detail_image(self, detail: Dict) -> Dict:
+        """
+        이미지 공고의 이미지를 내려받아 images / image_data / content_type / content_hash를 채움
+        
+        포스터가 여러 장으로 나뉘어 있으면 VISION_MAX_IMAGES장까지 골라 공유 세션으로 동시에 받고,
+        IMAGE_TOTAL_BYTES / VISION_TILE_BUDGET을 넘는 만큼 중간 조각을 뺍니다 (fit_budget).
+        한 장도 받지 못하면 그대로 둡니다.
+        """
+        urls = detail.get('image_urls') or [detail['image_url']]
+        urls = [urls[index] for index in fit_budget([1] * len(urls), VISION_MAX_IMAGES)]
+        images = self.download_images(urls)
+        if not images:
+            return detail
+        
+        images = [images[index] for index in fit_budget([len(image['data']) for image in images], IMAGE_TOTAL_BYTES)]
+        images = [images[index] for index in fit_budget([image_tiles(image['data']) for image in images], VISION_TILE_BUDGET)]
+        total = len(detail.get('image_urls') or urls)
+        if len(images) < total:
+            print(f"  ✂️  이미지 {total}장 중 {len(images)}장 분석 (개수 / 용량 / 타일 예산)")
+        
+        detail['images'] = images
+        detail['image_data'], detail['content_type'] = images[0]['data'], images[0]['content_type']
+        detail['content_hash'] = self.compute_content_hash(detail['page_text'], *[image['data'] for image in images])
+        # 포스터별 검증자와 내용 해시 (페이지가 그대로여도 같은 주소의 포스터가 바뀌었는지 확인)
+        detail['image_validators'] = {
+            image['url']: {**image['validators'], 'hash': hashlib.sha256(image['data']).hexdigest()}
+            for image in images
+        }
+        # 페이지가 그대로면 다음 실행에서 이미지를 받지 않고 이 해시로 변경 여부를 판단
+        if http_cache is not None and detail.get('page_url'):
+            cached = {key: value for key, value in detail.items() if key != 'page_url'}
+            http_cache.update_parsed(detail['page_url'], {**cached, 'images': [], 'image_data': None})
+        return detail
+    
+    def posters_unchanged(self, detail: Dict) -> bool:
+        """
+        지난번에 분석한 포스터가 모두 그대로인지 확인 (페이지가 바뀌지 않았을 때)
+        
+        저장된 ETag / Last-Modified로 조건부 요청을 보내 304면 그대로로 보고,
+        서버가 검증자를 주지 않아 본문이 오면 받은 이미지의 해시를 지난번 해시와 비교합니다.
+        검증자가 저장되지 않은 (이 기능 전의) 캐시 항목이면 False를 돌려 이미지를 다시 받게 합니다.
+        """
+        saved = detail.get('image_validators')
+        if not saved:
+            return False
+        
+        def unchanged(url: str) -> bool:
+            def read(response: requests.Response) -> bool:
+                if response.status_code == 304:
+                    return True
+                image_data, _, _ = self._read_image(response)
+                return hashlib.sha256(image_data).hexdigest() == saved[url].get('hash')
+            try:
+                return self._get_stream(url, read, timeout=15, headers=HTTPCache.validator_headers(saved[url]))
+            except Exception as e:
+                print(f"  ⚠️  포스터 확인 실패, 다시 받음: {e}")
+                return False
+        
+        urls = list(saved)
+        results = list(slice_pool.map(unchanged, urls)) if len(urls) > 1 else [unchanged(urls[0])]
+        if all(results):
+            print(f"  🖼️  포스터 {len(urls)}장 변경 없음")
+            return True
+        print(f"  🔄 포스터 {len(urls) - sum(results)}장이 바뀌어 다시 받습니다")
+        return False
     
-    def download_image_as_base64(self, image_url: str) -> Optional[str]:
+    def download_images(self, urls: List[str]) -> List[Dict]:
         """
-        이미지를 Base64로 인코딩
+        이미지 여러 장을 순서대로 다운로드 (여러 장이면 공유 세션으로 동시에)
+        
+        Returns:
+            받은 이미지만 [{'url', 'data', 'content_type', 'validators'}, ...]
+        """
+        if len(urls) > 1:
+            print(f"  🧩 이미지 {len(urls)}장 동시 다운로드")
+            downloads = list(slice_pool.map(self.download_image, urls))
+        else:
+            downloads = [self.download_image(url) for url in urls]
+        
+        return [
+            {'url': url, 'data': downloaded[0], 'content_type': downloaded[1], 'validators': downloaded[2]}
+            for url, downloaded in zip(urls, downloads) if downloaded
+        ]
+    
+    def download_image(self, image_url: str) -> Optional[Tuple[bytes, str, Dict]]:
+        """
+        이미지 다운로드 (스트리밍)
+        
+        청크 단위로 받아 하나의 버퍼에 모으고, IMAGE_MAX_BYTES를 넘거나
+        이미지가 아닌 응답(오류 페이지 등)이면 끝까지 받지 않고 중단합니다.
+        Content-Type은 헤더 대신 파일 시그니처로 판별합니다.
+        본문을 다 받을 때까지 호스트 제한기 슬롯을 잡고 있습니다.
+        
+        Returns:
+            (이미지 바이트, Content-Type, 검증자 {'etag', 'last_modified'}) 또는 None
         """
         try:
             print(f"  📥 이미지 다운로드 중...")
-            response = self.session.get(image_url, timeout=15)
-            response.raise_for_status()
-            
-            image_data = base64.b64encode(response.content).decode('utf-8')
-            content_type = response.headers.get('Content-Type', 'image/jpeg')
-            
+            image_data, content_type, validators = self._get_stream(image_url, self._read_image, timeout=15)
             print(f"  ✅ 다운로드 완료 ({len(image_data)//1024}KB)")
-            
-            return f"data:{content_type};base64,{image_data}"
+            return image_data, content_type, validators
             
         except Exception as e:
             print(f"  ❌ 이미지 다운로드 실패: {e}")
             return None
     
-    def _build_full_url(self, path: str) -> str:
-        """상대 경로를 절대 경로로 변환"""
-        if path.startswith('http'):
-            return path
-        return urljoin(BASE_DOMAIN, path)
+    @staticmethod
+    def _read_image(response: requests.Response) -> Tuple[bytearray, str, Dict]:
+        """스트리밍 응답의 헤더를 확인한 뒤 본문을 IMAGE_MAX_BYTES까지 읽기 (검증자 포함)"""
+        response.raise_for_status()
+        
+        declared_type = response.headers.get('Content-Type', '')
+        if declared_type.startswith(('text/', 'application/json')):
+            raise ValueError(f"이미지가 아닌 응답 ({declared_type})")
+        declared_size = int(response.headers.get('Content-Length') or 0)
+        if declared_size > IMAGE_MAX_BYTES:
+            raise ValueError(f"이미지가 너무 큽니다 ({declared_size // 1024}KB)")
+        
+        image_data, content_type = read_image_stream(response.iter_content(65536), IMAGE_MAX_BYTES)
+        return image_data, content_type, HTTPCache.validators(response)
     
-    def _extract_url_from_params(self, data_params: str) -> Optional[str]:
-        """data-params에서 URL 추출"""
-        try:
-            params = json.loads(data_params.replace('&quot;', '"'))
-            if 'encMenuBoardSeq' in params:
-                return f"{BASE_DOMAIN}/board/view?seq={params['encMenuBoardSeq']}"
-            return None
-        except:
-            return None
+    @staticmethod
+    def prepare_image_base64(image_data: bytes, content_type: str, detail: str = "high") -> str:
+        """
+        Vision 분석용 data URL 생성
+        
+        IMAGE_PREPROCESS가 켜져 있으면 detail에 맞는 해상도로 Pillow 압축하고,
+        실패하면 원본을 그대로 보냅니다.
+        """
+        if IMAGE_PREPROCESS:
+            try:
+                processed, processed_type = run_cpu(
+                    preprocess_poster, image_data, detail, IMAGE_FORMAT, IMAGE_QUALITY
+                )
+                print(f"  🗜️  이미지 전처리: {len(image_data)//1024}KB → {len(processed)//1024}KB")
+                return ScholarshipCrawler.encode_image_base64(processed, processed_type)
+            except Exception as e:
+                print(f"  ⚠️  이미지 전처리 실패, 원본 사용: {e}")
+        
+        return ScholarshipCrawler.encode_image_base64(image_data, content_type)
+    
+    @staticmethod
+    def prepare_images(images: List[Dict], detail: str = "high") -> List[str]:
+        """받은 이미지 조각마다 Vision 분석용 data URL 생성 (순서 유지)"""
+        return [
+            ScholarshipCrawler.prepare_image_base64(image['data'], image['content_type'], detail)
+            for image in images
+        ]
+    
+    @staticmethod
+    def encode_image_base64(image_data: bytes, content_type: str) -> str:
+        """이미지 바이트를 data URL로 인코딩 (문자열 하나에 청크 단위로)"""
+        return encode_data_url(image_data, content_type)
+    
+    @staticmethod
+    def compute_content_hash(text: str, *images: Optional[bytes]) -> str:
+        """공고 내용의 안정적인 해시 (SHA-256, 공백 정규화)"""
+        return compute_content_hash(text, *images)
 
 
 class GPTAnalyzer:
     """GPT-4o Vision/Text 분석기"""
     
+    # 분석 단계별 집계 (예: vision_low, vision_high)
+    stats = Counter()
+    _stats_lock = threading.Lock()
+    
+    @staticmethod
+    def _count(key: str):
+        with GPTAnalyzer._stats_lock:
+            GPTAnalyzer.stats[key] += 1
+    
     @staticmethod
-    def analyze_image(title: str, image_base64: str) -> Optional[Dict]:
+    def _normalize(result: Dict) -> Dict:
         """
-        GPT-4o Vision으로 이미지 분석
+        GPT 응답 검증 및 정제
+        
+        값이 없거나 형식이 잘못된 필드는 기본값으로 채우고 필드명을 'defaulted'에 기록합니다.
+        값은 있었지만 형식이 잘못된 필드는 'invalid'에도 기록합니다.
         """
-        try:
-            print(f"  🤖 GPT-4o Vision 분석 중...")
+        analyzed = {}
+        defaulted = []
+        invalid = []
+        
+        for field, cast, default in (('min_gpa', float, 0.0), ('max_income', int, 99), ('residence', str, '전국')):
+            value = result.get(field)
+            try:
+                analyzed[field] = cast(value) if value not in (None, '') else None
+            except (TypeError, ValueError):
+                analyzed[field] = None
+                invalid.append(field)
+            if analyzed[field] is None:
+                analyzed[field] = default
+                defaulted.append(field)
+        
+        # 날짜 유효성 검사
+        analyzed['due_date'] = result.get('due_date')
+        if analyzed['due_date']:
+            try:
+                datetime.strptime(analyzed['due_date'], '%Y-%m-%d')
+            except (TypeError, ValueError):
+                analyzed['due_date'] = None
+                invalid.append('due_date')
+        if not analyzed['due_date']:
+            defaulted.append('due_date')
+        
+        analyzed['defaulted'] = defaulted
+        analyzed['invalid'] = invalid
+        return analyzed
+    
+    @staticmethod
+    def _validate(analyzed: Dict) -> List[str]:
+        """
+        텍스트 분석 결과의 문제점 목록 (비어 있으면 통과)
+        
+        형식 오류, 범위를 벗어난 학점/소득분위, 낮은 자체 확신도를 검사합니다.
+        """
+        problems = [f"{field} 형식 오류" for field in analyzed['invalid']]
+        
+        if not 0.0 <= analyzed['min_gpa'] <= 4.5:
+            problems.append(f"min_gpa 범위 오류 ({analyzed['min_gpa']})")
+        if not (0 <= analyzed['max_income'] <= 10 or analyzed['max_income'] == 99):
+            problems.append(f"max_income 범위 오류 ({analyzed['max_income']})")
+        if analyzed.get('confidence', 1.0) < TEXT_MIN_CONFIDENCE:
+            problems.append(f"낮은 확신도 ({analyzed['confidence']})")
+        
+        return problems
+    
+    @staticmethod
+    def analyze_poster(
+        title: str,
+        images: List[Dict],
+        prepared: Optional[List[str]] = None
+    ) -> Optional[Dict]:
+        """
+        포스터 이미지 분석 (TIERED_VISION이면 저해상도 → 필요할 때만 고해상도)
+        
+        저해상도 결과에서 마감일이 없거나 GPT가 읽지 못해 null로 답한 필드가 있으면
+        고해상도로 다시 분석합니다. 프롬프트가 "조건 없음"(0.0 / 99 / "전국")과
+        "읽을 수 없음"(null)을 구분해 답하게 하므로, 조건이 없는 필드 때문에 재분석하지는 않습니다.
+        큰 글씨로 적힌 마감일은 대부분 저해상도에서 읽힙니다.
+        포스터가 여러 장이면 한 번의 Vision 요청에 순서대로 모두 넣습니다.
+        
+        images: load_detail_image가 채운 [{'url', 'data', 'content_type'}, ...]
+        prepared: 미리 만들어 둔 첫 분석용 data URL 목록 (TIERED_VISION이면 저해상도, 아니면 고해상도)
+        VISION_IMAGE_URL이 켜져 있으면 base64 대신 공개 주소를 Vision에 전달하고,
+        OpenAI가 이미지를 가져오지 못해 실패하면 data URL로 다시 분석합니다.
+        """
+        urls = [image['url'] for image in images]
+        if VISION_IMAGE_URL and all(url.startswith(('http://', 'https://')) for url in urls):
+            # 같은 주소의 포스터가 교체될 수 있으므로 캐시 키는 주소가 아닌 받은 이미지 내용으로
+            digest = hashlib.sha256()
+            for image in images:
+                digest.update(image['data'])
+            result = GPTAnalyzer._analyze_tiers(title, lambda detail: urls, digest.hexdigest())
+            if result:
+                return result
+            print(f"  ⚠️  이미지 URL로 분석하지 못해 data URL로 재시도")
+        
+        first_detail = "low" if TIERED_VISION else "high"
+        
+        def image_for(detail: str) -> List[str]:
+            if prepared and detail == first_detail:
+                return prepared
+            return ScholarshipCrawler.prepare_images(images, detail)
+        
+        return GPTAnalyzer._analyze_tiers(title, image_for)
+    
+    @staticmethod
+    def _analyze_tiers(
+        title: str,
+        image_for: Callable[[str], List[str]],
+        image_hash: Optional[str] = None
+    ) -> Optional[Dict]:
+        """image_for(detail)로 얻은 이미지 목록(data URL 또는 공개 주소)을 해상도 단계별로 분석"""
+        low_result = None
+        
+        if TIERED_VISION:
+            low_result = GPTAnalyzer.analyze_image(title, image_for("low"), detail="low", image_hash=image_hash)
             
-            response = openai_client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": """당신은 장학금 공고 이미지를 분석하는 AI입니다.
+            if low_result and not low_result['defaulted']:
+                GPTAnalyzer._count('vision_low')
+                return low_result
+            
+            missing = ', '.join(low_result['defaulted']) if low_result else '분석 실패'
+            print(f"  🔍 저해상도 결과 부족 ({missing}), 고해상도로 재분석")
+        
+        high_result = GPTAnalyzer.analyze_image(title, image_for("high"), detail="high", image_hash=image_hash)
+        
+        if high_result:
+            GPTAnalyzer._count('vision_high')
+            return high_result
+        return low_result
+    
+    @staticmethod
+    def _cached(model: str, prompt_version: str, content_hash: str, compute) -> Optional[Dict]:
+        """캐시가 켜져 있으면 (모델, 프롬프트 버전, 내용 해시) 기준으로 결과 재사용"""
+        if llm_cache is None:
+            return compute()
+        
+        key = LLMCache.make_key(model, prompt_version, content_hash)
+        computed = []
+        
+        def compute_once():
+            computed.append(True)
+            return compute()
+        
+        result = llm_cache.get_or_compute(key, compute_once)
+        if not computed and result:
+            print(f"  💾 캐시된 분석 결과 사용: {result}")
+        return result
+    
+    @staticmethod
+    def analyze_image(
+        title: str,
+        images: List[str],
+        detail: str = "high",
+        image_hash: Optional[str] = None
+    ) -> Optional[Dict]:
+        """
+        GPT-4o Vision으로 이미지 분석 (캐시 우선)
+        
+        images는 data URL 또는 공개 이미지 주소 목록이며, 주소를 넘길 때는
+        캐시 키로 쓸 이미지 내용 해시(image_hash)를 함께 넘깁니다.
+        """
+        content_hash = LLMCache.hash_content(title, image_hash) if image_hash else LLMCache.hash_content(title, *images)
+        return GPTAnalyzer._cached(
+            VISION_MODEL, f"{IMAGE_PROMPT_VERSION}-{detail}",
+            content_hash,
+            lambda: GPTAnalyzer._analyze_image(title, images, detail)
+        )
+    
+    @staticmethod
+    def analyze_text(title: str, content: str, fields: Tuple[str, ...] = FIELDS) -> Optional[Dict]:
+        """
+        텍스트 분석 (폴백, 캐시 우선)
+        
+        TEXT_MODEL(gpt-4o-mini)로 먼저 분석하고, 결과가 검증(_validate)을 통과하지 못하면
+        TEXT_FALLBACK_MODEL(gpt-4o)로 다시 분석합니다.
+        fields를 주면 해당 필드만 요청합니다.
+        본문은 build_context로 CONTEXT_TOKEN_BUDGET 안에 압축한 뒤 보냅니다.
+        """
+        content = build_context(content, CONTEXT_TOKEN_BUDGET, TEXT_MODEL)
+        content_hash = LLMCache.hash_content(title, content)
+        prompt_version = f"{TEXT_PROMPT_VERSION}:{','.join(fields)}"
+        result = GPTAnalyzer._cached(
+            TEXT_MODEL, prompt_version, content_hash,
+            lambda: GPTAnalyzer._analyze_text(title, content, TEXT_MODEL, fields)
+        )
+        
+        problems = GPTAnalyzer._validate(result) if result else ['분석 실패']
+        if not problems or TEXT_FALLBACK_MODEL == TEXT_MODEL:
+            if result:
+                GPTAnalyzer._count('text_primary')
+            return result
+        
+        print(f"  🔍 {TEXT_MODEL} 결과 검증 실패 ({', '.join(problems)}), {TEXT_FALLBACK_MODEL}로 재분석")
+        fallback = GPTAnalyzer._cached(
+            TEXT_FALLBACK_MODEL, prompt_version, content_hash,
+            lambda: GPTAnalyzer._analyze_text(title, content, TEXT_FALLBACK_MODEL, fields)
+        )
+        
+        if fallback:
+            GPTAnalyzer._count('text_fallback')
+            return fallback
+        return result
+    
+    @staticmethod
+    def analyze_text_batch(requests_: List[Tuple[str, str, str]]) -> List[Optional[Dict]]:
+        """
+        여러 텍스트 공고를 GPT 한 번으로 분석 (캐시 우선)
+        
+        시스템 프롬프트와 왕복 지연을 공고 여러 개가 나눠 씁니다.
+        응답에서 빠졌거나 검증(_validate)에 실패한 공고는 analyze_text로 하나씩 다시 분석합니다.
+        
+        Args:
+            requests_: [(링크, 제목, 본문), ...]
+        
+        Returns:
+            requests_와 같은 순서의 분석 결과 리스트 (실패는 None)
+        """
+        prompt_version = f"{TEXT_PROMPT_VERSION}:{','.join(FIELDS)}"
+        entries = []
+        for link, title, content in requests_:
+            context = build_context(content, CONTEXT_TOKEN_BUDGET, TEXT_MODEL)
+            key = LLMCache.make_key(TEXT_MODEL, prompt_version, LLMCache.hash_content(title, context))
+            entries.append({'link': link, 'title': title, 'content': context, 'key': key})
+        
+        results: Dict[str, Optional[Dict]] = {}
+        cached = llm_cache.get_many([entry['key'] for entry in entries]) if llm_cache is not None else {}
+        pending = []
+        for entry in entries:
+            if entry['key'] in cached:
+                results[entry['link']] = cached[entry['key']]
+            else:
+                pending.append(entry)
+        
+        if len(pending) > 1:
+            batch_results = GPTAnalyzer._analyze_text_batch(pending, TEXT_MODEL)
+            retry = []
+            computed = {}
+            for entry in pending:
+                analyzed = batch_results.get(entry['link'])
+                problems = GPTAnalyzer._validate(analyzed) if analyzed else ['응답 누락']
+                if problems:
+                    print(f"  🔍 배치 결과 검증 실패 ({entry['title'][:30]}: {', '.join(problems)}), 개별 분석")
+                    retry.append(entry)
+                    continue
+                GPTAnalyzer._count('text_batch')
+                computed[entry['key']] = analyzed
+                results[entry['link']] = analyzed
+            if llm_cache is not None:
+                llm_cache.put_many(computed)
+            pending = retry
+        
+        for entry in pending:
+            results[entry['link']] = GPTAnalyzer.analyze_text(entry['title'], entry['content'])
+        
+        return [results.get(link) for link, _, _ in requests_]
+    
+    @staticmethod
+    def _image_request(title: str, images: List[str], detail: str = "high") -> Dict:
+        """Vision 분석 요청 본문 (chat.completions.create 인자, Batch API 요청에도 사용)"""
+        return {
+            "model": VISION_MODEL,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": """당신은 장학금 공고 이미지를 분석하는 AI입니다.
 이미지에서 다음 정보를 추출하여 JSON으로 반환하세요:
 
 1. min_gpa: 최소 학점 요구사항 (예: 3.0, 없으면 0.0)
@@ -206,6 +807,9 @@ class GPTAnalyzer:
 3. residence: 거주지 제한 (예: "서울", "경기도", 없으면 "전국")
 4. due_date: 마감일 (YYYY-MM-DD, 없으면 null)
 
+조건이 공고에 없으면 위의 기본값(0.0 / 99 / "전국")을 넣고,
+조건이 있지만 글씨가 작거나 흐려서 읽을 수 없으면 추측하지 말고 null을 넣으세요.
+
 응답 형식:
 {
     "min_gpa": 3.0,
@@ -215,45 +819,50 @@ class GPTAnalyzer:
 }
 
 주의: 반드시 유효한 JSON만 반환하세요."""
-                    },
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": f"제목: {title}\n\n위 장학금 공고 이미지를 분석해주세요."
-                            },
+                },
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": f"제목: {title}\n\n위 장학금 공고 이미지를 분석해주세요."
+                            + (f" 이미지 {len(images)}장은 한 포스터를 위에서부터 순서대로 나눈 것입니다."
+                               if len(images) > 1 else "")
+                        },
+                        *[
                             {
                                 "type": "image_url",
                                 "image_url": {
-                                    "url": image_base64,
-                                    "detail": "high"
+                                    "url": image,
+                                    "detail": detail
                                 }
                             }
+                            for image in images
                         ]
-                    }
-                ],
-                response_format={"type": "json_object"},
-                temperature=0.1,
-                max_tokens=500
+                    ]
+                }
+            ],
+            "response_format": {"type": "json_object"},
+            "temperature": 0.1,
+            "max_tokens": 500
+        }
+    
+    @staticmethod
+    def _analyze_image(title: str, images: List[str], detail: str = "high") -> Optional[Dict]:
+        """
+        GPT-4o Vision으로 이미지 분석
+        """
+        try:
+            print(f"  🤖 GPT-4o Vision 분석 중... (detail: {detail}, 이미지 {len(images)}장)")
+            
+            response = llm_scheduler.create(
+                openai_client, **GPTAnalyzer._image_request(title, images, detail)
             )
             
             result = json.loads(response.choices[0].message.content)
             
             # 데이터 검증
-            analyzed = {
-                'min_gpa': float(result.get('min_gpa', 0.0)),
-                'max_income': int(result.get('max_income', 99)),
-                'residence': result.get('residence', '전국'),
-                'due_date': result.get('due_date')
-            }
-            
-            # 날짜 유효성 검사
-            if analyzed['due_date']:
-                try:
-                    datetime.strptime(analyzed['due_date'], '%Y-%m-%d')
-                except ValueError:
-                    analyzed['due_date'] = None
+            analyzed = GPTAnalyzer._normalize(result)
             
             print(f"  ✅ 분석 완료: {analyzed}")
             return analyzed
@@ -263,58 +872,70 @@ class GPTAnalyzer:
             return None
     
     @staticmethod
-    def analyze_text(title: str, content: str) -> Optional[Dict]:
+    def _text_system_prompt(fields: Tuple[str, ...]) -> str:
+        """요청할 필드만 담은 텍스트 분석 시스템 프롬프트"""
+        lines = [f"{i}. {TEXT_FIELD_PROMPTS[field][0]}" for i, field in enumerate(fields, 1)]
+        lines.append(f"{len(fields) + 1}. confidence: 추출 결과 전체에 대한 확신도 (0.0~1.0, 공고에 명시된 값이면 높게)")
+        
+        example = {field: TEXT_FIELD_PROMPTS[field][1] for field in fields}
+        example['confidence'] = 0.9
+        
+        return (
+            "당신은 장학금 공고문을 분석하는 AI입니다.\n"
+            "텍스트에서 다음 정보를 추출하여 JSON으로 반환하세요:\n\n"
+            + "\n".join(lines)
+            + "\n\n응답 형식:\n"
+            + json.dumps(example, ensure_ascii=False, indent=4)
+        )
+    
+    @staticmethod
+    def _text_request(title: str, content: str, model: str, fields: Tuple[str, ...] = FIELDS) -> Dict:
+        """텍스트 분석 요청 본문 (chat.completions.create 인자, Batch API 요청에도 사용)"""
+        return {
+            "model": model,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": GPTAnalyzer._text_system_prompt(fields)
+                },
+                {
+                    "role": "user",
+                    "content": f"제목: {title}\n\n내용:\n{content}\n\n위 공고를 분석해주세요."
+                }
+            ],
+            "response_format": {"type": "json_object"},
+            "temperature": 0.1,
+            "max_tokens": 500
+        }
+    
+    @staticmethod
+    def _parse_text_result(result: Dict) -> Dict:
+        """텍스트 분석 응답(JSON)을 정제하고 자체 확신도를 붙임"""
+        analyzed = GPTAnalyzer._normalize(result)
+        try:
+            analyzed['confidence'] = float(result.get('confidence', 0.0))
+        except (TypeError, ValueError):
+            analyzed['confidence'] = 0.0
+        return analyzed
+    
+    @staticmethod
+    def _analyze_text(title: str, content: str, model: str, fields: Tuple[str, ...] = FIELDS) -> Optional[Dict]:
         """
-        GPT-4o로 텍스트 분석 (폴백)
+        GPT로 텍스트 분석 (폴백)
+        
+        fields에 없는 필드는 요청하지 않으며 결과에는 기본값이 들어갑니다.
         """
         try:
-            print(f"  🤖 GPT-4o 텍스트 분석 중...")
+            print(f"  🤖 {model} 텍스트 분석 중...")
             
-            response = openai_client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": """당신은 장학금 공고문을 분석하는 AI입니다.
-텍스트에서 다음 정보를 추출하여 JSON으로 반환하세요:
-
-1. min_gpa: 최소 학점 (없으면 0.0)
-2. max_income: 소득분위 상한선 (0~10, 없으면 99)
-3. residence: 거주지 (없으면 "전국")
-4. due_date: 마감일 (YYYY-MM-DD, 없으면 null)
-
-응답 형식:
-{
-    "min_gpa": 2.5,
-    "max_income": 5,
-    "residence": "서울",
-    "due_date": "2026-02-15"
-}"""
-                    },
-                    {
-                        "role": "user",
-                        "content": f"제목: {title}\n\n내용:\n{content[:3000]}\n\n위 공고를 분석해주세요."
-                    }
-                ],
-                response_format={"type": "json_object"},
-                temperature=0.1,
-                max_tokens=500
+            response = llm_scheduler.create(
+                openai_client, **GPTAnalyzer._text_request(title, content, model, fields)
             )
             
             result = json.loads(response.choices[0].message.content)
             
-            analyzed = {
-                'min_gpa': float(result.get('min_gpa', 0.0)),
-                'max_income': int(result.get('max_income', 99)),
-                'residence': result.get('residence', '전국'),
-                'due_date': result.get('due_date')
-            }
-            
-            if analyzed['due_date']:
-                try:
-                    datetime.strptime(analyzed['due_date'], '%Y-%m-%d')
-                except ValueError:
-                    analyzed['due_date'] = None
+            # 데이터 검증
+            analyzed = GPTAnalyzer._parse_text_result(result)
             
             print(f"  ✅ 분석 완료: {analyzed}")
             return analyzed
@@ -322,157 +943,755 @@ class GPTAnalyzer:
         except Exception as e:
             print(f"  ❌ 텍스트 분석 실패: {e}")
             return None
+    
+    @staticmethod
+    def _analyze_text_batch(entries: List[Dict], model: str) -> Dict[str, Dict]:
+        """
+        GPT로 텍스트 공고 여러 개를 한 번에 분석
+        
+        응답은 {"results": [{"link": ..., "min_gpa": ..., ...}, ...]} 형식이며
+        링크별로 _normalize한 결과를 돌려줍니다. 형식이 잘못된 항목은 빠집니다.
+        """
+        system_prompt = (
+            GPTAnalyzer._text_system_prompt(FIELDS)
+            + "\n\n여러 공고가 한 번에 주어집니다. 공고마다 위 항목을 따로 추출하고, "
+            "각 결과에 공고의 link를 그대로 넣어 다음 형식으로 반환하세요:\n"
+            '{"results": [{"link": "공고 link", ...위 항목...}, ...]}'
+        )
+        notices = "\n\n".join(
+            f"[공고 {i}]\nlink: {entry['link']}\n제목: {entry['title']}\n내용:\n{entry['content']}"
+            for i, entry in enumerate(entries, 1)
+        )
+        
+        try:
+            print(f"  🤖 {model} 배치 텍스트 분석 중... ({len(entries)}개)")
+            
+            response = llm_scheduler.create(
+                openai_client,
+                model=model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": f"{notices}\n\n위 공고 {len(entries)}개를 각각 분석해주세요."}
+                ],
+                response_format={"type": "json_object"},
+                temperature=0.1,
+                max_tokens=150 * len(entries) + 100
+            )
+            
+            items = json.loads(response.choices[0].message.content).get('results')
+        except Exception as e:
+            print(f"  ❌ 배치 텍스트 분석 실패: {e}")
+            return {}
+        
+        analyzed_by_link = {}
+        for result in items if isinstance(items, list) else []:
+            if not isinstance(result, dict) or not isinstance(result.get('link'), str):
+                continue
+            analyzed_by_link[result['link'].strip()] = GPTAnalyzer._parse_text_result(result)
+        
+        print(f"  ✅ 배치 분석 완료: {len(analyzed_by_link)}/{len(entries)}개")
+        return analyzed_by_link
 
 
 class DatabaseManager:
     """Supabase 데이터베이스 관리"""
     
     @staticmethod
-    def upsert_scholarship(data: Dict) -> bool:
+    def upsert_rows(rows: List[Dict]):
         """
-        장학금 정보를 Upsert (링크 기준으로 중복 시 업데이트)
+        장학금 여러 개를 한 번의 요청으로 Upsert (링크 기준으로 중복 시 업데이트)
+        
+        저장된 행을 돌려받지 않으므로(returning=minimal) 응답이 가볍습니다. 실패하면 예외를 던집니다.
         """
-        try:
-            print(f"  💾 DB 저장 중...")
+        supabase.table('scholarships').upsert(rows, on_conflict='link', returning='minimal').execute()
+    
+    @staticmethod
+    def upsert_scholarships(rows: List[Dict], chunk_size: int = DB_BATCH_SIZE) -> Set[str]:
+        """
+        여러 장학금을 chunk_size개씩 Upsert (실패한 묶음은 나눠서 재시도)
+        
+        Returns:
+            저장에 성공한 링크 집합
+        """
+        saved = set()
+        
+        for start in range(0, len(rows), chunk_size):
+            chunk_saved, _ = write_with_split(DatabaseManager.upsert_rows, rows[start:start + chunk_size])
+            saved.update(row['link'] for row in chunk_saved)
+        
+        print(f"💾 DB 일괄 저장: {len(saved)}/{len(rows)}개")
+        return saved
+    
+    @staticmethod
+    def fetch_known_hashes(page_size: int = 1000) -> Dict[str, Optional[str]]:
+        """
+        이미 저장된 공고의 링크와 내용 해시를 한 번에 조회
+        
+        link, content_hash 컬럼만 가져오며, PostgREST 최대 행 수를 넘으면 range로 이어서 조회합니다.
+        
+        Returns:
+            {link: content_hash} (해시 도입 전에 저장된 행은 None)
+        """
+        known = {}
+        start = 0
+        
+        while True:
+            result = supabase.table('scholarships') \
+                .select('link, content_hash') \
+                .range(start, start + page_size - 1) \
+                .execute()
             
-            # Upsert: link가 같으면 업데이트
-            result = supabase.table('scholarships').upsert(
-                data,
-                on_conflict='link'
-            ).execute()
+            rows = result.data or []
+            known.update((row['link'], row.get('content_hash')) for row in rows)
             
-            if result.data:
-                print(f"  ✅ 저장 완료! ID: {result.data[0]['id']}")
-                return True
-            else:
-                print(f"  ❌ 저장 실패")
-                return False
-                
-        except Exception as e:
-            print(f"  ❌ DB 오류: {e}")
-            return False
+            if len(rows) < page_size:
+                return known
+            start += page_size
     
     @staticmethod
     def get_statistics() -> Dict:
-        """통계 조회"""
+        """
+        통계 조회 (행을 내려받지 않고 개수만)
+        
+        scholarship_stats() SQL 함수로 한 번에 계산하고, 함수가 없으면 count만 받는 요청 두 번으로 대신합니다.
+        두 방법 모두 같은 기준일을 쓰고, 마감일이 없는 행은 만료로 집계합니다 (total = active + expired).
+        """
+        today = datetime.now().strftime('%Y-%m-%d')
         try:
-            total = supabase.table('scholarships').select('*', count='exact').execute().count
-            
-            today = datetime.now().strftime('%Y-%m-%d')
-            active = supabase.table('scholarships').select('*', count='exact').gte('due_date', today).execute().count
-            
-            return {
-                'total': total,
-                'active': active,
-                'expired': total - active
-            }
+            stats = DatabaseManager.rpc_statistics(today)
+            if stats:
+                return stats
+        except Exception:
+            pass
+        
+        try:
+            return DatabaseManager.count_statistics(today)
         except:
             return {'total': 0, 'active': 0, 'expired': 0}
+    
+    @staticmethod
+    def rpc_statistics(today: str) -> Optional[Dict]:
+        """scholarship_stats() SQL 함수로 통계 계산 (supabase_schema.sql)"""
+        rows = supabase.rpc('scholarship_stats', {'today': today}).execute().data
+        if not rows:
+            return None
+        return {key: int(rows[0][key]) for key in ('total', 'active', 'expired')}
+    
+    @staticmethod
+    def count_statistics(today: str) -> Dict:
+        """count만 받는 요청 두 번으로 통계 계산 (limit(0): 행 없이 Content-Range 헤더의 개수만)"""
+        total = supabase.table('scholarships').select('id', count='exact').limit(0).execute().count
+        active = supabase.table('scholarships').select('id', count='exact').gte('due_date', today).limit(0).execute().count
+        
+        return {
+            'total': total,
+            'active': active,
+            'expired': total - active
+        }
 
 
-def main():
-    """메인 실행 함수"""
-    print("=" * 80)
-    print("🎓 장학금 메인 크롤러 (GPT-4o Vision)")
-    print("=" * 80)
+# 실행 저널 (실행 ID는 main에서 지정, 그 전의 기록은 무시)
+journal: Optional[RunJournal] = None
+
+
+def record_stage(link: Optional[str], stage: str, data: Optional[Dict] = None):
+    """저널에 공고의 단계 완료 기록 (저널을 쓰지 않으면 무시)"""
+    if journal is not None:
+        journal.record(link, stage, data)
+
+
+def record_detail(link: str, detail: Dict):
+    """상세 페이지 / 이미지 다운로드 완료 기록"""
+    record_stage(link, 'fetched', {'content_hash': detail['content_hash'], 'is_image': detail['is_image']})
+    if detail['image_data']:
+        record_stage(link, 'image_downloaded', {
+            'bytes': sum(len(image['data']) for image in detail['images']),
+            'images': len(detail['images']),
+            'content_type': detail['content_type']
+        })
+
+
+def record_stored(rows: List[Dict]):
+    """DB 저장이 끝난 행 기록 (db_writer 백그라운드 스레드에서 호출)"""
+    for row in rows:
+        record_stage(row['link'], 'stored')
+
+
+# 분석 결과 저장 버퍼 (백그라운드 스레드에서 일괄 Upsert, 종료 시 남은 행 저장)
+db_writer: Optional[BufferedWriter] = None
+
+
+def build_scholarship_data(item: Dict, analyzed: Dict, is_image: bool, content_hash: Optional[str]) -> Dict:
+    """분석 결과를 DB 저장용 데이터로 변환 (마감일 없으면 3개월 후)"""
+    if not analyzed['due_date']:
+        default_due = datetime.now() + timedelta(days=90)
+        analyzed['due_date'] = default_due.strftime('%Y-%m-%d')
+        print(f"  ⚠️  마감일 없음, 기본값: {analyzed['due_date']}")
     
-    # 초기 통계
-    print("\n📊 현재 DB 상태:")
-    stats = DatabaseManager.get_statistics()
-    print(f"  전체: {stats['total']}개 | 활성: {stats['active']}개 | 만료: {stats['expired']}개\n")
+    return {
+        'title': item['title'],
+        'link': item['link'],
+        'due_date': analyzed['due_date'],
+        'min_gpa': analyzed['min_gpa'],
+        'max_income': analyzed['max_income'],
+        'residence': analyzed['residence'],
+        'is_image_content': is_image,
+        'content_hash': content_hash
+    }
+
+
+def extract_text_rules(title: str, content: str) -> Tuple[Dict, List[str]]:
+    """
+    규칙 기반 추출
     
-    # 크롤러 시작
-    crawler = ScholarshipCrawler()
+    Returns:
+        (규칙으로 읽은 값, GPT에 물어볼 필드 목록)
+    """
+    if not RULE_EXTRACTOR:
+        return {}, list(FIELDS)
     
-    # 1. 목록 크롤링
-    items = crawler.crawl_list(TARGET_URL)
+    extracted = extract_fields(f"{title}\n{content}")
+    ruled = {field: value for field, (value, _) in extracted.items()}
+    missing = uncertain_fields(extracted)
     
-    if not items:
-        print("❌ 크롤링할 공고가 없습니다.")
-        return
+    if not missing:
+        print(f"  📏 규칙 기반 추출 완료, GPT 생략: {ruled}")
+        GPTAnalyzer._count('text_rule')
+    else:
+        print(f"  📏 규칙 기반 추출 {len(FIELDS) - len(missing)}/{len(FIELDS)}개, GPT에 요청: {', '.join(missing)}")
+    return ruled, missing
+
+
+def analyze_text_notice(title: str, content: str) -> Optional[Dict]:
+    """
+    텍스트 공고 분석 (규칙 기반 추출 → 확신도가 낮은 필드만 GPT에 요청)
     
-    print(f"\n🔄 총 {len(items)}개 공고를 처리합니다.\n")
+    모든 필드를 규칙으로 확실히 읽으면 GPT를 호출하지 않습니다.
+    """
+    ruled, missing = extract_text_rules(title, content)
+    if not missing:
+        return {**ruled, 'defaulted': [] if ruled['due_date'] else ['due_date'], 'invalid': []}
+    
+    analyzed = GPTAnalyzer.analyze_text(title, content, tuple(missing))
+    return merge_rule_fields(analyzed, ruled, missing)
+
+
+async def analyze_text_notice_batched(item: Dict, content: str, batcher: MicroBatcher) -> Optional[Dict]:
+    """
+    analyze_text_notice의 배치 버전 (--async)
     
-    # 통계
-    success_count = 0
-    fail_count = 0
-    image_count = 0
-    text_count = 0
+    규칙으로 다 읽지 못한 공고만 batcher에 넣어 다른 공고와 함께 분석합니다.
+    배치는 모든 필드를 요청하고, 규칙으로 확실히 읽은 필드는 규칙 값을 사용합니다.
+    """
+    ruled, missing = extract_text_rules(item['title'], content)
+    if not missing:
+        return {**ruled, 'defaulted': [] if ruled['due_date'] else ['due_date'], 'invalid': []}
+    
+    analyzed = await batcher.submit((item['link'], item['title'], content))
+    return merge_rule_fields(analyzed, ruled, missing)
+
+
+def merge_rule_fields(analyzed: Optional[Dict], ruled: Dict, missing: List[str]) -> Optional[Dict]:
+    """GPT 결과에 규칙으로 확실히 읽은 필드를 덮어씀"""
+    if not analyzed:
+        return None
+    
+    analyzed = dict(analyzed)
+    for field in FIELDS:
+        if field not in missing:
+            analyzed[field] = ruled[field]
+    analyzed['defaulted'] = [field for field in analyzed['defaulted'] if field in missing]
+    return analyzed
+
+
+def process_item(crawler: ScholarshipCrawler, item: Dict) -> Optional[str]:
+    """
+    공고 하나를 순차 처리 (상세 → 이미지 → 분석 → 저장)
+    
+    item에 'known_hash'가 있으면 저장된 해시와 비교하여 내용이 같을 때 분석을 건너뜁니다.
+    item에 'resumed_row'가 있으면 (이전 실행에서 분석까지 끝난 공고) 저장만 다시 합니다.
+    
+    Returns:
+        성공 시 분석 방법 ('image' 또는 'text'), 변경 없음 'unchanged', 실패 시 None
+    """
+    if item.get('resumed_row'):
+        print("  ♻️  이전 실행의 분석 결과로 저장")
+        db_writer.add(item['resumed_row'])
+        return item['resumed_method']
+    
+    # 상세 페이지 크롤링 (+ 이미지 다운로드, 해시 계산)
+    detail = crawler.crawl_detail(item['link'], item.get('known_hash'))
+    
+    if not detail:
+        print("  ⚠️  본문을 가져올 수 없습니다.")
+        return None
+    
+    record_detail(item['link'], detail)
+    
+    if is_unchanged(item, detail):
+        print("  ⏭️  내용 변경 없음, 분석 건너뜀")
+        record_stage(item['link'], 'stored', {'unchanged': True})
+        return 'unchanged'
+    
+    analyzed = None
+    method = None
+    is_image = detail['is_image']
+    
+    # Vision 분석 (이미지가 있을 때)
+    if is_image and detail['image_data']:
+        analyzed = GPTAnalyzer.analyze_poster(item['title'], detail['images'])
+        method = 'image'
+    
+    # 텍스트 분석 (폴백)
+    if not analyzed and detail['text_content']:
+        analyzed = analyze_text_notice(item['title'], detail['text_content'])
+        method = 'text'
+        is_image = False
+    
+    # 분석 실패
+    if not analyzed:
+        print("  ⚠️  분석 실패")
+        return None
+    
+    # DB 저장 (버퍼에 넣고 바로 다음 공고로, 실패는 flush_writer에서 집계)
+    store_analyzed(item, build_scholarship_data(item, analyzed, is_image, detail['content_hash']), method)
+    
+    return method
+
+
+def store_analyzed(item: Dict, row: Dict, method: str):
+    """분석 결과를 저널에 남긴 뒤 저장 버퍼에 추가 (중단되어도 --resume에서 다시 분석하지 않음)"""
+    record_stage(item['link'], 'analyzed', {'row': row, 'method': method})
+    db_writer.add(row)
+
+
+def is_unchanged(item: Dict, detail: Dict) -> bool:
+    """저장된 해시와 방금 계산한 해시가 같은지 (해시가 없으면 변경된 것으로 간주)"""
+    known_hash = item.get('known_hash')
+    return bool(known_hash) and known_hash == detail['content_hash']
+
+
+def tally(counts: Counter, result: Optional[str]):
+    """process_item 결과를 집계"""
+    if result == 'unchanged':
+        counts['unchanged'] += 1
+    elif result:
+        counts['success'] += 1
+        counts[result] += 1
+    else:
+        counts['fail'] += 1
+
+
+def flush_writer(counts: Counter):
+    """버퍼에 남은 행을 모두 저장하고, 저장에 실패한 공고는 실패로 다시 집계"""
+    db_writer.close()
+    for row in db_writer.failed:
+        counts['success'] -= 1
+        counts['fail'] += 1
+        counts['image' if row['is_image_content'] else 'text'] -= 1
+    print(f"💾 DB 저장: {len(db_writer.saved)}개 ({db_writer.flushes}회 요청), 실패 {len(db_writer.failed)}개")
+
+
+def run_sequential(crawler: ScholarshipCrawler, items: List[Dict]) -> Counter:
+    """공고를 하나씩 처리 (요청마다 DELAY_SECONDS 대기)"""
+    counts = Counter()
     
-    # 2. 각 공고 처리
     for idx, item in enumerate(items, 1):
         print(f"\n[{idx}/{len(items)}] {item['title'][:50]}...")
         print("-" * 80)
         
-        # 상세 페이지 크롤링
-        image_url, text_content, is_image = crawler.crawl_detail(item['link'])
+        tally(counts, process_item(crawler, item))
         
-        if not image_url and not text_content:
-            print("  ⚠️  본문을 가져올 수 없습니다.")
-            fail_count += 1
-            time.sleep(DELAY_SECONDS)
-            continue
+        # 딜레이
+        time.sleep(DELAY_SECONDS)
+    
+    return counts
+
+
+async def run_async(crawler: ScholarshipCrawler, items: List[Dict]) -> Counter:
+    """
+    공고를 단계별 파이프라인으로 동시에 처리
+    
+    detail (상세 페이지) → image (이미지 다운로드 + 전처리) → analyze (GPT) → store (DB 버퍼)
+    
+    단계마다 작업자 수가 따로 있고 단계 사이 대기열은 PIPELINE_QUEUE_SIZE로 제한되므로,
+    GPT가 밀리면 이미지 다운로드도 멈춰 base64 포스터가 메모리에 쌓이지 않습니다.
+    사이트 요청은 crawler의 HostLimiter가 호스트별로 제한하고,
+    OpenAI 호출은 llm 스레드 풀 크기만큼만 동시에 실행됩니다.
+    TEXT_BATCH_SIZE가 2 이상이면 텍스트 공고를 최대 TEXT_BATCH_SIZE개씩 묶어 분석합니다.
+    """
+    loop = asyncio.get_running_loop()
+    executors = {
+        'http': ThreadPoolExecutor(max_workers=HOST_CONCURRENCY * 2, thread_name_prefix='http'),
+        'image': ThreadPoolExecutor(max_workers=IMAGE_WORKERS, thread_name_prefix='image'),
+        'llm': ThreadPoolExecutor(max_workers=LLM_CONCURRENCY, thread_name_prefix='llm'),
+    }
+    counts = Counter()
+    
+    def run(executor: str, func, *args):
+        return loop.run_in_executor(executors[executor], func, *args)
+    
+    batcher = None
+    if TEXT_BATCH_SIZE > 1:
+        batcher = MicroBatcher(
+            lambda batch: run('llm', GPTAnalyzer.analyze_text_batch, batch),
+            max_size=TEXT_BATCH_SIZE,
+            max_wait=TEXT_BATCH_WAIT_SECONDS
+        )
+    
+    def check_changed(job: Dict) -> Optional[Dict]:
+        """해시를 계산한 뒤 저널에 기록하고, 내용이 그대로면 여기서 끝냄"""
+        item, detail = job['item'], job['detail']
+        record_detail(item['link'], detail)
+        if is_unchanged(item, detail):
+            print(f"  ⏭️  {job['label']} 내용 변경 없음, 분석 건너뜀")
+            record_stage(item['link'], 'stored', {'unchanged': True})
+            tally(counts, 'unchanged')
+            return None
+        return job
+    
+    async def fetch(job: Dict) -> Optional[Dict]:
+        item = job['item']
+        print(f"\n{job['label']} {item['title'][:50]}...")
         
+        # 이전 실행에서 분석까지 끝난 공고는 저장 단계로 바로 넘김
+        if item.get('resumed_row'):
+            print(f"  ♻️  {job['label']} 이전 실행의 분석 결과로 저장")
+            job.update(row=item['resumed_row'], method=item['resumed_method'])
+            return job
+        
+        detail = await run('http', crawler.fetch_detail, item['link'])
+        if not detail:
+            print(f"  ⚠️  {job['label']} 본문을 가져올 수 없습니다.")
+            tally(counts, None)
+            return None
+        
+        job['detail'] = detail
+        return job if detail['is_image'] else check_changed(job)
+    
+    async def load_image(job: Dict) -> Optional[Dict]:
+        detail = job.get('detail')
+        if job.get('row') or not detail['is_image']:
+            return job
+        
+        # 페이지와 포스터가 그대로여서 지난번 해시로 변경 없음이 확인되면 이미지를 받지 않음
+        await run('image', crawler.refresh_images, detail, job['item'].get('known_hash'))
+        if not check_changed(job):
+            return None
+        
+        # 첫 Vision 요청에 쓸 이미지를 미리 만들어 둠 (Pillow 작업을 LLM 작업자 밖에서)
+        # VISION_IMAGE_URL이면 주소를 넘기므로 URL 분석이 실패할 때만 만듦
+        if detail['image_data'] and not VISION_IMAGE_URL:
+            job['prepared'] = await run(
+                'image', ScholarshipCrawler.prepare_images,
+                detail['images'], "low" if TIERED_VISION else "high"
+            )
+        return job
+    
+    async def analyze(job: Dict) -> Optional[Dict]:
+        if job.get('row'):
+            return job
+        
+        item, detail = job['item'], job['detail']
         analyzed = None
+        method = None
+        is_image = detail['is_image']
         
-        # Vision 분석 (이미지가 있을 때)
-        if is_image and image_url:
-            image_base64 = crawler.download_image_as_base64(image_url)
-            
-            if image_base64:
-                analyzed = GPTAnalyzer.analyze_image(item['title'], image_base64)
-                
-                if analyzed:
-                    image_count += 1
-        
-        # 텍스트 분석 (폴백)
-        if not analyzed and text_content:
-            analyzed = GPTAnalyzer.analyze_text(item['title'], text_content)
-            
-            if analyzed:
-                text_count += 1
-                is_image = False
+        if is_image and detail['image_data']:
+            analyzed = await run(
+                'llm', GPTAnalyzer.analyze_poster,
+                item['title'], detail['images'], job.pop('prepared', None)
+            )
+            method = 'image'
+        
+        if not analyzed and detail['text_content']:
+            if batcher is not None:
+                analyzed = await analyze_text_notice_batched(item, detail['text_content'], batcher)
+            else:
+                analyzed = await run('llm', analyze_text_notice, item['title'], detail['text_content'])
+            method = 'text'
+            is_image = False
         
-        # 분석 실패
         if not analyzed:
-            print("  ⚠️  분석 실패")
-            fail_count += 1
-            time.sleep(DELAY_SECONDS)
+            print(f"  ⚠️  {job['label']} 분석 실패")
+            tally(counts, None)
+            return None
+        
+        # 분석이 끝나면 이미지는 더 필요 없으므로 다음 대기열에 싣지 않음
+        job.update(
+            row=build_scholarship_data(item, analyzed, is_image, detail['content_hash']),
+            method=method,
+            detail=None
+        )
+        return job
+    
+    async def store(job: Dict) -> None:
+        item = job['item']
+        # DB 저장은 db_writer 버퍼에 넣고 바로 끝남 (실패는 flush_writer에서 집계)
+        if item.get('resumed_row'):
+            db_writer.add(job['row'])
+        else:
+            store_analyzed(item, job['row'], job['method'])
+        tally(counts, job['method'])
+    
+    def on_error(stage: str, job: Dict, error: Exception):
+        print(f"❌ {job['label']} {stage} 단계 오류: {error}")
+        tally(counts, None)
+    
+    pipeline = Pipeline([
+        Stage('detail', fetch, DETAIL_WORKERS, PIPELINE_QUEUE_SIZE),
+        Stage('image', load_image, IMAGE_WORKERS, PIPELINE_QUEUE_SIZE),
+        Stage('analyze', analyze, ANALYZE_WORKERS, PIPELINE_QUEUE_SIZE),
+        Stage('store', store, 1, PIPELINE_QUEUE_SIZE),
+    ], on_error=on_error, report_interval=PIPELINE_REPORT_SECONDS)
+    
+    jobs = (
+        {'item': item, 'label': f"[{idx}/{len(items)}]"}
+        for idx, item in enumerate(items, 1)
+    )
+    
+    try:
+        await pipeline.run(jobs)
+    finally:
+        if batcher is not None:
+            await batcher.close()
+        for executor in executors.values():
+            executor.shutdown(wait=True)
+    
+    print("\n📈 파이프라인 단계별 처리량:")
+    for line in pipeline.report():
+        print(f"  {line}")
+    
+    return counts
+
+
+def prepare_batch(crawler: ScholarshipCrawler, items: List[Dict]) -> Tuple[List[Dict], Dict[str, Dict], Counter]:
+    """
+    Batch API 1단계: 상세 페이지를 모두 크롤링하고 GPT 요청을 모음
+    
+    규칙 기반 추출만으로 끝나는 텍스트 공고는 요청 없이 바로 결과를 만듭니다.
+    포스터는 한 번에 끝내기 위해 고해상도(detail=high)로만 요청합니다.
+    
+    Returns:
+        (Batch 요청 리스트, custom_id별 공고 정보, 집계)
+    """
+    requests_ = []
+    entries = {}
+    counts = Counter()
+    
+    for idx, item in enumerate(items, 1):
+        print(f"\n[{idx}/{len(items)}] {item['title'][:50]}...")
+        
+        detail = crawler.crawl_detail(item['link'], item.get('known_hash'))
+        time.sleep(DELAY_SECONDS)
+        
+        if not detail:
+            print("  ⚠️  본문을 가져올 수 없습니다.")
+            counts['fail'] += 1
             continue
         
-        # 마감일 없으면 기본값 (3개월 후)
-        if not analyzed['due_date']:
-            default_due = datetime.now() + timedelta(days=90)
-            analyzed['due_date'] = default_due.strftime('%Y-%m-%d')
-            print(f"  ⚠️  마감일 없음, 기본값: {analyzed['due_date']}")
-        
-        # DB 저장
-        scholarship_data = {
-            'title': item['title'],
-            'link': item['link'],
-            'due_date': analyzed['due_date'],
-            'min_gpa': analyzed['min_gpa'],
-            'max_income': analyzed['max_income'],
-            'residence': analyzed['residence'],
-            'is_image_content': is_image
+        if is_unchanged(item, detail):
+            print("  ⏭️  내용 변경 없음, 분석 건너뜀")
+            counts['unchanged'] += 1
+            continue
+        
+        entry = {
+            'item': {'title': item['title'], 'link': item['link']},
+            'content_hash': detail['content_hash'],
         }
         
-        if DatabaseManager.upsert_scholarship(scholarship_data):
-            success_count += 1
+        if detail['is_image'] and detail['image_data']:
+            images = ScholarshipCrawler.prepare_images(detail['images'], detail="high")
+            body = GPTAnalyzer._image_request(item['title'], images, "high")
+            # 배치 결과가 없으면 포스터를 다시 받아 개별 분석하고, 그래도 실패하면 본문 텍스트로 분석
+            entry.update(
+                kind='image',
+                image_urls=[image['url'] for image in detail['images']],
+                text_content=detail['text_content']
+            )
+        elif detail['text_content']:
+            ruled, missing = extract_text_rules(item['title'], detail['text_content'])
+            if not missing:
+                entry.update(kind='text', analyzed={
+                    **ruled, 'defaulted': [] if ruled['due_date'] else ['due_date'], 'invalid': []
+                })
+                entries[f"item-{idx}"] = entry
+                continue
+            content = build_context(detail['text_content'], CONTEXT_TOKEN_BUDGET, TEXT_MODEL)
+            entry.update(kind='text', ruled=ruled, missing=missing, content=content)
+            body = GPTAnalyzer._text_request(item['title'], content, TEXT_MODEL, tuple(missing))
         else:
-            fail_count += 1
+            print("  ⚠️  분석할 내용이 없습니다.")
+            counts['fail'] += 1
+            continue
         
-        # 딜레이
-        time.sleep(DELAY_SECONDS)
+        requests_.append({'custom_id': f"item-{idx}", 'body': body})
+        entries[f"item-{idx}"] = entry
+    
+    return requests_, entries, counts
+
+
+def apply_batch_result(
+    crawler: ScholarshipCrawler,
+    entry: Dict,
+    content: Optional[str]
+) -> Tuple[Optional[Dict], Optional[str]]:
+    """
+    Batch 응답 하나를 분석 결과로 변환
+    
+    응답이 없거나 검증에 실패하면 기존 방식으로 바로 다시 분석합니다.
+    (포스터는 다시 받아 Vision 개별 분석 → 본문 텍스트 분석, 텍스트는 텍스트 분석 + 모델 폴백)
+    
+    Returns:
+        (분석 결과, 분석 방법 'image' / 'text')
+    """
+    title = entry['item']['title']
+    
+    # 규칙 추출로 끝났거나 이전 실행에서 분석까지 끝나고 저장만 실패한 공고
+    if 'analyzed' in entry:
+        return entry['analyzed'], entry.get('method', 'text')
+    
+    try:
+        result = json.loads(content) if content else None
+    except json.JSONDecodeError:
+        result = None
+    
+    if entry['kind'] == 'image':
+        if isinstance(result, dict):
+            GPTAnalyzer._count('vision_batch')
+            return GPTAnalyzer._normalize(result), 'image'
+        print(f"  ⚠️  Vision 배치 결과 없음, 개별 분석: {title[:30]}")
+        images = crawler.download_images(entry.get('image_urls') or [])
+        analyzed = GPTAnalyzer.analyze_poster(title, images) if images else None
+        if analyzed:
+            return analyzed, 'image'
+        if entry.get('text_content'):
+            return analyze_text_notice(title, entry['text_content']), 'text'
+        return None, None
+    
+    analyzed = GPTAnalyzer._parse_text_result(result) if isinstance(result, dict) else None
+    problems = GPTAnalyzer._validate(analyzed) if analyzed else ['응답 없음']
+    if problems:
+        print(f"  🔍 배치 결과 검증 실패 ({title[:30]}: {', '.join(problems)}), 개별 분석")
+        analyzed = GPTAnalyzer.analyze_text(title, entry['content'], tuple(entry['missing']))
+    else:
+        GPTAnalyzer._count('text_batch')
+    return merge_rule_fields(analyzed, entry['ruled'], entry['missing']), 'text'
+
+
+def finish_batch(crawler: ScholarshipCrawler, state: Dict) -> Counter:
+    """
+    Batch API 2~3단계: 배치가 끝날 때까지 기다린 뒤 결과를 링크별로 모아 DB에 일괄 저장
+    
+    BATCH_TIMEOUT_MINUTES 안에 끝나지 않으면 상태 파일을 남겨 두고 'pending'으로 집계합니다.
+    만료 / 취소된 배치도 그때까지 끝난 결과(output_file_id)는 반영하고 나머지만 개별 분석합니다.
+    DB에 저장하지 못한 공고는 분석 결과와 함께 상태 파일에 남겨 다음 --batch 실행에서 저장만 다시 합니다.
+    """
+    counts = Counter(state.get('counts', {}))
+    entries = state['entries']
+    results = {}
+    
+    if state.get('batch_id'):
+        batch = batch_api.wait_for_batch(
+            openai_client, state['batch_id'], BATCH_POLL_SECONDS, BATCH_TIMEOUT_MINUTES * 60
+        )
+        if batch.status not in batch_api.FINAL_STATUSES:
+            print(f"⏸️  배치가 아직 진행 중입니다. 다음 --batch 실행에서 이어서 처리합니다. ({BATCH_STATE_PATH})")
+            counts['pending'] += len(entries)
+            return counts
+        results = batch_api.read_batch_results(openai_client, batch)
+        if batch.status != 'completed':
+            requested = sum(1 for entry in entries.values() if 'analyzed' not in entry)
+            received = sum(1 for content in results.values() if content)
+            print(f"⚠️  배치 {batch.status}, 받은 결과 {received}개를 반영하고 나머지 "
+                  f"{requested - received}개는 개별 분석합니다.")
+    
+    rows = []
+    analyzed_entries = {}
+    for custom_id, entry in entries.items():
+        analyzed, method = apply_batch_result(crawler, entry, results.get(custom_id))
+        if not analyzed:
+            counts['fail'] += 1
+            continue
+        rows.append(build_scholarship_data(entry['item'], analyzed, method == 'image', entry['content_hash']))
+        analyzed_entries[custom_id] = {**entry, 'analyzed': analyzed, 'method': method}
+    
+    saved = DatabaseManager.upsert_scholarships(rows)
+    unsaved = {}
+    for custom_id, entry in analyzed_entries.items():
+        if entry['item']['link'] in saved:
+            tally(counts, entry['method'])
+        else:
+            unsaved[custom_id] = entry
+    
+    # 저장하지 못한 공고는 (비용을 낸) 분석 결과를 버리지 않고 남겨 두었다가 저장만 다시 시도
+    if unsaved:
+        print(f"⏸️  {len(unsaved)}개를 저장하지 못해 분석 결과를 남겨 둡니다. "
+              f"다음 --batch 실행에서 저장을 다시 시도합니다. ({BATCH_STATE_PATH})")
+        counts['pending'] += len(unsaved)
+        batch_api.save_state(BATCH_STATE_PATH, {
+            'entries': unsaved, 'counts': {}, 'created_at': datetime.now().isoformat()
+        })
+    else:
+        batch_api.clear_state(BATCH_STATE_PATH)
+    return counts
+
+
+def run_batch(crawler: ScholarshipCrawler, items: List[Dict]) -> Counter:
+    """
+    Batch API 모드
+    
+    1. 모든 공고의 GPT 요청을 JSONL 파일로 작성
+    2. 파일을 제출하고 상태 파일에 배치 ID를 기록한 뒤 완료될 때까지 대기
+    3. 결과를 링크별로 모아 DB에 일괄 저장
+    """
+    requests_, entries, counts = prepare_batch(crawler, items)
+    state = {'entries': entries, 'counts': dict(counts), 'created_at': datetime.now().isoformat()}
     
-    # 최종 결과
+    if requests_:
+        batch_api.write_batch_file(BATCH_INPUT_PATH, requests_)
+        state['batch_id'] = batch_api.submit_batch(
+            openai_client, BATCH_INPUT_PATH, {'source': 'scholarship-crawler'}
+        )
+        print(f"\n📦 Batch 제출 완료: {state['batch_id']} (요청 {len(requests_)}개)")
+    
+    batch_api.save_state(BATCH_STATE_PATH, state)
+    return finish_batch(crawler, state)
+
+
+def print_summary(counts: Counter, total: int, elapsed: float, controllers: Optional[Dict] = None):
+    """
+    최종 결과와 DB 상태 출력
+    
+    controllers: {이름: AIMDController} (동시 실행 한도 출력용)
+    """
+    controllers = {**(controllers or {}), **llm_scheduler.controllers()}
     print("\n" + "=" * 80)
     print("✅ 크롤링 완료!")
     print("=" * 80)
-    print(f"  성공: {success_count}개 | 실패: {fail_count}개 | 전체: {len(items)}개")
+    print(f"  성공: {counts['success']}개 | 실패: {counts['fail']}개 | "
+          f"변경 없음: {counts['unchanged']}개 | 전체: {total}개")
+    if counts['pending']:
+        print(f"  Batch 대기: {counts['pending']}개 (다음 --batch 실행에서 반영)")
+    print(f"  소요 시간: {elapsed:.1f}초")
+    if llm_cache is not None:
+        print(f"  GPT 캐시: 적중 {llm_cache.hits}개 | 호출 {llm_cache.misses}개")
+    if http_cache is not None:
+        print(f"  HTTP 캐시: 304 {http_cache.not_modified}개 | 본문 동일 {http_cache.same_body}개 | "
+              f"변경 {http_cache.changed}개")
+    print(f"  GPT 속도 제한: 대기 {llm_scheduler.waits}회 | 재시도 {llm_scheduler.retries}회")
+    if ADAPTIVE_CONCURRENCY:
+        for name, controller in controllers.items():
+            print(f"  🎚️  {name}: 최종 동시 실행 {int(controller.limit)} | 최대 {controller.peak} / 상한 {controller.maximum}")
     print(f"\n  📊 분석 방법:")
-    print(f"    - 이미지 (Vision): {image_count}개")
-    print(f"    - 텍스트: {text_count}개\n")
+    print(f"    - 이미지 (Vision): {counts['image']}개 "
+          f"(저해상도 {GPTAnalyzer.stats['vision_low']}개 / 고해상도 {GPTAnalyzer.stats['vision_high']}개 / "
+          f"Batch {GPTAnalyzer.stats['vision_batch']}개)")
+    print(f"    - 텍스트: {counts['text']}개 "
+          f"(규칙 {GPTAnalyzer.stats['text_rule']}개 / "
+          f"{TEXT_MODEL} {GPTAnalyzer.stats['text_primary']}개 / "
+          f"배치 {GPTAnalyzer.stats['text_batch']}개 / "
+          f"{TEXT_FALLBACK_MODEL} {GPTAnalyzer.stats['text_fallback']}개)\n")
     
     # 최신 통계
     print("📊 최종 DB 상태:")
@@ -480,6 +1699,215 @@ def main():
     print(f"  전체: {stats['total']}개 | 활성: {stats['active']}개 | 만료: {stats['expired']}개\n")
 
 
+def resume_items(state: RunState) -> List[Dict]:
+    """
+    이전 실행의 목록에서 저장까지 끝나지 않은 공고만 고름
+    
+    분석까지 끝난 공고에는 저널에 남은 결과를 붙여 다시 분석하지 않고 저장만 하게 합니다.
+    상세 페이지 / 이미지는 저널에 남기지 않으므로 그 단계에서 멈춘 공고는 상세 페이지부터 다시 처리합니다.
+    """
+    items = []
+    stored = 0
+    for item in state.items:
+        link = item['link']
+        if state.completed(link, 'stored'):
+            stored += 1
+            continue
+        item = dict(item)
+        analyzed = state.data(link, 'analyzed')
+        if analyzed:
+            item['resumed_row'] = analyzed['row']
+            item['resumed_method'] = analyzed['method']
+        items.append(item)
+    
+    reused = sum(1 for item in items if 'resumed_row' in item)
+    print(f"♻️  실행 {state.run_id} 이어서 처리: 저장 완료 {stored}개 건너뜀 | "
+          f"분석 결과 재사용 {reused}개 | 다시 처리 {len(items) - reused}개")
+    return items
+
+
+def parse_args() -> argparse.Namespace:
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description="장학금 메인 크롤러 (GPT-4o Vision)")
+    parser.add_argument(
+        '--async', dest='use_async', action='store_true',
+        help='공고를 동시에 처리 (호스트별 요청 제한 유지)'
+    )
+    parser.add_argument(
+        '--batch', action='store_true',
+        help='OpenAI Batch API로 한꺼번에 분석 (저렴하지만 결과까지 최대 24시간, 중단 시 다시 실행하면 이어서 처리)'
+    )
+    parser.add_argument(
+        '--refresh', action='store_true', default=FORCE_REFRESH,
+        help='이미 저장된 공고도 다시 분석 (기본: 새 공고만 처리)'
+    )
+    parser.add_argument(
+        '--resume', action='store_true',
+        help='중단된 마지막 실행을 저널(JOURNAL_PATH)에서 이어서 처리하고 새 공고도 함께 처리 '
+             '(마지막 실행이 끝났거나 RESUME_MAX_HOURS보다 오래되었으면 새로 시작)'
+    )
+    return parser.parse_args()
+
+
+def crawl_items(crawler: ScholarshipCrawler, refresh: bool) -> List[Dict]:
+    """
+    목록 크롤링
+    
+    증분 모드(refresh=False)에서는 저장된 해시를 먼저 읽어 목록 조기 종료와 변경 감지에 사용하고,
+    이미 저장된 공고에는 'known_hash'를 붙여 내용이 같으면 분석을 건너뛰게 합니다.
+    """
+    known_hashes = None
+    if not refresh:
+        try:
+            known_hashes = DatabaseManager.fetch_known_hashes()
+        except Exception as e:
+            print(f"⚠️  저장된 해시 조회 실패, 전체 처리: {e}")
+    
+    items = crawler.crawl_list(TARGET_URL, known_hashes)
+    
+    if items and known_hashes is not None:
+        known_count = 0
+        for item in items:
+            if item['link'] in known_hashes:
+                item['known_hash'] = known_hashes[item['link']]
+                known_count += 1
+        print(f"🔎 이미 저장된 공고 {known_count}개는 변경 여부만 확인 (--refresh로 전체 재분석)")
+    
+    return items
+
+
+def init_runtime():
+    """
+    API 클라이언트, 캐시, 저널, 작업 풀 생성 (main 시작 시 한 번)
+    
+    CPU 작업 프로세스는 실행 중인 스레드를 fork하지 않도록 spawn으로 시작하며,
+    spawn된 프로세스는 이 파일을 __mp_main__으로 다시 import합니다.
+    여기서 만들면 작업 프로세스에는 클라이언트 / SQLite 연결 / 스레드가 생기지 않고
+    parsing / image_preprocess의 함수만 실행됩니다. 프로세스는 첫 작업 때 만들어집니다.
+    """
+    global openai_client, supabase, llm_cache, http_cache, cpu_pool, slice_pool, journal, db_writer
+    
+    # 재시도는 LLMScheduler가 담당하므로 SDK 자체 재시도는 끔
+    openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"), max_retries=0)
+    supabase = create_client(
+        os.getenv("SUPABASE_URL"),
+        os.getenv("SUPABASE_KEY")
+    )
+    
+    if LLM_CACHE_PATH:
+        llm_cache = LLMCache(
+            LLM_CACHE_PATH,
+            max_entries=LLM_CACHE_MAX_ENTRIES,
+            ttl_seconds=LLM_CACHE_TTL_DAYS * 86400
+        )
+    if HTTP_CACHE_PATH:
+        http_cache = HTTPCache(HTTP_CACHE_PATH, version=f"{PARSER_VERSION}-{HTML_PARSER}")
+    if JOURNAL_PATH:
+        journal = RunJournal(JOURNAL_PATH)
+    
+    if CPU_WORKERS > 0:
+        cpu_pool = ProcessPoolExecutor(
+            max_workers=CPU_WORKERS,
+            mp_context=multiprocessing.get_context('spawn')
+        )
+        atexit.register(cpu_pool.shutdown)
+    slice_pool = ThreadPoolExecutor(max_workers=IMAGE_SLICE_WORKERS, thread_name_prefix='slice')
+    
+    db_writer = BufferedWriter(
+        DatabaseManager.upsert_rows, DB_BATCH_SIZE, DB_FLUSH_SECONDS, on_saved=record_stored
+    )
+    atexit.register(db_writer.close)
+
+
+def main():
+    """메인 실행 함수"""
+    args = parse_args()
+    init_runtime()
+    
+    print("=" * 80)
+    print("🎓 장학금 메인 크롤러 (GPT-4o Vision)")
+    print("=" * 80)
+    
+    # 초기 통계
+    print("\n📊 현재 DB 상태:")
+    stats = DatabaseManager.get_statistics()
+    print(f"  전체: {stats['total']}개 | 활성: {stats['active']}개 | 만료: {stats['expired']}개\n")
+    
+    # Batch 모드: 제출해 둔 배치가 있으면 새로 크롤링하지 않고 그 결과부터 반영
+    pending_batch = batch_api.load_state(BATCH_STATE_PATH) if args.batch else None
+    if pending_batch:
+        print(f"♻️  제출해 둔 배치를 이어서 처리합니다. ({pending_batch.get('batch_id', '요청 없음')})")
+        started = time.monotonic()
+        counts = finish_batch(ScholarshipCrawler(), pending_batch)
+        total = counts['success'] + counts['fail'] + counts['unchanged'] + counts['pending']
+        print_summary(counts, total, time.monotonic() - started)
+        return
+    
+    # 크롤러 시작 (동시 실행 모드에서는 호스트별 요청 제한)
+    if args.use_async:
+        crawler = ScholarshipCrawler(HostLimiter(HOST_CONCURRENCY, HOST_DELAY_SECONDS, adaptive=ADAPTIVE_CONCURRENCY))
+    else:
+        crawler = ScholarshipCrawler()
+    
+    # 1. 목록 크롤링 (--resume: 마지막 실행이 끝나지 않았으면 그 실행의 목록과 단계 기록을 사용)
+    resumed = None
+    if args.resume and journal is not None and not args.batch:
+        resumed = load_last_run(JOURNAL_PATH)
+        if resumed is None or resumed.finished:
+            print("ℹ️  이어서 처리할 실행이 없어 새로 시작합니다.")
+            resumed = None
+        elif resumed.started_at and time.time() - resumed.started_at > RESUME_MAX_HOURS * 3600:
+            print(f"⚠️  실행 {resumed.run_id}이(가) {RESUME_MAX_HOURS:g}시간 넘게 끝나지 않아 버리고 새로 시작합니다.")
+            resumed = None
+    
+    if resumed is not None:
+        journal.start(resumed.run_id)
+        items = resume_items(resumed)
+        # 이전 목록만 다시 처리하면 그사이 올라온 공고를 놓치므로 새 목록도 합침
+        listed = {item['link'] for item in resumed.items}
+        fresh = [item for item in crawl_items(crawler, args.refresh) if item['link'] not in listed]
+        for item in fresh:
+            record_stage(item['link'], 'listed', item)
+        items.extend(fresh)
+        print(f"🆕 이전 목록에 없던 공고 {len(fresh)}개 추가")
+    else:
+        items = crawl_items(crawler, args.refresh)
+        if journal is not None and not args.batch:
+            journal.start(new_run_id())
+            for item in items:
+                record_stage(item['link'], 'listed', item)
+    
+    if not items:
+        print("❌ 크롤링할 공고가 없습니다.")
+        if journal is not None:
+            journal.finish()
+        return
+    
+    print(f"\n🔄 총 {len(items)}개 공고를 처리합니다.\n")
+    
+    # 2. 각 공고 처리
+    started = time.monotonic()
+    if args.batch:
+        print("📦 Batch API 모드: 요청을 모아 제출한 뒤 결과를 기다립니다.")
+        counts = run_batch(crawler, items)
+    elif args.use_async:
+        mode = "자동 조절, 상한 " if ADAPTIVE_CONCURRENCY else ""
+        print(f"⚡ 동시 실행 ({mode}호스트당 {HOST_CONCURRENCY}개 / 최소 {HOST_DELAY_SECONDS}초 간격, "
+              f"GPT {LLM_CONCURRENCY}개)")
+        print(f"   파이프라인 작업자: detail {DETAIL_WORKERS} → image {IMAGE_WORKERS} → "
+              f"analyze {ANALYZE_WORKERS} → store 1 (대기열 {PIPELINE_QUEUE_SIZE})")
+        counts = asyncio.run(run_async(crawler, items))
+    else:
+        counts = run_sequential(crawler, items)
+    if not args.batch:
+        flush_writer(counts)
+        if journal is not None:
+            journal.finish()
+    elapsed = time.monotonic() - started
+    
+    host_controllers = crawler.host_limiter.controllers() if crawler.host_limiter else {}
+    print_summary(counts, len(items), elapsed, host_controllers)
+
+
 if __name__ == "__main__":
     main()
-
@@ -0,0 +1,89 @@
+"""
+게시판 목록 페이지네이션 유틸리티
+여러 목록 페이지를 제한된 동시성으로 가져오고, 이미 저장된 공고만 있는 페이지에서 멈춥니다.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Set
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+
+def build_page_url(url: str, page: int, page_param: str = "pageIndex") -> str:
+    """목록 URL에 페이지 번호 쿼리 파라미터를 설정"""
+    parsed = urlparse(url)
+    query = dict(parse_qsl(parsed.query, keep_blank_values=True))
+    query[page_param] = str(page)
+    return urlunparse(parsed._replace(query=urlencode(query)))
+
+
+def crawl_pages(
+    fetch_page: Callable[[int], List[Dict]],
+    max_pages: int,
+    concurrency: int = 1,
+    known_filter: Optional[Callable[[List[str]], Set[str]]] = None,
+    max_items: Optional[int] = None,
+    delay: float = 0.0
+) -> List[Dict]:
+    """
+    목록 페이지를 1페이지부터 차례로 가져옵니다.
+
+    한 번에 가져오는 페이지 수는 1, 1, 2, 4, ... 로 concurrency까지 늘어나므로
+    평소에는 한두 번의 요청으로 끝나고, 백필할 때는 여러 페이지를 동시에 받습니다.
+
+    다음 중 하나를 만나면 중단합니다.
+    - 모든 링크가 이미 저장된 페이지 (그 페이지의 공고까지는 포함)
+    - 공고가 없거나 새 링크가 하나도 없는 페이지 (마지막 페이지를 지났거나 페이지 파라미터 무시)
+    - max_pages 또는 max_items 도달
+
+    Args:
+        fetch_page: 페이지 번호(1부터)를 받아 [{'title', 'link', ...}] 를 돌려주는 함수
+        max_pages: 최대 페이지 수
+        concurrency: 동시에 가져올 최대 페이지 수
+        known_filter: 링크 목록 중 이미 저장된 링크 집합을 돌려주는 함수 (None이면 조기 종료 없음)
+        max_items: 최대 공고 수
+        delay: 페이지 묶음 사이 대기 시간 (초)
+
+    Returns:
+        공고 리스트 (이미 저장된 공고는 'known': True 표시)
+    """
+    items: List[Dict] = []
+    seen: Set[str] = set()
+    page = 1
+    fetched = 0
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        while page <= max_pages:
+            window = max(1, min(concurrency, fetched, max_pages - page + 1))
+            pages = list(range(page, page + window))
+
+            if page > 1 and delay:
+                time.sleep(delay)
+
+            for page_no, page_items in zip(pages, pool.map(fetch_page, pages)):
+                fresh = [item for item in page_items if item['link'] not in seen]
+                if not fresh:
+                    print(f"📄 {page_no}페이지: 새 공고 없음, 목록 끝")
+                    return items
+
+                known = known_filter([item['link'] for item in fresh]) if known_filter else set()
+                for item in fresh:
+                    seen.add(item['link'])
+                    if item['link'] in known:
+                        item['known'] = True
+                    items.append(item)
+
+                    if max_items and len(items) >= max_items:
+                        print(f"📄 최대 공고 수({max_items}개) 도달")
+                        return items
+
+                print(f"📄 {page_no}페이지: {len(fresh)}개 (저장됨 {len(known)}개)")
+
+                if known_filter and len(known) == len(fresh):
+                    print(f"⏹️  {page_no}페이지의 공고가 모두 저장되어 있어 목록 크롤링 종료")
+                    return items
+
+            page += window
+            fetched += window
+
+    return items
@@ -0,0 +1,190 @@
+"""
+게시판 HTML 파싱 (순수 함수)
+원본 바이트를 받아 작은 dict만 돌려주므로 ProcessPoolExecutor로 다른 프로세스에서 실행할 수 있습니다.
+출력(print)과 네트워크 요청은 하지 않습니다.
+
+기본 파싱 방식('strainer')은 lxml에 SoupStrainer를 붙여 필요한 노드(목록의 a.detailLink,
+상세의 본문 div)만 트리로 만듭니다. 메뉴 / 푸터 등 나머지 태그는 객체를 만들지 않으므로 빠르고 메모리도 적게 씁니다.
+"""
+
+import hashlib
+import json
+import re
+from typing import Container, Dict, List, Optional
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+# 파싱 결과 형식 버전 (바꾸면 HTTP 캐시에 저장된 파싱 결과를 다시 만듦)
+PARSER_VERSION = '3'
+
+# 파싱 방식: 'strainer'(lxml + 필요한 노드만), 'lxml'(전체 트리), 'html.parser'(순수 파이썬, 전체 트리)
+PARSER_STRATEGIES = ('strainer', 'lxml', 'html.parser')
+DEFAULT_PARSER = 'strainer'
+
+# 본문 영역 클래스 (앞에서부터 시도)
+CONTENT_CLASSES = ('tbl_view', 'view-content', 'board-content', 'content', 'article-body')
+
+
+def build_full_url(path: str, base_domain: str) -> str:
+    """상대 경로를 절대 경로로 변환"""
+    if path.startswith('http'):
+        return path
+    return urljoin(base_domain, path)
+
+
+def extract_url_from_params(data_params: str, base_domain: str) -> Optional[str]:
+    """data-params에서 URL 추출"""
+    try:
+        params = json.loads(data_params.replace('&quot;', '"'))
+        if 'encMenuBoardSeq' in params:
+            return f"{base_domain}/board/view?seq={params['encMenuBoardSeq']}"
+        return None
+    except Exception:
+        return None
+
+
+def compute_content_hash(text: str, *images: Optional[bytes]) -> str:
+    """
+    공고 내용의 안정적인 해시 (SHA-256)
+
+    공백 차이로 해시가 바뀌지 않도록 본문 텍스트의 연속 공백을 하나로 정규화합니다.
+    이미지가 여러 장이면 순서대로 이어서 해시합니다 (한 장이면 이전과 같은 값).
+    """
+    normalized = re.sub(r'\s+', ' ', text or '').strip()
+    digest = hashlib.sha256(normalized.encode('utf-8'))
+    for image_data in images:
+        if image_data:
+            digest.update(b'\0')
+            digest.update(image_data)
+    return digest.hexdigest()
+
+
+def class_names(attrs: Dict) -> List[str]:
+    """
+    파싱 중인 태그 속성의 클래스 목록
+
+    SoupStrainer 함수에는 class가 목록 또는 공백으로 구분된 문자열로 넘어오므로 둘 다 처리합니다.
+    """
+    classes = attrs.get('class') or []
+    if isinstance(classes, str):
+        classes = classes.split()
+    return classes
+
+
+def has_class(attrs: Dict, names: Container[str]) -> bool:
+    """파싱 중인 태그 속성에 names 중 하나의 클래스가 있는지"""
+    return any(name in names for name in class_names(attrs))
+
+
+# 목록 페이지: 공고 링크, 링크가 없을 때 쓰는 게시판 목록 영역
+LIST_LINKS = SoupStrainer(lambda name, attrs: name == 'a' and has_class(attrs, ('detailLink',)))
+BOARD_LISTS = SoupStrainer(lambda name, attrs: name in ('div', 'table', 'ul') and has_class(attrs, ('board-list',)))
+# 상세 페이지: 본문 후보 div (하위 트리는 통째로 유지)
+CONTENT_DIVS = SoupStrainer(lambda name, attrs: name == 'div' and has_class(attrs, CONTENT_CLASSES))
+
+
+def _soup(html: bytes, parser: str, parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    """parser가 'strainer'면 lxml로 parse_only에 맞는 노드만, 그 밖에는 해당 파서로 전체 트리를 만듦"""
+    if parser not in PARSER_STRATEGIES:
+        raise ValueError(f"알 수 없는 파싱 방식: {parser}")
+    text = html.decode('utf-8', errors='replace')
+    if parser == 'strainer':
+        return BeautifulSoup(text, 'lxml', parse_only=parse_only)
+    return BeautifulSoup(text, parser)
+
+
+def parse_list_page(html: bytes, base_domain: str, parser: str = DEFAULT_PARSER) -> Dict:
+    """
+    게시판 목록 한 페이지에서 제목, 링크 추출
+
+    Returns:
+        {'found': 찾은 링크 수, 'items': [{'title', 'link'}, ...]}
+    """
+    soup = _soup(html, parser, LIST_LINKS)
+
+    # 링크 찾기 (사이트 구조에 맞게 수정)
+    links = soup.find_all('a', class_='detailLink')
+    if not links:
+        # 대체 방법: 게시판 목록 안의 모든 a 태그
+        if parser == 'strainer':
+            soup = _soup(html, parser, BOARD_LISTS)
+        links = soup.select('div.board-list a, table.board-list a, ul.board-list a')
+
+    items = []
+    for link in links:
+        title = link.get_text(strip=True)
+        href = link.get('href', '')
+
+        if not href or href == '#':
+            # data-params에서 URL 추출 시도
+            data_params = link.get('data-params', '')
+            if not data_params:
+                continue
+            detail_url = extract_url_from_params(data_params, base_domain)
+        else:
+            detail_url = build_full_url(href, base_domain)
+
+        if detail_url and title:
+            items.append({'title': title, 'link': detail_url})
+
+    return {'found': len(links), 'items': items}
+
+
+def parse_detail_page(html: bytes, base_domain: str, parser: str = DEFAULT_PARSER) -> Optional[Dict]:
+    """
+    상세 페이지에서 이미지 주소 또는 본문 텍스트 추출
+
+    텍스트 공고는 content_hash까지 계산하고, 이미지 공고는 image_urls와
+    해시용 본문(page_text)만 채웁니다 (이미지를 받은 뒤 해시 계산).
+    긴 포스터를 여러 장으로 나눠 올린 공고가 많으므로 본문 영역의 이미지를 모두 순서대로 모읍니다.
+
+    Returns:
+        {'image_url', 'image_urls', 'images', 'image_data', 'content_type',
+         'text_content', 'is_image', 'content_hash'}
+        + 이미지 공고는 'page_text' (본문 영역이 없으면 None)
+    """
+    soup = _soup(html, parser, CONTENT_DIVS)
+
+    content_div = None
+    for class_name in CONTENT_CLASSES:
+        content_div = soup.find('div', class_=class_name)
+        if content_div:
+            break
+    if not content_div:
+        return None
+
+    text_content = content_div.get_text(strip=True, separator='\n')
+    detail = {
+        'image_url': None,
+        'image_urls': [],
+        'images': [],
+        'image_data': None,
+        'content_type': None,
+        'text_content': None,
+        'is_image': False,
+        'content_hash': None,
+    }
+
+    # 1. 이미지 찾기 (우선, 문서 순서대로 중복 제외)
+    image_urls = []
+    for img_tag in content_div.find_all('img'):
+        img_src = img_tag.get('src', '').strip()
+        if not img_src or img_src.startswith('data:'):
+            continue
+        image_url = build_full_url(img_src, base_domain)
+        if image_url not in image_urls:
+            image_urls.append(image_url)
+    if image_urls:
+        detail['image_url'] = image_urls[0]
+        detail['image_urls'] = image_urls
+        detail['is_image'] = True
+        detail['page_text'] = text_content
+        return detail
+
+    # 2. 텍스트 (폴백)
+    if text_content:
+        detail['text_content'] = text_content
+        detail['content_hash'] = compute_content_hash(text_content)
+
+    return detail
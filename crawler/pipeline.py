@@ -0,0 +1,189 @@
+"""
+단계별 생산자/소비자 파이프라인
+단계 사이를 크기 제한이 있는 asyncio.Queue로 연결하여 뒤 단계가 밀리면 앞 단계가 기다립니다 (backpressure).
+대기열이 무한정 커지지 않으므로 큰 데이터(포스터 base64 등)가 메모리에 쌓이지 않고,
+단계별 대기열 깊이와 처리량으로 사이트 / 이미지 서버 / LLM 중 어디가 병목인지 확인할 수 있습니다.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Iterable, List, Optional
+
+
+class Stage:
+    """
+    파이프라인 단계 하나
+
+    handler는 작업 하나를 받아 다음 단계로 넘길 작업을 돌려주는 코루틴 함수입니다.
+    None을 돌려주면 그 작업은 이 단계에서 끝납니다 (결과 집계는 handler가 직접).
+    마지막 단계의 반환값은 버려집니다.
+
+    Args:
+        name: 단계 이름 (통계 출력용)
+        handler: 작업 처리 코루틴 함수
+        workers: 동시에 실행할 작업자 수
+        queue_size: 이 단계 입력 대기열의 최대 길이
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[Any], Awaitable[Optional[Any]]],
+        workers: int = 1,
+        queue_size: int = 8
+    ):
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.queue_size = max(1, queue_size)
+        self.queue: Optional[asyncio.Queue] = None
+        self.processed = 0
+        self.forwarded = 0
+        self.errors = 0
+        self.busy = 0.0
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.max_depth = 0
+        self._depth_total = 0
+        self._depth_samples = 0
+
+    def sample(self):
+        """현재 대기열 깊이 기록"""
+        depth = self.queue.qsize()
+        self.max_depth = max(self.max_depth, depth)
+        self._depth_total += depth
+        self._depth_samples += 1
+
+    @property
+    def avg_depth(self) -> float:
+        return self._depth_total / self._depth_samples if self._depth_samples else 0.0
+
+    @property
+    def elapsed(self) -> float:
+        """첫 작업 시작부터 마지막 작업 끝까지 (초)"""
+        if self.started is None or self.finished is None:
+            return 0.0
+        return self.finished - self.started
+
+    @property
+    def throughput(self) -> float:
+        """초당 처리 작업 수"""
+        return self.processed / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def utilization(self) -> float:
+        """작업자가 일한 시간의 비율 (1에 가까울수록 이 단계가 병목)"""
+        capacity = self.workers * self.elapsed
+        return min(1.0, self.busy / capacity) if capacity > 0 else 0.0
+
+
+class Pipeline:
+    """
+    Stage들을 순서대로 크기 제한 대기열로 연결하여 실행
+
+    - 단계마다 workers개의 작업자 코루틴이 자기 입력 대기열에서 작업을 꺼내 처리합니다.
+    - 다음 단계 대기열이 가득 차면 put()에서 기다리므로, 실행 중인 작업 수는
+      (대기열 크기 + 작업자 수)의 합을 넘지 않습니다.
+    - handler가 예외를 던지면 on_error(단계 이름, 작업, 예외)를 호출하고 그 작업은 버립니다.
+    - report_interval초마다 대기열 상태를 출력합니다 (0이면 출력 안 함).
+    같은 이벤트 루프 안에서만 사용합니다.
+    """
+
+    SAMPLE_INTERVAL = 0.5
+
+    def __init__(
+        self,
+        stages: List[Stage],
+        on_error: Optional[Callable[[str, Any, Exception], None]] = None,
+        report_interval: float = 10.0
+    ):
+        self.stages = stages
+        self.on_error = on_error
+        self.report_interval = report_interval
+        self.submitted = 0
+        self.source_blocked = 0.0
+
+    async def run(self, jobs: Iterable[Any]):
+        """jobs를 첫 단계에 넣고 모든 단계가 끝날 때까지 대기"""
+        for stage in self.stages:
+            stage.queue = asyncio.Queue(maxsize=stage.queue_size)
+
+        workers = [
+            [asyncio.create_task(self._work(index)) for _ in range(stage.workers)]
+            for index, stage in enumerate(self.stages)
+        ]
+        monitor = asyncio.create_task(self._monitor())
+
+        try:
+            first = self.stages[0].queue
+            for job in jobs:
+                waited = time.monotonic()
+                await first.put(job)
+                self.submitted += 1
+                self.source_blocked += time.monotonic() - waited
+
+            # 앞 단계부터 차례로 비우면 그 뒤로는 새 작업이 들어오지 않음
+            for stage, tasks in zip(self.stages, workers):
+                await stage.queue.join()
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            monitor.cancel()
+            for tasks in workers:
+                for task in tasks:
+                    task.cancel()
+            await asyncio.gather(monitor, *[task for tasks in workers for task in tasks], return_exceptions=True)
+
+    async def _work(self, index: int):
+        stage = self.stages[index]
+        next_queue = self.stages[index + 1].queue if index + 1 < len(self.stages) else None
+
+        while True:
+            job = await stage.queue.get()
+            try:
+                started = time.monotonic()
+                if stage.started is None:
+                    stage.started = started
+                try:
+                    result = await stage.handler(job)
+                except Exception as e:
+                    stage.errors += 1
+                    result = None
+                    if self.on_error is not None:
+                        self.on_error(stage.name, job, e)
+                stage.processed += 1
+                stage.busy += time.monotonic() - started
+                stage.finished = time.monotonic()
+
+                if result is not None and next_queue is not None:
+                    stage.forwarded += 1
+                    await next_queue.put(result)
+            finally:
+                stage.queue.task_done()
+
+    async def _monitor(self):
+        last_report = time.monotonic()
+        while True:
+            await asyncio.sleep(self.SAMPLE_INTERVAL)
+            for stage in self.stages:
+                stage.sample()
+            if self.report_interval and time.monotonic() - last_report >= self.report_interval:
+                last_report = time.monotonic()
+                depths = ' | '.join(f"{stage.name} {stage.queue.qsize()}/{stage.queue_size}" for stage in self.stages)
+                print(f"📈 대기열: {depths}")
+
+    def report(self) -> List[str]:
+        """단계별 처리량 / 가동률 / 대기열 깊이 요약"""
+        lines = [f"{'source':<8} 투입 {self.submitted}개 | 첫 대기열이 가득 차 기다린 시간 {self.source_blocked:.1f}초"]
+        for stage in self.stages:
+            lines.append(
+                f"{stage.name:<8} 작업자 {stage.workers} | 처리 {stage.processed}개 "
+                f"({stage.throughput:.2f}개/초, 오류 {stage.errors}) | 가동률 {stage.utilization:.0%} | "
+                f"대기열 평균 {stage.avg_depth:.1f} / 최대 {stage.max_depth} (상한 {stage.queue_size})"
+            )
+
+        busiest = max(self.stages, key=lambda stage: stage.utilization, default=None)
+        if busiest is not None and busiest.processed:
+            lines.append(f"병목 추정: {busiest.name} (가동률 {busiest.utilization:.0%})")
+        return lines
@@ -0,0 +1,252 @@
+"""
+규칙 기반 장학금 조건 추출기
+"신청기간: 2026. 1. 5.(월) ~ 1. 31.(금)", "직전학기 평점 3.0 이상", "소득분위 8구간 이하"처럼
+정형화된 문구를 정규식으로 읽어 GPT 호출 없이 필드를 채웁니다.
+"""
+
+import re
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+# 이 확신도 이상인 필드는 GPT에 다시 묻지 않음
+HIGH_CONFIDENCE = 0.8
+# 조건 문구를 찾지 못한 필드의 확신도 (규칙이 놓친 표현일 수 있으므로 GPT에 확인)
+ABSENT_CONFIDENCE = 0.5
+
+FIELDS = ('min_gpa', 'max_income', 'residence', 'due_date')
+
+DEADLINE_KEYWORDS = (
+    '신청기간', '신청 기간', '신청기한', '신청 기한', '신청일정', '접수기간', '접수 기간',
+    '접수기한', '접수일정', '모집기간', '모집 기간', '제출기한', '제출 기한', '마감'
+)
+GPA_KEYWORDS = ('평점', '평균', '학점', '성적', 'GPA')
+INCOME_KEYWORDS = ('소득', '분위', '구간')
+RESIDENCE_KEYWORDS = ('거주', '주소', '주민등록', '출신', '소재', '관내')
+
+# 시/도 이름 → 화면 필터와 같은 약칭
+REGIONS = {
+    '서울': ('서울특별시', '서울시', '서울'),
+    '부산': ('부산광역시', '부산시', '부산'),
+    '대구': ('대구광역시', '대구시', '대구'),
+    '인천': ('인천광역시', '인천시', '인천'),
+    '광주': ('광주광역시', '광주시', '광주'),
+    '대전': ('대전광역시', '대전시', '대전'),
+    '울산': ('울산광역시', '울산시', '울산'),
+    '세종': ('세종특별자치시', '세종시', '세종'),
+    '경기': ('경기도', '경기'),
+    '강원': ('강원특별자치도', '강원도', '강원'),
+    '충북': ('충청북도', '충북'),
+    '충남': ('충청남도', '충남'),
+    '전북': ('전북특별자치도', '전라북도', '전북'),
+    '전남': ('전라남도', '전남'),
+    '경북': ('경상북도', '경북'),
+    '경남': ('경상남도', '경남'),
+    '제주': ('제주특별자치도', '제주도', '제주'),
+}
+
+# 2026. 1. 5. / 2026-01-05 / 2026년 1월 5일 / '26. 1. 5.
+_FULL_DATE = r"(?P<y>\d{4}|'\d{2})\s*(?:년|[./-])\s*(?P<m>\d{1,2})\s*(?:월|[./-])\s*(?P<d>\d{1,2})\s*(?:일)?"
+# 1월 31일 / 1. 31.(금) / 1/31(금) / 1. 31.  (연도 없음, 평점 "3.5" 같은 소수와 구분되는 형태만)
+_PARTIAL_DATE = (
+    r"(?P<m2>\d{1,2})\s*(?:"
+    r"월\s*(?P<d2>\d{1,2})\s*일"
+    r"|[./]\s*(?P<d3>\d{1,2})\s*\.?\s*\([월화수목금토일]\)"
+    r"|\.\s*(?P<d4>\d{1,2})\s*\.)"
+)
+DATE_PATTERN = re.compile(rf"(?<![\d.])(?:{_FULL_DATE}|{_PARTIAL_DATE})")
+RANGE_SEPARATOR = re.compile(r"~|∼|～|〜|-|–|부터")
+
+GPA_PATTERN = re.compile(
+    r"(?:평점|평균|학점|성적|GPA)[^\n\d]{0,15}?(?<![\d.])(\d(?:\.\d{1,2})?)\s*(?:점)?\s*(?:/\s*4\.[35])?\s*(?:점\s*)?(?:이상|以上)",
+    re.IGNORECASE
+)
+# 학점 등급 ("B+ 이상", "B0 학점 이상") → 4.5 만점 평점
+LETTER_GRADE_PATTERN = re.compile(r"(?<![A-Za-z])([A-D])\s*([+0])?\s*(?:학점\s*)?(?:이상|以上)")
+LETTER_GRADES = {'A': 4.0, 'B': 3.0, 'C': 2.0, 'D': 1.0}
+INCOME_PATTERN = re.compile(
+    r"(?:소득\s*(?:분위|구간)?|학자금\s*지원\s*구간|지원\s*구간)[^\n\d]{0,15}?(\d{1,2})\s*(?:분위|구간)\s*(?:이하|이내|까지)"
+)
+
+
+def _lines_with(text: str, keywords: Tuple[str, ...], following: int = 0) -> List[str]:
+    """키워드가 있는 줄 (+ 다음 following줄을 이어 붙임)"""
+    lines = text.split('\n')
+    found = []
+    for i, line in enumerate(lines):
+        if any(keyword in line for keyword in keywords):
+            found.append(' '.join(lines[i:i + 1 + following]))
+    return found
+
+
+def _find_dates(text: str, today: date) -> List[Tuple[date, bool, int, int]]:
+    """
+    문자열의 날짜 목록
+
+    Returns:
+        [(날짜, 연도가 명시되었는지, 시작 위치, 끝 위치), ...]
+    """
+    dates = []
+    previous: Optional[date] = None
+
+    for match in DATE_PATTERN.finditer(text):
+        if match.group('y'):
+            year_text = match.group('y')
+            year = 2000 + int(year_text[1:]) if year_text.startswith("'") else int(year_text)
+            month, day = int(match.group('m')), int(match.group('d'))
+            explicit = True
+        else:
+            month = int(match.group('m2'))
+            day = int(match.group('d2') or match.group('d3') or match.group('d4'))
+            explicit = False
+
+        try:
+            if explicit:
+                parsed = date(year, month, day)
+            elif previous:
+                # 연도 생략: 앞 날짜의 연도 (앞 날짜보다 이르면 해가 바뀐 것)
+                parsed = date(previous.year, month, day)
+                if parsed < previous:
+                    parsed = date(previous.year + 1, month, day)
+            else:
+                # 첫 날짜의 연도 생략: 작년 / 올해 / 내년 중 오늘과 가장 가까운 날짜
+                # (1월 초에 올라온 "12월 20일 ~ 1월 10일"은 작년 12월부터)
+                parsed = min(
+                    (date(year, month, day) for year in (today.year - 1, today.year, today.year + 1)
+                     if not (month == 2 and day == 29 and year % 4)),
+                    key=lambda candidate: abs(candidate - today)
+                )
+        except ValueError:
+            continue
+
+        dates.append((parsed, explicit, match.start(), match.end()))
+        previous = parsed
+
+    return dates
+
+
+def extract_due_date(text: str, today: Optional[date] = None) -> Tuple[Optional[str], float]:
+    """
+    신청 마감일 추출
+
+    신청기간/접수기간/마감 등의 키워드가 있는 줄(과 다음 줄)에서 날짜를 찾고,
+    "A ~ B" 형태의 기간이면 끝 날짜를 마감일로 봅니다.
+    """
+    today = today or date.today()
+    candidates = []
+
+    for line in _lines_with(text, DEADLINE_KEYWORDS, following=1):
+        dates = _find_dates(line, today)
+        if not dates:
+            continue
+
+        end, explicit = dates[-1][0], dates[-1][1]
+        for (first, first_explicit, _, first_end), (second, _, second_start, _) in zip(dates, dates[1:]):
+            if RANGE_SEPARATOR.search(line[first_end:second_start]) and second >= first:
+                end, explicit = second, explicit or first_explicit
+                break
+        candidates.append((end, explicit))
+
+    if not candidates:
+        if _find_dates(text, today) or any(keyword in text for keyword in DEADLINE_KEYWORDS):
+            return None, 0.2
+        # 날짜도 마감 관련 문구도 없는 공고
+        return None, ABSENT_CONFIDENCE
+
+    distinct = {end for end, _ in candidates}
+    latest = max(distinct)
+    if len(distinct) > 1:
+        # 1차/2차 모집처럼 마감일 후보가 여러 개
+        return latest.isoformat(), 0.5
+    explicit = any(is_explicit for end, is_explicit in candidates if end == latest)
+    return latest.isoformat(), 0.95 if explicit else 0.85
+
+
+def extract_min_gpa(text: str) -> Tuple[float, float]:
+    """최소 학점 추출 ("평점 3.0 이상", "B+ 이상")"""
+    values = set()
+    for match in GPA_PATTERN.finditer(text):
+        value = float(match.group(1))
+        if 0.0 < value <= 4.5:
+            values.add(value)
+
+    letters = set()
+    for match in LETTER_GRADE_PATTERN.finditer(text):
+        letters.add(LETTER_GRADES[match.group(1)] + (0.5 if match.group(2) == '+' else 0.0))
+
+    if len(values | letters) == 1:
+        if values:
+            return values.pop(), 0.9
+        # 등급은 4.5 만점 기준으로 환산 (4.3 만점 학교면 값이 달라지므로 GPT에 확인)
+        return letters.pop(), 0.5 if '4.3' in text else 0.85
+    if values or letters:
+        return min(values | letters), 0.5
+    if any(keyword in text for keyword in GPA_KEYWORDS):
+        # 성적 조건이 있어 보이지만 숫자를 읽지 못함 (예: "학점 3.0", "평균 B학점")
+        return 0.0, 0.3
+    return 0.0, ABSENT_CONFIDENCE
+
+
+def extract_max_income(text: str) -> Tuple[int, float]:
+    """소득분위 상한 추출 ("소득분위 8구간 이하")"""
+    values = set()
+    for match in INCOME_PATTERN.finditer(text):
+        value = int(match.group(1))
+        if 0 <= value <= 10:
+            values.add(value)
+
+    if len(values) == 1:
+        return values.pop(), 0.9
+    if values:
+        return max(values), 0.5
+    if any(keyword in text for keyword in INCOME_KEYWORDS):
+        return 99, 0.3
+    return 99, ABSENT_CONFIDENCE
+
+
+def _regions_in(text: str) -> List[str]:
+    """문자열에 나오는 시/도 약칭 목록 (중복 제거, 등장 순서)"""
+    found = []
+    for region, names in REGIONS.items():
+        if any(name in text for name in names) and region not in found:
+            found.append(region)
+    return found
+
+
+def extract_residence(text: str) -> Tuple[str, float]:
+    """거주지 제한 추출 (시/도 단위)"""
+    regions = []
+    for line in _lines_with(text, RESIDENCE_KEYWORDS, following=1):
+        for region in _regions_in(line):
+            if region not in regions:
+                regions.append(region)
+
+    if len(regions) == 1:
+        return regions[0], 0.9
+    if regions:
+        return regions[0], 0.4
+    if _regions_in(text):
+        # 지역명은 있지만 거주 조건인지 알 수 없음
+        return '전국', 0.4
+    if any(keyword in text for keyword in RESIDENCE_KEYWORDS):
+        return '전국', 0.5
+    return '전국', ABSENT_CONFIDENCE
+
+
+def extract_fields(text: str, today: Optional[date] = None) -> Dict[str, Tuple[Any, float]]:
+    """
+    공고 텍스트에서 네 필드를 추출
+
+    Returns:
+        {'min_gpa': (값, 확신도), 'max_income': ..., 'residence': ..., 'due_date': ...}
+    """
+    return {
+        'min_gpa': extract_min_gpa(text),
+        'max_income': extract_max_income(text),
+        'residence': extract_residence(text),
+        'due_date': extract_due_date(text, today),
+    }
+
+
+def uncertain_fields(extracted: Dict[str, Tuple[Any, float]], threshold: float = HIGH_CONFIDENCE) -> List[str]:
+    """확신도가 threshold 미만인 필드 (GPT에 물어볼 필드)"""
+    return [field for field in FIELDS if extracted[field][1] < threshold]
@@ -0,0 +1,174 @@
+"""
+실행 저널 (append-only JSONL)
+공고별 단계 진행(listed → fetched → image_downloaded → analyzed → stored)을 한 줄씩 기록하여
+실행이 중간에 끊겨도 다음 실행(--resume)에서 끝난 단계를 다시 하지 않도록 합니다.
+--resume은 마지막 실행만 읽으므로, 실행을 시작하고 끝낼 때 다른 실행의 기록을 지워 파일이 계속 커지지 않게 합니다.
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+# 공고 하나가 거치는 단계 (순서대로)
+STAGES = ('listed', 'fetched', 'image_downloaded', 'analyzed', 'stored')
+# 실행 전체가 끝났음을 나타내는 기록 (link 없음)
+FINISHED = 'finished'
+
+
+def new_run_id() -> str:
+    """실행 ID (시각 + 임의 접미사)"""
+    return f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+
+def _ends_with_newline(path: str) -> bool:
+    """파일이 비었거나 줄바꿈으로 끝나는지"""
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell() == 0:
+            return True
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b'\n'
+
+
+def _read_lines(path: str) -> Iterator[Dict]:
+    """저널의 기록 줄 (강제 종료로 잘린 줄 등 읽을 수 없는 줄은 건너뜀)"""
+    if not os.path.exists(path):
+        return
+    with open(path, encoding='utf-8') as f:
+        for raw in f:
+            try:
+                line = json.loads(raw)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(line, dict) and 'run_id' in line and 'stage' in line:
+                yield line
+
+
+class RunJournal:
+    """
+    실행 하나의 단계 기록기
+
+    기록은 파일 끝에 덧붙이기만 하고 매번 flush하므로, 프로세스가 강제 종료되어도
+    그 직전까지의 기록은 남습니다. 여러 스레드에서 같은 인스턴스를 공유해도 안전합니다.
+    start()로 실행 ID를 정하기 전의 기록은 무시합니다.
+
+    start()는 그 실행의 기록만 남기고, finish()는 종료 기록 한 줄만 남기도록 파일을 정리합니다.
+
+    Args:
+        path: 저널 파일 경로
+        run_id: 실행 ID (이어서 실행할 때는 이전 실행의 ID)
+    """
+
+    def __init__(self, path: str, run_id: Optional[str] = None):
+        self.path = path
+        self.run_id = run_id
+        self._lock = threading.Lock()
+        self._file = None
+
+    def start(self, run_id: str):
+        """기록할 실행 ID 지정 (이어서 실행하면 그 실행의 기록만, 새 실행이면 빈 파일로 정리)"""
+        self.run_id = run_id
+        self._compact([line for line in _read_lines(self.path) if line['run_id'] == run_id])
+
+    def record(self, link: Optional[str], stage: str, data: Optional[Dict] = None):
+        """단계 완료 기록"""
+        if self.run_id is None:
+            return
+        line = {'run_id': self.run_id, 'link': link, 'stage': stage, 'at': time.time()}
+        if data:
+            line['data'] = data
+        with self._lock:
+            if self._file is None:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._file = open(self.path, 'a', encoding='utf-8')
+                # 강제 종료로 잘린 마지막 줄에 이어 쓰지 않도록 줄을 바꿈
+                if not _ends_with_newline(self.path):
+                    self._file.write('\n')
+            self._file.write(json.dumps(line, ensure_ascii=False) + '\n')
+            self._file.flush()
+
+    def finish(self):
+        """실행 종료 기록 (이후 --resume은 새 실행을 시작하므로 종료 기록 한 줄만 남김)"""
+        if self.run_id is not None:
+            self._compact([{'run_id': self.run_id, 'link': None, 'stage': FINISHED, 'at': time.time()}])
+        self.run_id = None
+
+    def _compact(self, lines: List[Dict]):
+        """저널 파일을 lines만 담은 파일로 교체 (임시 파일에 쓴 뒤 교체하여 중간에 끝나도 깨지지 않음)"""
+        self.close()
+        if not lines and not os.path.exists(self.path):
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for line in lines:
+                f.write(json.dumps(line, ensure_ascii=False) + '\n')
+        os.replace(tmp_path, self.path)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class RunState:
+    """저널에서 읽은 실행 하나의 공고별 진행 상태"""
+
+    def __init__(self, run_id: str):
+        self.run_id = run_id
+        self.items: List[Dict] = []
+        self.finished = False
+        self.started_at: Optional[float] = None
+        self._stages: Dict[str, int] = {}
+        self._data: Dict[str, Dict[str, Dict]] = {}
+
+    def apply(self, line: Dict):
+        if self.started_at is None:
+            self.started_at = line.get('at')
+        stage = line['stage']
+        if stage == FINISHED:
+            self.finished = True
+            return
+        if stage not in STAGES:
+            return
+
+        link = line['link']
+        if stage == 'listed' and link not in self._stages:
+            self.items.append(line.get('data') or {'link': link})
+        self._stages[link] = max(self._stages.get(link, 0), STAGES.index(stage))
+        if line.get('data'):
+            self._data.setdefault(link, {})[stage] = line['data']
+
+    def completed(self, link: str, stage: str) -> bool:
+        """stage까지 끝났는지"""
+        return self._stages.get(link, -1) >= STAGES.index(stage)
+
+    def data(self, link: str, stage: str) -> Optional[Dict]:
+        """단계 기록에 붙은 데이터"""
+        return self._data.get(link, {}).get(stage)
+
+
+def load_last_run(path: str) -> Optional[RunState]:
+    """
+    저널에서 마지막 실행의 상태를 읽음
+
+    강제 종료로 마지막 줄이 잘렸을 수 있으므로 읽을 수 없는 줄은 건너뜁니다.
+
+    Returns:
+        마지막 실행의 RunState (저널이 없거나 비었으면 None)
+    """
+    state = None
+    for line in _read_lines(path):
+        if state is None or line['run_id'] != state.run_id:
+            state = RunState(line['run_id'])
+        state.apply(line)
+    return state
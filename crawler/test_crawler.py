@@ -83,6 +83,42 @@ def test_openai_connection():
         print(f"❌ OpenAI API 연결 실패: {e}")
         return False
 
+def test_statistics_consistency():
+    """DB 통계: scholarship_stats() SQL 함수와 count 요청 대체 경로가 같은 숫자를 내는지"""
+    print("\n" + "=" * 60)
+    print("📊 DB 통계 일치 테스트")
+    print("=" * 60)
+    
+    try:
+        from datetime import datetime
+        from supabase import create_client
+        import main
+        
+        main.supabase = create_client(
+            os.getenv('SUPABASE_URL'),
+            os.getenv('SUPABASE_KEY')
+        )
+        today = datetime.now().strftime('%Y-%m-%d')
+        
+        rpc = main.DatabaseManager.rpc_statistics(today)
+        fallback = main.DatabaseManager.count_statistics(today)
+        
+        print(f"   SQL 함수: {rpc}")
+        print(f"   count 요청: {fallback}")
+        if rpc != fallback:
+            print("❌ 두 방법의 통계가 다릅니다.")
+            return False
+        if rpc['active'] + rpc['expired'] != rpc['total']:
+            print("❌ 활성 + 만료가 전체와 다릅니다.")
+            return False
+        
+        print("✅ 통계 일치!")
+        return True
+        
+    except Exception as e:
+        print(f"❌ 통계 비교 실패 (supabase_schema.sql의 scholarship_stats 함수를 적용했는지 확인): {e}")
+        return False
+
 def test_target_url():
     """크롤링 대상 URL 접근 테스트"""
     print("\n" + "=" * 60)
@@ -120,6 +156,7 @@ def main():
         '환경 변수': test_env_variables(),
         'Supabase': test_supabase_connection(),
         'OpenAI API': test_openai_connection(),
+        'DB 통계': test_statistics_consistency(),
         '크롤링 URL': test_target_url()
     }
     
@@ -0,0 +1,101 @@
+"""
+규칙 기반 추출기 테스트
+네트워크나 API 키 없이 실행됩니다.
+
+실행 방법:
+  python test_rule_extractor.py
+  python -m pytest test_rule_extractor.py
+"""
+
+from datetime import date
+
+from rule_extractor import (
+    HIGH_CONFIDENCE, extract_due_date, extract_fields, extract_max_income,
+    extract_min_gpa, extract_residence, uncertain_fields
+)
+
+TODAY = date(2026, 2, 1)
+
+
+def test_gpa_number():
+    """"평점 3.0 이상"은 확실한 값"""
+    assert extract_min_gpa("직전학기 평점 3.0 이상") == (3.0, 0.9)
+    assert extract_min_gpa("성적: 평균 3.5/4.5 이상")[0] == 3.5
+
+
+def test_gpa_letter_grade():
+    """"B+ 이상" 같은 등급은 4.5 만점 평점으로 환산"""
+    value, confidence = extract_min_gpa("직전학기 성적 B+ 이상인 자")
+    assert value == 3.5 and confidence >= HIGH_CONFIDENCE
+
+    assert extract_min_gpa("평균 B학점 이상")[0] == 3.0
+    assert extract_min_gpa("A0 이상")[0] == 4.0
+
+    # 4.3 만점이면 환산 값이 다르므로 GPT에 확인
+    assert extract_min_gpa("성적 B+ 이상 (4.3 만점)")[1] < HIGH_CONFIDENCE
+
+
+def test_gpa_hakjeom_phrasing():
+    """"학점 3.0"처럼 숫자는 있지만 조건 문구가 정형화되지 않으면 GPT에 확인"""
+    assert extract_min_gpa("학점 3.0")[1] < HIGH_CONFIDENCE
+    assert extract_min_gpa("직전학기 12학점 이상 이수자")[1] < HIGH_CONFIDENCE
+    assert extract_min_gpa("학점 3.0 이상")[0] == 3.0
+
+
+def test_absent_fields_go_to_gpt():
+    """조건 문구를 찾지 못한 필드는 확신도가 낮아 GPT에 물어봄"""
+    text = "2026학년도 1학기 교내 장학생 선발 안내\n자세한 내용은 첨부파일을 확인하세요."
+    extracted = extract_fields(text, TODAY)
+    assert uncertain_fields(extracted) == ['min_gpa', 'max_income', 'residence', 'due_date']
+
+    assert extract_max_income("장학생 선발 안내")[1] < HIGH_CONFIDENCE
+    assert extract_residence("장학생 선발 안내")[1] < HIGH_CONFIDENCE
+    assert extract_due_date("장학생 선발 안내", TODAY)[1] < HIGH_CONFIDENCE
+
+
+def test_all_fields_found():
+    """네 필드를 모두 정형화된 문구로 읽으면 GPT를 호출하지 않음"""
+    text = (
+        "신청기간: 2026. 3. 2.(월) ~ 3. 20.(금)\n"
+        "직전학기 평점 3.0 이상\n"
+        "소득분위 8구간 이하\n"
+        "서울특별시 거주자"
+    )
+    extracted = extract_fields(text, TODAY)
+    assert {field: value for field, (value, _) in extracted.items()} == {
+        'min_gpa': 3.0, 'max_income': 8, 'residence': '서울', 'due_date': '2026-03-20'
+    }
+    assert uncertain_fields(extracted) == []
+
+
+def test_due_date_across_new_year():
+    """연도가 없는 기간은 오늘과 가장 가까운 연도로 읽고, 해가 바뀌면 마감일만 다음 해"""
+    text = "접수기간 : 12월 20일 ~ 1월 10일"
+    assert extract_due_date(text, date(2026, 1, 2)) == ('2026-01-10', 0.85)
+    assert extract_due_date(text, date(2025, 12, 1)) == ('2026-01-10', 0.85)
+    assert extract_due_date("접수기간 : 3월 2일 ~ 3월 20일", TODAY)[0] == '2026-03-20'
+
+
+def main():
+    """전체 테스트 실행"""
+    print("\n🚀 규칙 기반 추출기 테스트 시작\n")
+
+    tests = [
+        test_gpa_number, test_gpa_letter_grade, test_gpa_hakjeom_phrasing,
+        test_absent_fields_go_to_gpt, test_all_fields_found, test_due_date_across_new_year
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    print(f"\n📊 {len(tests) - failed}/{len(tests)}개 통과")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""
+요청 속도 제한 유틸리티
+동시 실행 모드에서도 대상 사이트에 예의 바른 트래픽을 유지합니다.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Set
+from urllib.parse import urlparse
+
+
+class Slot:
+    """진행 중인 요청 하나의 결과 기록 (기본값은 성공)"""
+
+    def __init__(self, epoch: int, kind: str = 'default'):
+        self.epoch = epoch
+        self.kind = kind
+        self.outcome = 'ok'
+        # 지연 측정 시작 시각 (요청을 실제로 보내기 직전에 다시 설정할 수 있음)
+        self.started = time.monotonic()
+        # 지연 측정 끝 시각 (None이면 슬롯 반납 시각)
+        self.responded: Optional[float] = None
+
+    def first_byte(self):
+        """
+        응답 헤더가 도착한 시각으로 지연을 확정 (스트리밍 본문용)
+
+        본문을 받는 동안에도 슬롯은 잡고 있지만, 전송 시간은 파일 크기에 따라 달라지므로
+        지연 판단에는 첫 바이트까지의 시간만 사용합니다.
+        """
+        if self.responded is None:
+            self.responded = time.monotonic()
+
+    def error(self):
+        """요청 실패 (4xx 등, 서버 과부하와는 무관)"""
+        self.outcome = 'error'
+
+    def overload(self):
+        """서버 과부하 신호 (타임아웃, 5xx, 429)"""
+        self.outcome = 'overload'
+
+
+class AIMDController:
+    """
+    AIMD(가산 증가 / 곱셈 감소) 방식의 동시 실행 수 제어기
+
+    - 요청 종류(kind)마다 window개가 끝날 때마다 그 종류의 p95 지연과 오류율을 확인하여
+      동시 실행 한도까지 요청이 찼고 지연이 기준(그 종류에서 지금까지 본 가장 빠른 중앙값 × latency_factor)
+      이내이며 오류율이 max_error_rate 이하이면 한도를 increase만큼 올립니다.
+    - p95 지연이 기준을 넘거나, 타임아웃 / 5xx / 429 를 받으면 한도를 decrease배로 줄입니다.
+      한도를 줄이기 전에 시작된 요청의 과부하 신호로는 다시 줄이지 않습니다.
+    - 한도는 모든 종류가 함께 쓰지만 지연 기준은 종류별로 따로 잡습니다
+      (예: 같은 호스트의 HTML 페이지와 포스터 이미지, 같은 모델의 저해상도 / 고해상도 Vision 호출).
+
+    minimum과 maximum이 같으면 고정 한도의 세마포어처럼 동작합니다.
+    여러 스레드에서 같은 인스턴스를 공유해도 안전합니다.
+
+    Args:
+        name: 로그에 표시할 이름
+        initial: 시작 한도
+        minimum / maximum: 한도 범위
+        increase: 건강할 때 올리는 양
+        decrease: 과부하일 때 곱하는 비율 (0~1)
+        window: 판단에 사용할 완료 요청 수
+        latency_factor: 기준 지연 대비 허용 배수
+        max_error_rate: 허용 오류율
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial: int = 1,
+        minimum: int = 1,
+        maximum: int = 8,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        window: int = 10,
+        latency_factor: float = 2.0,
+        max_error_rate: float = 0.1
+    ):
+        self.name = name
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(min(self.maximum, max(self.minimum, initial)))
+        self.increase = increase
+        self.decrease = decrease
+        self.window = max(1, window)
+        self.latency_factor = latency_factor
+        self.max_error_rate = max_error_rate
+        self.peak = int(self.limit)
+        # 요청 종류별 기준 지연
+        self.baselines: Dict[str, float] = {}
+        self.in_flight = 0
+        self._epoch = 0
+        self._latencies: Dict[str, List[float]] = {}
+        self._errors: Dict[str, int] = {}
+        self._saturated: Set[str] = set()
+        self._cond = threading.Condition()
+
+    @property
+    def adaptive(self) -> bool:
+        return self.minimum < self.maximum
+
+    def _set_limit(self, limit: float, reason: str):
+        """한도 변경 (cond 보유 상태에서 호출)"""
+        old = int(self.limit)
+        self.limit = min(float(self.maximum), max(float(self.minimum), limit))
+        self._latencies = {}
+        self._errors = {}
+        self._saturated = set()
+        if int(self.limit) != old:
+            self.peak = max(self.peak, int(self.limit))
+            print(f"🎚️  [{self.name}] 동시 실행 {old} → {int(self.limit)} ({reason})")
+            self._cond.notify_all()
+
+    def _evaluate(self, kind: str):
+        """kind 요청이 window개 모이면 그 종류의 지연과 오류율로 한도 조정 (cond 보유 상태에서 호출)"""
+        latencies = sorted(self._latencies.pop(kind))
+        errors = self._errors.pop(kind, 0)
+        p50 = latencies[len(latencies) // 2]
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        error_rate = errors / len(latencies)
+        baseline = min(self.baselines.get(kind, p50), p50)
+        self.baselines[kind] = baseline
+        target = baseline * self.latency_factor
+        label = f"{kind} " if kind != 'default' else ""
+
+        if p95 > target and p95 > 0.05:
+            self._epoch += 1
+            self._set_limit(self.limit * self.decrease, f"{label}p95 {p95:.2f}초 > 기준 {target:.2f}초")
+        elif error_rate <= self.max_error_rate and kind in self._saturated:
+            self._set_limit(self.limit + self.increase, f"{label}p95 {p95:.2f}초, 오류율 {error_rate:.0%}")
+        else:
+            self._saturated.discard(kind)
+
+    def acquire(self, kind: str = 'default') -> Slot:
+        """한도 안에서 kind 요청의 실행 슬롯 확보 (한도가 찼으면 대기)"""
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._saturated.add(kind)
+                self._cond.wait()
+            self.in_flight += 1
+            if self.in_flight >= int(self.limit):
+                self._saturated.add(kind)
+            return Slot(self._epoch, kind)
+
+    def release(self, slot: Slot):
+        """슬롯 반납과 결과 반영"""
+        latency = (slot.responded or time.monotonic()) - slot.started
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify()
+
+            if not self.adaptive:
+                return
+
+            if slot.outcome == 'overload':
+                # 이미 한도를 줄인 뒤라면 그 전에 시작된 요청의 신호는 무시
+                if slot.epoch == self._epoch:
+                    self._epoch += 1
+                    self._set_limit(self.limit * self.decrease, "타임아웃/5xx/429")
+                return
+
+            if slot.epoch != self._epoch:
+                # 한도를 줄이기 전에 시작된 요청의 지연은 새 한도의 판단에 쓰지 않음
+                return
+            latencies = self._latencies.setdefault(slot.kind, [])
+            latencies.append(latency)
+            if slot.outcome == 'error':
+                self._errors[slot.kind] = self._errors.get(slot.kind, 0) + 1
+            if len(latencies) >= self.window:
+                self._evaluate(slot.kind)
+
+    @contextmanager
+    def slot(self, kind: str = 'default') -> Iterator[Slot]:
+        """
+        실행 슬롯 컨텍스트 (결과를 기록하지 않은 채 예외가 나면 과부하로 기록)
+
+        kind: 요청 종류 (지연 기준을 종류별로 따로 잡음)
+
+        사용 예:
+            with controller.slot() as slot:
+                response = call()
+                if response.status_code >= 500:
+                    slot.overload()
+        """
+        slot = self.acquire(kind)
+        try:
+            yield slot
+        except BaseException:
+            if slot.outcome == 'ok':
+                slot.overload()
+            raise
+        finally:
+            self.release(slot)
+
+
+class _HostState:
+    """호스트 하나의 동시 요청 제어기와 다음 요청 가능 시각"""
+
+    def __init__(self, controller: AIMDController):
+        self.controller = controller
+        self.lock = threading.Lock()
+        self.next_start = 0.0
+
+
+class HostLimiter:
+    """
+    호스트별 동시 요청 수와 최소 요청 간격을 제한합니다.
+
+    여러 스레드에서 같은 인스턴스를 공유해도 안전합니다.
+
+    Args:
+        max_concurrency: 호스트당 동시에 진행할 수 있는 요청 수 (adaptive이면 상한)
+        min_interval: 같은 호스트로 보내는 요청 시작 사이의 최소 간격 (초)
+        adaptive: True이면 호스트별 AIMDController가 1부터 max_concurrency 사이에서 한도를 조절
+    """
+
+    def __init__(self, max_concurrency: int = 2, min_interval: float = 1.0, adaptive: bool = False):
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_interval = max(0.0, min_interval)
+        self.adaptive = adaptive
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, _HostState] = {}
+
+    def _state(self, host: str) -> _HostState:
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None:
+                if self.adaptive:
+                    controller = AIMDController(host, initial=1, minimum=1, maximum=self.max_concurrency)
+                else:
+                    controller = AIMDController(
+                        host, initial=self.max_concurrency,
+                        minimum=self.max_concurrency, maximum=self.max_concurrency
+                    )
+                state = _HostState(controller)
+                self._hosts[host] = state
+            return state
+
+    def controllers(self) -> Dict[str, AIMDController]:
+        """호스트별 동시 요청 제어기 (실행 결과 출력용)"""
+        with self._lock:
+            return {host: state.controller for host, state in self._hosts.items()}
+
+    @contextmanager
+    def slot(self, url: str, kind: str = 'page') -> Iterator[Slot]:
+        """
+        URL의 호스트에 대한 요청 슬롯을 확보합니다.
+
+        kind는 요청 종류 (예: 'page', 'image')이며, 동시 요청 한도는 호스트의 모든 요청이 함께 쓰고
+        지연 기준은 종류별로 따로 잡습니다.
+
+        사용 예:
+            with limiter.slot(url) as slot:
+                response = session.get(url)
+                if response.status_code >= 500:
+                    slot.overload()
+        """
+        state = self._state(urlparse(url).netloc)
+        with state.controller.slot(kind) as slot:
+            # 요청 시작 시각을 호스트별로 직렬화하여 최소 간격 보장
+            with state.lock:
+                wait = state.next_start - time.monotonic()
+                if wait > 0:
+                    time.sleep(wait)
+                state.next_start = time.monotonic() + self.min_interval
+            slot.started = time.monotonic()
+            yield slot
@@ -12,9 +12,13 @@ CREATE TABLE IF NOT EXISTS scholarships (
   max_income INTEGER DEFAULT 99 CHECK (max_income >= 0 AND max_income <= 99),
   residence TEXT DEFAULT '전국',
   is_image_content BOOLEAN DEFAULT false,
+  content_hash TEXT,
   created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
+-- 기존 테이블 마이그레이션 (content_hash 컬럼 추가)
+ALTER TABLE scholarships ADD COLUMN IF NOT EXISTS content_hash TEXT;
+
 -- 인덱스 생성 (검색 성능 향상)
 CREATE INDEX idx_scholarships_due_date ON scholarships(due_date);
 CREATE INDEX idx_scholarships_min_gpa ON scholarships(min_gpa);
@@ -24,6 +28,23 @@ CREATE INDEX idx_scholarships_residence ON scholarships(residence);
 -- 마감일 지난 장학금 자동 삭제를 위한 인덱스
 CREATE INDEX idx_scholarships_due_date_active ON scholarships(due_date) WHERE due_date >= CURRENT_DATE;
 
+-- 크롤러 통계: 전체 / 활성 / 만료 개수를 한 번의 호출로 계산 (행을 내려받지 않음)
+-- 사용: supabase.rpc('scholarship_stats', {'today': 'YYYY-MM-DD'})
+-- 기준일은 크롤러가 넘겨 count 요청으로 대신 계산할 때와 같은 날짜를 사용 (생략하면 DB의 CURRENT_DATE)
+-- 마감일이 없는 행은 활성이 아니므로 만료로 집계하여 total = active + expired
+DROP FUNCTION IF EXISTS scholarship_stats();
+CREATE OR REPLACE FUNCTION scholarship_stats(today DATE DEFAULT CURRENT_DATE)
+RETURNS TABLE (total BIGINT, active BIGINT, expired BIGINT)
+LANGUAGE sql
+STABLE
+AS $$
+  SELECT
+    COUNT(*) AS total,
+    COUNT(*) FILTER (WHERE due_date >= today) AS active,
+    COUNT(*) FILTER (WHERE due_date IS NULL OR due_date < today) AS expired
+  FROM scholarships;
+$$;
+
 -- Row Level Security (RLS) 활성화
 ALTER TABLE scholarships ENABLE ROW LEVEL SECURITY;
 
@@ -52,5 +73,7 @@ COMMENT ON COLUMN scholarships.min_gpa IS '최소 요구 학점 (0.0 = 제한 
 COMMENT ON COLUMN scholarships.max_income IS '소득분위 상한선 (0-10, 99 = 제한 없음)';
 COMMENT ON COLUMN scholarships.residence IS '거주지 제한 (예: 경기, 서울, 전국 등)';
 COMMENT ON COLUMN scholarships.is_image_content IS '본문이 이미지인지 여부 (true: 이미지, false: 텍스트)';
+COMMENT ON COLUMN scholarships.content_hash IS '본문 텍스트 + 이미지의 SHA-256 해시 (변경 감지용, 같으면 재분석 생략)';
 COMMENT ON COLUMN scholarships.created_at IS '데이터 생성 시각';
+COMMENT ON FUNCTION scholarship_stats(DATE) IS '전체 / 활성(기준일 이후 마감) / 만료(마감 지남 또는 마감일 없음) 장학금 개수';
 
@@ -13,6 +13,7 @@ export interface Scholarship {
   max_income: number;
   residence: string;
   is_image_content: boolean; // 본문이 이미지인지 여부
+  content_hash: string | null; // 본문 내용 해시 (크롤러 변경 감지용)
   created_at: string; // ISO 8601 datetime string
 }
 
@@ -25,6 +26,7 @@ export interface ScholarshipInsert {
   max_income?: number; // Optional, default 99
   residence?: string; // Optional, default '전국'
   is_image_content?: boolean; // Optional, default false
+  content_hash?: string | null;
 }
 
 // 장학금 업데이트 시 사용하는 타입 (모든 필드 optional)
@@ -36,6 +38,7 @@ export interface ScholarshipUpdate {
   max_income?: number;
   residence?: string;
   is_image_content?: boolean;
+  content_hash?: string | null;
 }
 
 // 사용자 필터 조건 타입